@@ -2,8 +2,18 @@ from __future__ import annotations
 
 import os
 import csv
+import json
+import time
+import bisect
+import hashlib
+import heapq
 import datetime
+import functools
+import threading
 from datetime import timezone
+from typing import NamedTuple
+
+import click
 
 from flask import (
     Flask,
@@ -13,7 +23,11 @@ from flask import (
     url_for,
     abort,
     flash,
+    g,
     jsonify,
+    make_response,
+    session,
+    stream_template,
 )
 from flask_login import (
     LoginManager,
@@ -26,9 +40,25 @@ from flask_login import (
 import pymongo
 from bson.objectid import ObjectId
 from dotenv import load_dotenv
+from pymongo import UpdateOne
 from urllib.parse import quote, unquote
 from werkzeug.security import generate_password_hash, check_password_hash
 
+import job_records
+from assets import init_assets
+from card_cache import DEFAULT_MAX_CARDS, CardCache
+from catalog_refresher import init_catalog_refresher, keeps_current
+from job_records import JobRecord, to_epoch
+from metrics import (
+    QueryMonitor,
+    init_metrics,
+    record_cache,
+    record_catalog_build,
+    record_csv_load,
+)
+from profiling import MongoSpanListener, init_profiling, span, timed
+from scrapers.csv_store import read_manifest
+
 load_dotenv()
 
 CSV_DIR = os.path.join("scrapers", "data")
@@ -86,6 +116,57 @@ DEFAULT_TIER = 3
 
 EPOCH = datetime.datetime(1970, 1, 1, tzinfo=timezone.utc)
 
+# db.catalog_meta document whose "version" is bumped by every ingest that
+# changes db.jobs; app workers poll it instead of re-reading the collection
+CATALOG_META_ID = "jobs"
+
+# db.user_revisions documents ({_id: user_id, preferences: n, favorites: n})
+# count each user's saves, so page validators change when their pages do
+REVISION_FIELDS = ("preferences", "favorites")
+
+INGEST_BATCH_SIZE = 500
+
+# Per-user header preference counts are cached for this many users. Pages
+# with an ETag already read the user's revisions and check the entry
+# against them; other pages trust an entry for HEADER_SUMMARY_TTL seconds
+# after it was last checked, so a save handled by another worker shows
+# there within that time
+HEADER_SUMMARY_MAX_USERS = 10_000
+HEADER_SUMMARY_TTL = 30
+
+# Header values for error pages when the user's summary is not cached yet
+EMPTY_HEADER_SUMMARY = {"match_focus": "50%+", "companies_watched": 0, "locations_tracked": 0}
+
+# /jobs renders this many cards on the server; main.js loads the rest from /api/jobs
+BOARD_INITIAL_CARDS = 48
+
+# A streamed page is sent in writes of at least this many characters
+STREAM_FLUSH_CHARS = 16 * 1024
+
+# /readyz pings Mongo at most this often (seconds) and gives up on a ping after MONGO_PING_TIMEOUT
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", "10"))
+MONGO_PING_TIMEOUT = 2
+
+# Fields that make up a job's content hash; a row whose hash is unchanged
+# is skipped on ingest
+CONTENT_HASH_FIELDS = (
+    "title",
+    "location",
+    "department",
+    "url",
+    "type",
+    "tags",
+    "scraped_at",
+)
+
+
+def recency_key(job):
+    return job.get("scraped_at") or job.get("posted_date") or EPOCH
+
+
+def match_key(job):
+    return (job.get("match_score", 0), recency_key(job))
+
 
 def get_recommended_jobs(jobs, min_score: int = 40, limit: int = 8):
     """
@@ -93,22 +174,18 @@ def get_recommended_jobs(jobs, min_score: int = 40, limit: int = 8):
     - only jobs at or above min_score
     - sorted by score, then recency
     - fallback to top jobs if there aren't enough above threshold
-    """
-
-    def sort_key(j):
-        return (
-            j.get("match_score", 0),
-            j.get("scraped_at") or j.get("posted_date") or EPOCH,
-        )
 
+    heapq.nlargest keeps only `limit` jobs around, so this is O(n log limit)
+    and returns the same jobs, in the same order, as a full stable sort.
+    """
     filtered = [j for j in jobs if j.get("match_score", 0) >= min_score]
-    filtered.sort(key=sort_key, reverse=True)
 
     # Fallback: if user hasn't set many prefs yet, just use top jobs overall
     if len(filtered) < limit:
-        filtered = sorted(jobs, key=sort_key, reverse=True)
+        filtered = jobs
 
-    return filtered[:limit]
+    with span("sort"):
+        return heapq.nlargest(limit, filtered, key=match_key)
 
 
 class User(UserMixin):
@@ -118,15 +195,8 @@ class User(UserMixin):
         self.email = email
 
 
-def load_jobs_from_csv(path: str, company_name: str):
-    """Load jobs from a CSV produced by a scraper and normalize fields."""
-    if not os.path.exists(path):
-        print(f"[CSV] File not found for {company_name}: {path}")
-        return []
-
-    jobs = []
-    print(f"[CSV] Loading jobs for {company_name} from {path}")
-
+def iter_jobs_from_csv(path: str, company_name: str):
+    """Stream normalized jobs (as compact JobRecords) from a CSV produced by a scraper."""
     with open(path, newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -173,24 +243,195 @@ def load_jobs_from_csv(path: str, company_name: str):
                 if primary_location and primary_location not in tags:
                     tags.append(primary_location)
 
-            job = {
-                "title": title,
-                "location": location,
-                "department": department,
-                "job_id": job_id,
-                "url": url,
-                "scraped_at": scraped_dt,
-                "posted_date": scraped_dt,
-                "company": company_name,
-                "type": job_type,
-                "tags": tags,
-            }
-            jobs.append(job)
+            yield JobRecord(
+                title,
+                location,
+                department,
+                job_id,
+                url,
+                to_epoch(scraped_dt),
+                company_name,
+                job_type,
+                tags,
+            )
+
 
+@timed("csv")
+def load_jobs_from_csv(path: str, company_name: str):
+    """Load jobs from a CSV produced by a scraper and normalize fields."""
+    if not os.path.exists(path):
+        print(f"[CSV] File not found for {company_name}: {path}")
+        return []
+
+    print(f"[CSV] Loading jobs for {company_name} from {path}")
+    start = time.perf_counter()
+    jobs = list(iter_jobs_from_csv(path, company_name))
+    record_csv_load(company_name, time.perf_counter() - start)
     print(f"[CSV] Loaded {len(jobs)} jobs for {company_name}")
     return jobs
 
 
+def job_key(job):
+    """(company, identifier) pair that uniquely identifies a job across sources."""
+    company = job.get("company") or "Unknown"
+    return (
+        company,
+        job.get("job_id") or job.get("url") or str(job.get("_id", "")),
+    )
+
+
+def job_content_hash(job) -> str:
+    """Stable hash of the fields that matter for display and scoring."""
+    payload = json.dumps(
+        {field: job.get(field) for field in CONTENT_HASH_FIELDS},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def ingest_jobs(db, company: str, jobs, batch_size: int = INGEST_BATCH_SIZE):
+    """
+    Upsert one company's scraped jobs into db.jobs.
+
+    Jobs are keyed on (company, job_id) and written with batched
+    bulk_write upserts. Rows whose content hash matches what is already
+    stored are skipped, and jobs missing from this run are marked
+    delisted in a single update_many.
+    """
+    now = datetime.datetime.now(timezone.utc)
+
+    known = {
+        doc.get("job_id"): doc
+        for doc in db.jobs.find(
+            {"company": company}, {"job_id": 1, "content_hash": 1, "delisted": 1}
+        )
+    }
+
+    stats = {"seen": 0, "upserted": 0, "modified": 0, "unchanged": 0, "delisted": 0}
+    seen = set()
+    batch = []
+
+    def flush():
+        if not batch:
+            return
+        result = db.jobs.bulk_write(batch, ordered=False)
+        stats["upserted"] += result.upserted_count
+        stats["modified"] += result.modified_count
+        batch.clear()
+
+    for job in jobs:
+        _, job_id = job_key(job)
+        if not job_id or job_id in seen:
+            continue
+        seen.add(job_id)
+
+        content_hash = job_content_hash(job)
+        existing = known.get(job_id)
+        if (
+            existing
+            and existing.get("content_hash") == content_hash
+            and not existing.get("delisted")
+        ):
+            stats["unchanged"] += 1
+            continue
+
+        doc = {k: v for k, v in job.items() if k != "_id"}
+        doc.update(
+            company=company,
+            job_id=job_id,
+            content_hash=content_hash,
+            delisted=False,
+            updated_at=now,
+        )
+        batch.append(
+            UpdateOne(
+                {"company": company, "job_id": job_id},
+                {"$set": doc, "$setOnInsert": {"first_seen_at": now}},
+                upsert=True,
+            )
+        )
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    stats["seen"] = len(seen)
+    if seen:
+        # Only rows written by ingest carry a content hash; hand-inserted
+        # jobs are left alone
+        result = db.jobs.update_many(
+            {
+                "company": company,
+                "job_id": {"$nin": list(seen)},
+                "content_hash": {"$exists": True},
+                "delisted": {"$ne": True},
+            },
+            {"$set": {"delisted": True, "delisted_at": now}},
+        )
+        stats["delisted"] = result.modified_count
+
+    return stats
+
+
+def bump_catalog_version(db) -> int:
+    """Increment the catalog version app workers poll for changes."""
+    doc = db.catalog_meta.find_one_and_update(
+        {"_id": CATALOG_META_ID},
+        {
+            "$inc": {"version": 1},
+            "$set": {"updated_at": datetime.datetime.now(timezone.utc)},
+        },
+        upsert=True,
+        return_document=pymongo.ReturnDocument.AFTER,
+    )
+    return doc["version"]
+
+
+def bump_user_revision(db, user_id: str, field: str):
+    """Record that one of the user's preference or favorite sets changed."""
+    db.user_revisions.update_one({"_id": user_id}, {"$inc": {field: 1}}, upsert=True)
+
+
+def user_revisions(db, user_id: str):
+    """(preferences, favorites) revision counters for the user; 0 before any save."""
+    doc = db.user_revisions.find_one({"_id": user_id}) or {}
+    return tuple(doc.get(field, 0) for field in REVISION_FIELDS)
+
+
+def template_fingerprint(folder: str) -> str:
+    """Hash of every template's source, so a deploy that changes markup changes validators."""
+    digest = hashlib.sha1()
+    for root, _, files in sorted(os.walk(folder)):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, folder).encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def ingest_csv_sources(db, sources=None, batch_size: int = INGEST_BATCH_SIZE):
+    """Ingest every scraper CSV and bump the catalog version if anything changed."""
+    db.jobs.create_index(
+        [("company", pymongo.ASCENDING), ("job_id", pymongo.ASCENDING)], unique=True
+    )
+
+    results = {}
+    for path, company_name in sources or CSV_SOURCES:
+        if not os.path.exists(path):
+            print(f"[Ingest] File not found for {company_name}: {path}")
+            continue
+        results[company_name] = ingest_jobs(
+            db, company_name, iter_jobs_from_csv(path, company_name), batch_size
+        )
+
+    changed = any(
+        s["upserted"] or s["modified"] or s["delisted"] for s in results.values()
+    )
+    version = bump_catalog_version(db) if changed else None
+    return results, version
+
+
 def _tier_multiplier(rank: int) -> int:
     """
     Map preference tier to multiplier (1 is highest priority):
@@ -204,8 +445,95 @@ def _tier_multiplier(rank: int) -> int:
     return mapping.get(rank, 0)
 
 
-def score_jobs_for_user(db, user_id: str, jobs, mark_favorites=False):
-    now = datetime.datetime.now(timezone.utc)
+# Recency points by whole days since posting; 25 on the day, none after 24 days
+RECENCY_BOOST = tuple(25 - days for days in range(25))
+
+
+class JobFacts(NamedTuple):
+    """Everything scoring needs from a job that does not depend on the user."""
+
+    company_code: int  # category codes; -1 when the field is missing or not a string
+    location_code: int
+    type_code: int
+    role_index: int  # index into ROLES of the first role in the title, else -1
+    posted_ts: float | None
+    identifier: str
+    company_slug: str
+    posted: str | None  # "Dec 03" label to add, unless the job already has one
+    favorite_key: tuple
+
+
+def _category_code(table, value) -> int:
+    return table.code(value) if isinstance(value, str) else -1
+
+
+def job_facts(job) -> JobFacts:
+    """Derive a job's user-independent scoring inputs (done once per catalog build)."""
+    raw_company = job.get("company") or "Unknown"
+    raw_identifier = job.get("job_id") or job.get("url") or str(job.get("_id", ""))
+    identifier = quote(raw_identifier, safe="")
+
+    if isinstance(job, JobRecord):
+        company_code, location_code, type_code = job.company_code, job.location_code, job.type_code
+    else:
+        company_code = _category_code(job_records.COMPANY, job.get("company"))
+        location_code = _category_code(job_records.LOCATION, job.get("location"))
+        type_code = _category_code(job_records.JOB_TYPE, job.get("type"))
+
+    role_index = -1
+    role = job.get("role") or job.get("title")
+    if role:
+        role_lower = str(role).lower()
+        for i, canonical_role in enumerate(ROLES):
+            if canonical_role.lower() in role_lower:
+                role_index = i
+                break
+
+    posted_ts = None
+    posted = None
+    posted_dt = job.get("posted_date") or job.get("scraped_at")
+    if isinstance(posted_dt, datetime.datetime):
+        posted_ts = posted_dt.timestamp()
+        if "posted" not in job:
+            posted = posted_dt.strftime("%b %d")
+
+    return JobFacts(
+        company_code,
+        location_code,
+        type_code,
+        role_index,
+        posted_ts,
+        identifier,
+        raw_company.lower().replace(" ", "-"),
+        posted,
+        (raw_company, identifier),
+    )
+
+
+def _by_code(table, bonus_by_value):
+    """Re-key a value -> points map by category code, dropping values no job has."""
+    by_code = {}
+    for value, points in bonus_by_value.items():
+        code = table.lookup(value)
+        if code is not None:
+            by_code[code] = points
+    return by_code
+
+
+@timed("score")
+def score_jobs_for_user(db, user_id: str, jobs, mark_favorites=False, facts=None):
+    """
+    Score jobs against the user's preferences and return scored dict copies.
+
+    facts are the jobs' JobFacts in the same order; catalogs precompute
+    them, otherwise they are derived here.
+    """
+    # The score cache: jobs scored from a catalog's precomputed facts are
+    # hits, jobs whose facts are derived per request are misses
+    record_cache("score_facts", hit=facts is not None, count=len(jobs))
+    if facts is None:
+        facts = [job_facts(job) for job in jobs]
+    now_ts = datetime.datetime.now(timezone.utc).timestamp()
 
     company_prefs = {
         p["company"]: p["rank"]
@@ -223,6 +551,25 @@ def score_jobs_for_user(db, user_id: str, jobs, mark_favorites=False):
         set(job_type_pref_doc.get("types", [])) if job_type_pref_doc else set()
     )
 
+    # Points per preference, keyed the way JobFacts are, so the loop below is integer lookups
+    company_bonus = _by_code(
+        job_records.COMPANY,
+        {c: _tier_multiplier(r) * 22 for c, r in company_prefs.items()},
+    )
+    location_bonus = _by_code(
+        job_records.LOCATION,
+        {loc: _tier_multiplier(r) * 18 for loc, r in location_prefs.items()},
+    )
+    # role_bonus[-1] is the "no role matched" slot
+    role_bonus = [
+        _tier_multiplier(role_prefs[r]) * 20 if role_prefs.get(r) else 0 for r in ROLES
+    ] + [0]
+    job_type_codes = {
+        code
+        for code in map(job_records.JOB_TYPE.lookup, job_type_prefs)
+        if code is not None
+    }
+
     favorite_set = set()
     if mark_favorites:
         favorites = list(db.favorites.find({"user_id": user_id}))
@@ -230,83 +577,300 @@ def score_jobs_for_user(db, user_id: str, jobs, mark_favorites=False):
 
     scored_jobs = []
 
+    for job, f in zip(jobs, facts):
+        score = (
+            company_bonus.get(f.company_code, 0)
+            + location_bonus.get(f.location_code, 0)
+            + role_bonus[f.role_index]
+        )
+        if f.type_code in job_type_codes:
+            score += 15
+        if f.posted_ts is not None:
+            days_old = int((now_ts - f.posted_ts) // 86400)
+            if days_old < 25:
+                score += RECENCY_BOOST[max(0, days_old)]
+
+        # Catalog jobs are shared between requests, so score a plain dict copy
+        # (dict.copy() for Mongo docs, JobRecord.copy() for CSV jobs)
+        job = job.copy()
+        job["identifier"] = f.identifier
+        job["company_slug"] = f.company_slug
+        if mark_favorites:
+            job["is_favorited"] = f.favorite_key in favorite_set
+        job["match_score"] = max(0, min(100, score))
+        if f.posted is not None:
+            job["posted"] = f.posted
+
+        scored_jobs.append(job)
+
+    return scored_jobs
+
+
+def dedupe_jobs(jobs):
+    """Keep the first job seen for each (company, identifier); Mongo jobs come first."""
+    unique_jobs = {}
     for job in jobs:
-        score = 0
+        key = job_key(job)
+        if key not in unique_jobs:
+            unique_jobs[key] = job
+    return list(unique_jobs.values())
 
-        raw_company = job.get("company") or "Unknown"
-        raw_identifier = job.get("job_id") or job.get("url") or str(job.get("_id", ""))
-        identifier = quote(raw_identifier, safe="")
-        job["identifier"] = identifier
-        job["company_slug"] = raw_company.lower().replace(" ", "-")
 
-        if mark_favorites:
-            job["is_favorited"] = (raw_company, identifier) in favorite_set
-
-        company = job.get("company")
-        if company in company_prefs:
-            rank = company_prefs[company]
-            score += _tier_multiplier(rank) * 22
-
-        location = job.get("location")
-        if location in location_prefs:
-            rank = location_prefs[location]
-            score += _tier_multiplier(rank) * 18
-
-        role = job.get("role") or job.get("title")
-        if role:
-            for canonical_role in ROLES:
-                if canonical_role.lower() in str(role).lower():
-                    rank = role_prefs.get(canonical_role)
-                    if rank:
-                        score += _tier_multiplier(rank) * 20
-                    break
+class JobCatalog:
+    """Deduplicated Mongo + CSV jobs shared by every request until a source changes."""
 
-        jtype = job.get("type")
-        if jtype in job_type_prefs:
-            score += 15
+    def __init__(self, jobs, version: str):
+        self.jobs = jobs
+        self.version = version
+        self.built_at = time.time()
+        # Positions in jobs, newest first; the same for every user, so sorted once per build
+        self.by_recency = sorted(
+            range(len(jobs)), key=lambda i: recency_key(jobs[i]), reverse=True
+        )
+        # User-independent scoring inputs, aligned with jobs
+        self.facts = [job_facts(job) for job in jobs]
+        # Header numbers; the top-matches list is always the top 8 of every job
+        self.stats = {"live_listings": len(jobs), "top_matches": min(8, len(jobs))}
+        # A job's recency boost steps down each time its age passes a whole day,
+        # i.e. at the same second of every UTC day. Jobs already too old for a
+        # boost never change again, so only the others are tracked.
+        cutoff = self.built_at - len(RECENCY_BOOST) * 86400
+        self.recency_offsets = sorted(
+            {
+                f.posted_ts % 86400
+                for f in self.facts
+                if f.posted_ts is not None and f.posted_ts > cutoff
+            }
+        )
 
-        posted_dt = job.get("posted_date") or job.get("scraped_at")
-        if isinstance(posted_dt, datetime.datetime):
-            days_old = max(0, (now - posted_dt).days)
-            recency_boost = max(0, 25 - days_old)
-            score += recency_boost
+    def newest(self, scored_jobs, limit: int):
+        """
+        The `limit` newest of scored_jobs, which must be this catalog's jobs
+        scored in order (as score_jobs_for_user returns them).
+        """
+        return [scored_jobs[i] for i in self.by_recency[:limit]]
 
-        score = max(0, min(100, score))
-        job["match_score"] = int(score)
+    def recency_clock(self, now_ts: float):
+        """A value that changes whenever any job's recency boost can have changed."""
+        return (
+            int(now_ts // 86400),
+            bisect.bisect_right(self.recency_offsets, now_ts % 86400),
+        )
 
-        if "posted" not in job and isinstance(posted_dt, datetime.datetime):
-            job["posted"] = posted_dt.strftime("%b %d")
 
-        scored_jobs.append(job)
+# (db, source key, JobCatalog) for the most recently built catalog; only
+# ever replaced whole, by refresh_job_catalog
+_catalog_state = (None, None, None)
+_catalog_build_lock = threading.Lock()
 
-    return scored_jobs
+
+def _catalog_db_version(db):
+    doc = db.catalog_meta.find_one({"_id": CATALOG_META_ID})
+    return doc.get("version", 0) if doc else 0
+
+
+def _csv_signature(path: str):
+    """Cheap change token for a scraper CSV: its manifest, else its stat."""
+    manifest = read_manifest(path)
+    if manifest:
+        return (manifest.get("generation"), manifest.get("sha256"))
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def catalog_source_key(db):
+    """Everything the catalog depends on; if this is unchanged, so is the catalog."""
+    return (
+        _catalog_db_version(db),
+        tuple(_csv_signature(path) for path, _ in CSV_SOURCES),
+    )
 
 
-def load_and_score_jobs(db, user_id: str):
-    """Load all jobs (Mongo + CSV) and score them for this user."""
-    mongo_jobs = list(db.jobs.find({}))
+def build_job_catalog(db, source_key=None) -> JobCatalog:
+    """Load all jobs (Mongo + CSV) and dedupe them on (company, identifier)."""
+    if source_key is None:
+        source_key = catalog_source_key(db)
+
+    mongo_jobs = list(db.jobs.find({"delisted": {"$ne": True}}))
 
     csv_jobs = []
     for path, company_name in CSV_SOURCES:
         csv_jobs.extend(load_jobs_from_csv(path, company_name))
 
-    combined = mongo_jobs + csv_jobs
-    unique_jobs = {}
-    for job in combined:
-        company = job.get("company") or "Unknown"
-        key = (
-            company,
-            job.get("job_id") or job.get("url") or str(job.get("_id", "")),
+    version = hashlib.sha1(repr(source_key).encode("utf-8")).hexdigest()[:12]
+    return JobCatalog(dedupe_jobs(mongo_jobs + csv_jobs), version)
+
+
+def refresh_job_catalog(db, source_key) -> JobCatalog:
+    """
+    Build and publish the catalog for source_key, unless it already is.
+    Builds run one at a time; readers never wait for them.
+    """
+    global _catalog_state
+
+    with _catalog_build_lock:
+        cached_db, cached_key, catalog = _catalog_state
+        if catalog is not None and cached_db is db and cached_key == source_key:
+            return catalog
+        start = time.perf_counter()
+        catalog = build_job_catalog(db, source_key)
+        record_catalog_build(time.perf_counter() - start, len(catalog.jobs))
+        # One reference swap: a reader sees the old snapshot or this one, never a mix
+        _catalog_state = (db, source_key, catalog)
+        return catalog
+
+
+def get_job_catalog(db) -> JobCatalog:
+    """
+    Return the cached catalog. While a CatalogRefresher keeps it current
+    this is a plain read; otherwise the sources are checked first and the
+    catalog is rebuilt only when one has changed.
+    """
+    cached_db, cached_key, catalog = _catalog_state
+    if catalog is not None and cached_db is db:
+        if keeps_current(db):
+            record_cache("catalog", hit=True)
+            return catalog
+        source_key = catalog_source_key(db)
+        if cached_key == source_key:
+            record_cache("catalog", hit=True)
+            return catalog
+    else:
+        source_key = catalog_source_key(db)
+
+    record_cache("catalog", hit=False)
+    return refresh_job_catalog(db, source_key)
+
+
+def latest_job_catalog(db) -> JobCatalog:
+    """
+    The most recently built catalog, without checking its sources again.
+    Good enough for numbers that may lag one rebuild behind, like the header.
+    """
+    cached_db, _, catalog = _catalog_state
+    if catalog is not None and cached_db is db:
+        return catalog
+    return get_job_catalog(db)
+
+
+def catalog_status(db):
+    """Whether a catalog is loaded for db, and its version, size and age, without loading it."""
+    cached_db, _, catalog = _catalog_state
+    if catalog is None or cached_db is not db:
+        return {"loaded": False}
+    return {
+        "loaded": True,
+        "version": catalog.version,
+        "jobs": len(catalog.jobs),
+        "age_seconds": round(time.time() - catalog.built_at, 1),
+    }
+
+
+def load_and_score_jobs(db, user_id: str, catalog=None):
+    """
+    Load all jobs (Mongo + CSV) and score them for this user. Pass catalog
+    to score a snapshot the caller already holds.
+    """
+    if catalog is None:
+        catalog = get_job_catalog(db)
+    return score_jobs_for_user(
+        db, user_id, catalog.jobs, mark_favorites=True, facts=catalog.facts
+    )
+
+
+def board_key(job):
+    """Job board sort key (descending): best match first, then newest."""
+    return (
+        job.get("match_score", 0),
+        job.get("scraped_at") or job.get("posted_date") or EPOCH,
+    )
+
+
+def board_order(jobs):
+    """Scored jobs in job board order."""
+    return sorted(jobs, key=board_key, reverse=True)
+
+
+def board_payload(jobs, user_id: str, signed_in: bool):
+    """
+    The job board as compact JSON for main.js. Companies, locations and
+    types are sent once in lookup tables; each job is a row of
+    [title, company, location, type, tags, match_score, identifier, posted,
+    favorited] with the three category columns as indexes into the tables.
+    """
+    companies, locations, types = {}, {}, {}
+    company_rows = []
+    rows = []
+    for job in jobs:
+        company = job.get("company") or ""
+        if company not in companies:
+            companies[company] = len(company_rows)
+            company_rows.append([company, job.get("company_slug", "")])
+        location = job.get("location") or ""
+        job_type = job.get("type") or ""
+        tags = job.get("tags")
+        rows.append(
+            [
+                job.get("title") or "",
+                companies[company],
+                locations.setdefault(location, len(locations)),
+                types.setdefault(job_type, len(types)),
+                ",".join(tags) if tags else "",
+                job.get("match_score", 0),
+                job.get("identifier", ""),
+                job.get("posted") or "",
+                1 if job.get("is_favorited") else 0,
+            ]
         )
-        if key not in unique_jobs:
-            unique_jobs[key] = job
+    return {
+        "user_id": user_id,
+        "signed_in": signed_in,
+        "companies": company_rows,
+        "locations": list(locations),
+        "types": list(types),
+        "jobs": rows,
+    }
+
+
+class MissingDatabase:
+    """
+    Stands in for db when MONGO_DBNAME is unset, so the app can still be
+    created and imported (CLI commands, benchmarks, image builds). Any use
+    fails with an error naming the missing setting.
+    """
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        raise RuntimeError("MONGO_DBNAME is not set; the app has no database to use")
 
-    jobs = list(unique_jobs.values())
-    return score_jobs_for_user(db, user_id, jobs, mark_favorites=True)
+    def __getitem__(self, name):
+        return self.__getattr__(name)
 
 
-def create_app():
-    """Create and configure the Flask application."""
+def flush_in_chunks(stream, size: int = STREAM_FLUSH_CHARS):
+    """Coalesce a template stream's many small strings into writes of about `size` characters."""
+    buf = []
+    buffered = 0
+    for piece in stream:
+        buf.append(piece)
+        buffered += len(piece)
+        if buffered >= size:
+            yield "".join(buf)
+            buf = []
+            buffered = 0
+    if buf:
+        yield "".join(buf)
+
+
+def create_app(mongo_uri=None, dbname=None):
+    """
+    Create and configure the Flask application. The Mongo settings default
+    to MONGO_URI and MONGO_DBNAME from the environment.
+    """
     app = Flask(__name__, static_folder="static", template_folder="templates")
     app.secret_key = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
 
@@ -315,14 +879,129 @@ def create_app():
     login_manager.login_view = "login"
     login_manager.login_message = "Please log in to access this page."
 
-    cxn = pymongo.MongoClient(os.getenv("MONGO_URI"))
-    db = cxn[os.getenv("MONGO_DBNAME")]
+    query_monitor = QueryMonitor()
+    # connect=False: no sockets, threads or DNS until the first query, so
+    # creating the app (and importing this module) does no I/O, and a
+    # pre-forking server's workers each open their own connections
+    cxn = pymongo.MongoClient(
+        mongo_uri or os.getenv("MONGO_URI"),
+        tz_aware=True,
+        connect=False,
+        event_listeners=[MongoSpanListener(), query_monitor],
+    )
+    dbname = dbname or os.getenv("MONGO_DBNAME")
+    db = cxn[dbname] if dbname else MissingDatabase()
+    app.extensions["db"] = db
+    init_profiling(app)
+    init_metrics(app, query_monitor)
+    assets = init_assets(app)
+    catalog_refresher = init_catalog_refresher(
+        app,
+        db,
+        source_key=catalog_source_key,
+        refresh=refresh_job_catalog,
+        watch_dirs=sorted({os.path.dirname(path) for path, _ in CSV_SOURCES}),
+    )
+    card_cache = CardCache(
+        app.jinja_env, int(os.getenv("CARD_CACHE_MAX", DEFAULT_MAX_CARDS))
+    )
+    app.extensions["card_cache"] = card_cache
+    # Pages change with the templates and with the hashed asset names they
+    # link to. Read on the first validator, so creating the app reads no files
+    @functools.cache
+    def page_version():
+        return (
+            template_fingerprint(os.path.join(app.root_path, app.template_folder)),
+            assets.version,
+        )
+
+    def _revisions(user_id: str):
+        """user_revisions for this request, read once and shared by the ETag and the header."""
+        cached = g.get("_user_revisions")
+        if cached is None or cached[0] != user_id:
+            cached = g._user_revisions = (user_id, user_revisions(db, user_id))
+        return cached[1]
+
+    def _page_etag(view_args):
+        """
+        Validator for a per-user page: it covers the catalog (and where each
+        job's recency boost stands), the user's preference and favorite
+        revisions, and the deployed templates. None when the page must not be
+        revalidated, e.g. it is about to show a flashed message.
+        """
+        if session.get("_flashes"):
+            return None
+        signed_in = current_user.is_authenticated
+        user_id = current_user.id if signed_in else "testuser"
+        catalog = get_job_catalog(db)
+        parts = (
+            page_version(),
+            request.endpoint,
+            sorted(view_args.items()),
+            user_id,
+            signed_in,
+            catalog.version,
+            catalog.recency_clock(time.time()),
+            _revisions(user_id),
+            datetime.datetime.now().year,
+        )
+        return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
 
-    try:
-        cxn.admin.command("ping")
-        print(" *", "Connected to MongoDB!")
-    except Exception as e:
-        print(" * MongoDB connection error:", e)
+    def conditional_page(view):
+        """Answer a matching If-None-Match with 304 before the view scores or renders anything."""
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = _page_etag(kwargs)
+            if etag is not None and request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+            if etag is not None and response.status_code in (200, 304):
+                response.set_etag(etag, weak=True)
+                # Per-user pages: browsers revalidate every time, shared caches keep nothing
+                response.headers["Cache-Control"] = "private, no-cache"
+                response.vary.add("Cookie")
+            return response
+
+        return wrapper
+
+    # Last Mongo ping for /readyz, shared between probes
+    mongo_check = {"ok": False, "error": None, "checked_at": None}
+
+    def _mongo_reachable():
+        now = time.monotonic()
+        checked_at = mongo_check["checked_at"]
+        if checked_at is None or now - checked_at >= READINESS_CACHE_SECONDS:
+            try:
+                with pymongo.timeout(MONGO_PING_TIMEOUT):
+                    cxn.admin.command("ping")
+                mongo_check.update(ok=True, error=None)
+            except Exception as e:
+                mongo_check.update(ok=False, error=str(e))
+            mongo_check["checked_at"] = now
+        return mongo_check
+
+    @app.route("/healthz")
+    def healthz():
+        """Liveness: the process is up and serving. Touches nothing else."""
+        return "ok", 200, {"Content-Type": "text/plain"}
+
+    @app.route("/readyz")
+    def readyz():
+        """Readiness: Mongo answers a (cached) ping; also reports the catalog's state."""
+        mongo = _mongo_reachable()
+        body = {
+            "ready": mongo["ok"],
+            "mongo": {
+                "ok": mongo["ok"],
+                "error": mongo["error"],
+                "checked_seconds_ago": round(time.monotonic() - mongo["checked_at"], 1),
+            },
+            "catalog": catalog_status(db),
+            "catalog_refresher": catalog_refresher.status(),
+        }
+        return jsonify(body), 200 if mongo["ok"] else 503
 
     @login_manager.user_loader
     def load_user(user_id):
@@ -403,6 +1082,7 @@ def create_app():
 
     @app.route("/profile")
     @login_required
+    @conditional_page
     def profile():
         """User profile page showing favorited jobs."""
         user_id = current_user.id
@@ -420,7 +1100,8 @@ def create_app():
             if (company, identifier) in favorite_identifiers:
                 favorited_jobs.append(job)
 
-        favorited_jobs.sort(key=lambda j: j.get("match_score", 0), reverse=True)
+        with span("sort"):
+            favorited_jobs.sort(key=lambda j: j.get("match_score", 0), reverse=True)
 
         return render_template(
             "profile.html",
@@ -461,6 +1142,7 @@ def create_app():
 
         if existing:
             db.favorites.delete_one({"_id": existing["_id"]})
+            bump_user_revision(db, user_id, "favorites")
             return jsonify({"favorited": False, "message": "Removed from favorites"})
         else:
             now = datetime.datetime.now(timezone.utc)
@@ -473,10 +1155,12 @@ def create_app():
                     "created_at": now,
                 }
             )
+            bump_user_revision(db, user_id, "favorites")
             return jsonify({"favorited": True, "message": "Added to favorites"})
 
     @app.route("/api/favorites")
     @login_required
+    @conditional_page
     def get_favorites():
         """Get list of favorited job identifiers for current user."""
         user_id = current_user.id
@@ -487,62 +1171,82 @@ def create_app():
         )
 
     @app.route("/")
+    @conditional_page
     def home():
         user_id = current_user.id if current_user.is_authenticated else "testuser"
 
-        jobs = load_and_score_jobs(db, user_id)
+        # Score the catalog directly so the recency index lines up with the scored jobs
+        catalog = get_job_catalog(db)
+        jobs = score_jobs_for_user(
+            db, user_id, catalog.jobs, mark_favorites=True, facts=catalog.facts
+        )
 
         recommended_jobs = get_recommended_jobs(jobs)  # <— key change
 
-        trending_jobs = sorted(
-            jobs,
-            key=lambda j: (j.get("scraped_at") or j.get("posted_date") or EPOCH),
-            reverse=True,
-        )[:10]
+        live_preview = catalog.newest(jobs, 20)
+        trending_jobs = live_preview[:10]
 
-        live_preview = sorted(
-            jobs,
-            key=lambda j: (j.get("scraped_at") or j.get("posted_date") or EPOCH),
-            reverse=True,
-        )[:20]
+        def cards(section, variant):
+            return card_cache.render(
+                section, variant, catalog.version, user_id, current_user.is_authenticated
+            )
 
         return render_template(
             "index.html",
             user_id=user_id,
-            recommendations=recommended_jobs,
-            trending_jobs=trending_jobs,
-            job_board_preview=live_preview,
+            recommendation_cards=cards(recommended_jobs, "home"),
+            trending_cards=cards(trending_jobs, "trending"),
+            job_board_preview_cards=cards(live_preview, "home"),
             total_live_jobs=len(jobs),
             job_types=JOB_TYPES,
         )
 
     @app.route("/jobs", endpoint="jobs")
+    @conditional_page
     def job_board():
-        """Full live job board with client-side filtering."""
+        """
+        Live job board. The best BOARD_INITIAL_CARDS are rendered here;
+        main.js fetches the whole board from /api/jobs, then searches,
+        filters and scrolls it client-side.
+        """
         user_id = current_user.id if current_user.is_authenticated else "testuser"
 
-        jobs = load_and_score_jobs(db, user_id)
+        # One snapshot for both the jobs and the card cache version, so the
+        # cards always match the jobs even if a rebuild lands meanwhile
+        catalog = get_job_catalog(db)
+        jobs = load_and_score_jobs(db, user_id, catalog)
 
-        jobs_sorted = sorted(
-            jobs,
-            key=lambda j: (
-                j.get("match_score", 0),
-                j.get("scraped_at")
-                or j.get("posted_date")
-                or datetime.datetime(1970, 1, 1, tzinfo=timezone.utc),
-            ),
-            reverse=True,
-        )
+        with span("sort"):
+            # The same first cards board_order would give, without sorting them all
+            top_jobs = heapq.nlargest(BOARD_INITIAL_CARDS, jobs, key=board_key)
 
-        return render_template(
+        # Streamed: the header and first cards go out while the rest are still being joined
+        stream = stream_template(
             "jobs.html",
             user_id=user_id,
-            job_board=jobs_sorted,
+            job_board_cards=card_cache.iter_render(
+                top_jobs, "board", catalog.version, user_id, current_user.is_authenticated
+            ),
+            initial_cards=len(top_jobs),
             job_types=JOB_TYPES,
             total_live_jobs=len(jobs),
         )
+        return app.response_class(flush_in_chunks(stream), mimetype="text/html")
+
+    @app.route("/api/jobs")
+    @conditional_page
+    def api_jobs():
+        """The whole job board, scored for this user, as compact JSON for main.js."""
+        signed_in = current_user.is_authenticated
+        user_id = current_user.id if signed_in else "testuser"
+
+        jobs = load_and_score_jobs(db, user_id)
+        with span("sort"):
+            jobs_sorted = board_order(jobs)
+        return jsonify(board_payload(jobs_sorted, user_id, signed_in))
 
     @app.route("/jobs/<company_slug>/<path:identifier>")
+    @conditional_page
     def job_detail(company_slug, identifier):
         """Detail page for a single job."""
         user_id = current_user.id if current_user.is_authenticated else "testuser"
@@ -620,6 +1324,14 @@ def create_app():
             job_type_prefs=job_type_prefs.get("types", []) if job_type_prefs else [],
         )
 
+    # user_id -> (preferences revision, checked at, header summary)
+    header_summaries = {}
+
+    def _preferences_changed(user_id: str):
+        bump_user_revision(db, user_id, "preferences")
+        header_summaries.pop(user_id, None)
+        g.pop("_user_revisions", None)
+
     def _allow_userid_preferences():
         if not app.config.get("ALLOW_USERID_PREFERENCES_ENDPOINTS", False):
             abort(404)
@@ -640,6 +1352,7 @@ def create_app():
                     }
                 )
 
+        _preferences_changed(user_id)
         return redirect(url_for("preferences", tab="companies"))
 
     @app.route("/preferences/companies", methods=["POST"])
@@ -669,6 +1382,7 @@ def create_app():
                     }
                 )
 
+        _preferences_changed(user_id)
         return redirect(url_for("preferences", tab="roles"))
 
     @app.route("/preferences/roles", methods=["POST"])
@@ -698,6 +1412,7 @@ def create_app():
                     }
                 )
 
+        _preferences_changed(user_id)
         return redirect(url_for("preferences", tab="locations"))
 
     @app.route("/preferences/locations", methods=["POST"])
@@ -721,6 +1436,7 @@ def create_app():
                 {"user_id": user_id, "types": selected_job_types, "created_at": now}
             )
 
+        _preferences_changed(user_id)
         return redirect(url_for("preferences", tab="job_types"))
 
     @app.route("/preferences/job_types", methods=["POST"])
@@ -776,23 +1492,54 @@ def create_app():
             "locations_tracked": location_count,
         }
 
+    def _cached_header_metrics(user_id: str):
+        now = time.monotonic()
+        cached = header_summaries.get(user_id)
+        fetched = g.get("_user_revisions")
+        if cached is not None and fetched is None and now - cached[1] < HEADER_SUMMARY_TTL:
+            # No ETag on this page: trust a recently checked entry, no round trip
+            record_cache("header_summary", hit=True)
+            return cached[2]
+
+        revision = _revisions(user_id)[REVISION_FIELDS.index("preferences")]
+        if cached is not None and cached[0] == revision:
+            record_cache("header_summary", hit=True)
+            header_summaries[user_id] = (revision, now, cached[2])
+            return cached[2]
+
+        record_cache("header_summary", hit=False)
+        summary = _header_metrics(user_id)
+        header_summaries.pop(user_id, None)
+        while len(header_summaries) >= HEADER_SUMMARY_MAX_USERS:
+            # Oldest entry first; dicts keep insertion order
+            header_summaries.pop(next(iter(header_summaries)), None)
+        header_summaries[user_id] = (revision, now, summary)
+        return summary
+
     @app.context_processor
     def inject_global_header_metrics():
         user_id = current_user.id if current_user.is_authenticated else "testuser"
 
-        # 1) Pref-based metrics
-        summary = _header_metrics(user_id)
-
-        # 2) Job-based metrics (live listings + top matches), shared on all pages
-        try:
-            jobs = load_and_score_jobs(db, user_id)
-            header_live_listings = len(jobs)
-            header_top_matches = len(
-                sorted(jobs, key=lambda j: j.get("match_score", 0), reverse=True)[:8]
-            )
-        except Exception:
-            header_live_listings = 0
-            header_top_matches = 0
+        if g.get("error_page"):
+            # Error pages (bots, broken links, error storms) only show what is already
+            # cached: no preference queries, no CSV reads, no catalog build
+            cached = header_summaries.get(user_id)
+            summary = cached[2] if cached else EMPTY_HEADER_SUMMARY
+            status = catalog_status(db)
+            header_live_listings = status.get("jobs", 0)
+            header_top_matches = min(8, header_live_listings)
+        else:
+            # 1) Pref-based metrics, cached per user
+            summary = _cached_header_metrics(user_id)
+
+            # 2) Job-based metrics (live listings + top matches), kept on the catalog
+            try:
+                stats = latest_job_catalog(db).stats
+                header_live_listings = stats["live_listings"]
+                header_top_matches = stats["top_matches"]
+            except Exception:
+                header_live_listings = 0
+                header_top_matches = 0
 
         current_year = datetime.datetime.now().year
 
@@ -805,10 +1552,28 @@ def create_app():
             current_year=current_year,
         )
 
+    @app.cli.command("ingest-jobs")
+    @click.option("--batch-size", default=INGEST_BATCH_SIZE, show_default=True)
+    def ingest_jobs_command(batch_size):
+        """Upsert the scraper CSVs into db.jobs and bump the catalog version."""
+        results, version = ingest_csv_sources(db, batch_size=batch_size)
+        for company, stats in results.items():
+            print(
+                f"[Ingest] {company}: {stats['seen']} seen, "
+                f"{stats['upserted']} new, {stats['modified']} updated, "
+                f"{stats['unchanged']} unchanged, {stats['delisted']} delisted"
+            )
+        if version is None:
+            print("[Ingest] No changes, catalog version left as is")
+        else:
+            print(f"[Ingest] Catalog version is now {version}")
+
     @app.errorhandler(Exception)
     def handle_error(e):
         """Output any errors - good for debugging."""
-        return render_template("error.html", error=e)
+        g.error_page = True
+        # HTTP errors keep their status (404, 405, ...); anything else is a 500
+        return render_template("error.html", error=e), getattr(e, "code", None) or 500
 
     return app
 
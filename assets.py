@@ -0,0 +1,330 @@
+"""
+Response compression and fingerprinted static assets.
+
+Large HTML and JSON responses (the /jobs board is megabytes of cards) are
+gzip- or brotli-compressed on the way out once they pass
+COMPRESS_MIN_SIZE. Brotli is used when the client accepts it; the brotli
+package is in the Pipfile, and without it (a bare checkout) only gzip is
+used. Streamed responses are compressed
+chunk by chunk, flushing after each one so they still arrive progressively.
+
+`python -m assets build` (or `flask build-assets`) copies every file in
+static/ to static/dist/ under a content-hashed name, with .gz and .br
+siblings, and writes a manifest. The former needs only the static folder,
+not the app's configuration, so it runs at image build time.
+When the manifest exists, url_for('static', filename='main.js') emits the
+hashed name, and those files are served precompressed with a year-long
+immutable Cache-Control. Without a build, static files are served as
+before.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import shutil
+import sys
+import zlib
+
+from flask import request, send_from_directory
+
+from profiling import span
+
+try:
+    import brotli
+except ImportError:  # not installed outside pipenv; gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "COMPRESS_MIN_SIZE": 1024,
+    "COMPRESS_LEVEL": 6,
+    "COMPRESS_BROTLI_QUALITY": 5,
+}
+
+COMPRESS_MIMETYPES = frozenset(
+    ("text/html", "application/json", "text/plain", "text/css", "application/javascript", "text/javascript")
+)
+
+ASSETS_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+# Hashed names never change content, so browsers may keep them for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PRECOMPRESS_EXTENSIONS = frozenset((".css", ".js", ".svg", ".json", ".txt", ".html"))
+BUILD_GZIP_LEVEL = 9
+BUILD_BROTLI_QUALITY = 11
+
+
+def _env_config():
+    return {
+        "COMPRESS_MIN_SIZE": int(os.getenv("COMPRESS_MIN_SIZE", DEFAULTS["COMPRESS_MIN_SIZE"])),
+        "COMPRESS_LEVEL": int(os.getenv("COMPRESS_LEVEL", DEFAULTS["COMPRESS_LEVEL"])),
+        "COMPRESS_BROTLI_QUALITY": int(
+            os.getenv("COMPRESS_BROTLI_QUALITY", DEFAULTS["COMPRESS_BROTLI_QUALITY"])
+        ),
+    }
+
+
+def choose_encoding(accept_encodings, available=None):
+    """The best encoding the client accepts: "br", "gzip" or None for identity."""
+    if available is None:
+        available = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_quality = None, 0
+    for encoding in available:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(source, chunks, encoding: str, level: int, brotli_quality: int):
+    """Compress a streamed body chunk by chunk; source is closed when the stream ends."""
+    try:
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=brotli_quality)
+            for chunk in chunks:
+                data = compressor.process(chunk) + compressor.flush()
+                if data:
+                    yield data
+            yield compressor.finish()
+        else:
+            # wbits=31: a gzip container, like gzip.compress
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+            for chunk in chunks:
+                data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                if data:
+                    yield data
+            yield compressor.flush()
+    finally:
+        close = getattr(source, "close", None)
+        if close is not None:
+            close()
+
+
+def fingerprinted_name(filename: str, content: bytes) -> str:
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:10]}{ext}"
+
+
+def build_assets(static_folder: str):
+    """
+    Write hashed (and precompressed) copies of every static file to
+    static/dist/ and return the manifest: {filename: "dist/<hashed name>"}.
+    """
+    out_dir = os.path.join(static_folder, ASSETS_DIR)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    manifest = {}
+
+    for root, dirs, files in os.walk(static_folder):
+        if root == static_folder and ASSETS_DIR in dirs:
+            dirs.remove(ASSETS_DIR)
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            filename = os.path.relpath(path, static_folder).replace(os.sep, "/")
+            with open(path, "rb") as f:
+                content = f.read()
+
+            hashed = f"{ASSETS_DIR}/{fingerprinted_name(filename, content)}"
+            target = os.path.join(static_folder, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(content)
+            if os.path.splitext(name)[1] in PRECOMPRESS_EXTENSIONS:
+                with open(target + ".gz", "wb") as f:
+                    f.write(gzip.compress(content, compresslevel=BUILD_GZIP_LEVEL, mtime=0))
+                if brotli is not None:
+                    with open(target + ".br", "wb") as f:
+                        f.write(brotli.compress(content, quality=BUILD_BROTLI_QUALITY))
+            manifest[filename] = hashed
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(static_folder: str):
+    path = os.path.join(static_folder, ASSETS_DIR, MANIFEST_NAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable asset manifest %s: %s", path, e)
+        return {}
+
+
+class Assets:
+    """
+    The manifest and the hashed names it maps to. The manifest is read on
+    first use, not when the app is created.
+    """
+
+    def __init__(self, static_folder: str):
+        self.static_folder = static_folder
+        self._loaded = None
+
+    def _load(self):
+        manifest = load_manifest(self.static_folder)
+        version = hashlib.sha1(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        return manifest, frozenset(manifest.values()), version
+
+    def _state(self):
+        state = self._loaded
+        if state is None:
+            state = self._loaded = self._load()
+        return state
+
+    def reload(self):
+        self._loaded = self._load()
+
+    @property
+    def manifest(self):
+        return self._state()[0]
+
+    @property
+    def hashed(self):
+        return self._state()[1]
+
+    @property
+    def version(self):
+        return self._state()[2]
+
+    def url_filename(self, filename: str) -> str:
+        return self.manifest.get(filename, filename)
+
+
+def _mark_encoded(response, encoding: str):
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # the same entity in another encoding is no longer byte-identical
+        response.set_etag(etag, weak=True)
+
+
+def init_assets(app):
+    """Compress large responses, serve built static assets, and add `flask build-assets`."""
+    for key, value in _env_config().items():
+        app.config.setdefault(key, value)
+
+    assets = Assets(app.static_folder)
+    app.extensions["assets"] = assets
+    serve_plain = app.view_functions["static"]
+
+    @app.url_defaults
+    def _fingerprint_static(endpoint, values):
+        if endpoint == "static" and "filename" in values:
+            values["filename"] = assets.url_filename(values["filename"])
+
+    def serve_static(filename):
+        if filename not in assets.hashed:
+            return serve_plain(filename=filename)
+
+        encoding = choose_encoding(request.accept_encodings)
+        suffix = {"br": ".br", "gzip": ".gz"}.get(encoding)
+        if suffix and os.path.exists(os.path.join(app.static_folder, filename + suffix)):
+            response = send_from_directory(
+                app.static_folder,
+                filename + suffix,
+                mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+            )
+            response.headers["Content-Encoding"] = encoding
+        else:
+            response = serve_plain(filename=filename)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        response.vary.add("Accept-Encoding")
+        return response
+
+    app.view_functions["static"] = serve_static
+
+    @app.after_request
+    def _compress_response(response):
+        if (
+            response.mimetype not in COMPRESS_MIMETYPES
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        if response.status_code != 200 or request.method == "HEAD":
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        if response.is_streamed:
+            # Size is unknown up front; streamed pages are the large ones
+            source = response.response
+            response.response = compress_stream(
+                source,
+                response.iter_encoded(),
+                encoding,
+                app.config["COMPRESS_LEVEL"],
+                app.config["COMPRESS_BROTLI_QUALITY"],
+            )
+            response.headers.pop("Content-Length", None)
+            _mark_encoded(response, encoding)
+            return response
+
+        data = response.get_data()
+        if len(data) < app.config["COMPRESS_MIN_SIZE"]:
+            return response
+
+        with span("compress"):
+            response.set_data(
+                compress(
+                    data,
+                    encoding,
+                    app.config["COMPRESS_LEVEL"],
+                    app.config["COMPRESS_BROTLI_QUALITY"],
+                )
+            )
+        _mark_encoded(response, encoding)
+        return response
+
+    @app.cli.command("build-assets")
+    def build_assets_command():
+        """Write fingerprinted, precompressed copies of static/ to static/dist/."""
+        manifest = build_assets(app.static_folder)
+        assets.reload()
+        _report_build(app.static_folder, manifest)
+
+    return assets
+
+
+def _report_build(static_folder: str, manifest):
+    print(f"[Assets] Built {len(manifest)} files into {os.path.join(static_folder, ASSETS_DIR)}")
+
+
+def main(argv=None):
+    """`python -m assets build [static folder]`, without importing or configuring the app."""
+    parser = argparse.ArgumentParser(prog="python -m assets", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument(
+        "static_folder",
+        nargs="?",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"),
+        help="folder to build from (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    if brotli is None:
+        logger.warning("brotli is not installed; building .gz files only")
+    _report_build(args.static_folder, build_assets(args.static_folder))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Rendered job-card fragments shared by every user.
+
+Most of a job card (title, company, location, tags, links) is the same
+for everyone; only the match score, the favorite button and the board's
+user_id link parameter differ. CardCache renders each job's card once per
+catalog version from templates/_job_card.html, split around those
+per-user slots, and builds a page by joining the cached pieces with each
+user's values instead of evaluating the template per job.
+
+Each render marks its slots with a fresh random token, so job text can
+never be mistaken for a slot, whatever it contains.
+"""
+
+from __future__ import annotations
+
+import re
+import secrets
+import threading
+from typing import NamedTuple
+from urllib.parse import quote
+
+from markupsafe import Markup, escape
+
+from metrics import record_cache
+from profiling import span
+
+CARD_TEMPLATE = "_job_card.html"
+# Upper bound on cached cards across all variants; past it, cards are rendered uncached
+DEFAULT_MAX_CARDS = 50_000
+
+VARIANTS = ("board", "home", "trending")
+
+# Cards per chunk when a page is streamed
+STREAM_BATCH = 50
+
+SLOTS = ("match", "user_id", "favorite")
+
+
+class CardFragment(NamedTuple):
+    """One job's rendered card: static chunks with a slot name between each pair."""
+
+    chunks: tuple
+    slots: tuple
+    favorite_on: str
+    favorite_off: str
+
+
+def slot_markers(token: str):
+    """{slot name: marker} for a card rendered with token; markers survive escaping and URL quoting."""
+    return {name: f"__{token}_{name}__" for name in SLOTS}
+
+
+def split_slots(html: str, token: str):
+    """(chunks, slot names) of rendered HTML around its slot_markers(token)."""
+    pieces = re.split(rf"__{token}_({'|'.join(SLOTS)})__", html)
+    return tuple(pieces[0::2]), tuple(pieces[1::2])
+
+
+class CardCache:
+    """Card fragments for one catalog version, keyed by (variant, company, identifier)."""
+
+    def __init__(self, jinja_env, max_cards: int = DEFAULT_MAX_CARDS):
+        self.jinja_env = jinja_env
+        self.max_cards = max_cards
+        self.version = None
+        self._cards = {}
+        self._lock = threading.Lock()
+
+    def _cards_for(self, version):
+        """The fragment dict for version, dropping every fragment from an older one."""
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    self._cards = {}
+                    self.version = version
+        return self._cards
+
+    def render_fragment(self, job, variant: str) -> CardFragment:
+        macros = self.jinja_env.get_template(CARD_TEMPLATE).module
+        token = secrets.token_hex(8)
+        html = str(macros.card(job, variant, slot_markers(token))).strip()
+        return CardFragment(
+            *split_slots(html, token),
+            str(macros.favorite_button(job, variant, True)).strip(),
+            str(macros.favorite_button(job, variant, False)).strip(),
+        )
+
+    def render(self, jobs, variant: str, version, user_id, show_favorite: bool) -> Markup:
+        """
+        The cards for jobs (scored for user_id) as one Markup string.
+        version must change whenever any job's content can have changed;
+        the catalog version does.
+        """
+        return Markup("").join(
+            self.iter_render(jobs, variant, version, user_id, show_favorite, batch=len(jobs) or 1)
+        )
+
+    def iter_render(self, jobs, variant: str, version, user_id, show_favorite: bool, batch: int = STREAM_BATCH):
+        """Like render, but yields the cards as Markup strings of `batch` cards each."""
+        if variant not in VARIANTS:
+            raise ValueError(f"unknown card variant {variant!r}")
+
+        cards = self._cards_for(version)
+        values = {"user_id": str(escape(quote(str(user_id), safe="")))}
+        parts = []
+        misses = 0
+        for n, job in enumerate(jobs, 1):
+            key = (variant, job.get("company"), job.get("identifier"))
+            fragment = cards.get(key)
+            if fragment is None:
+                misses += 1
+                with span("cards"):
+                    fragment = self.render_fragment(job, variant)
+                if len(cards) < self.max_cards:
+                    cards[key] = fragment
+            values["match"] = str(job.get("match_score", 0))
+            if not show_favorite:
+                values["favorite"] = ""
+            elif job.get("is_favorited"):
+                values["favorite"] = fragment.favorite_on
+            else:
+                values["favorite"] = fragment.favorite_off
+
+            chunks = fragment.chunks
+            parts.append(chunks[0])
+            for i, slot in enumerate(fragment.slots, 1):
+                parts.append(values[slot])
+                parts.append(chunks[i])
+            parts.append("\n")
+
+            if n % batch == 0:
+                yield Markup("".join(parts))
+                parts = []
+
+        if parts:
+            yield Markup("".join(parts))
+        if jobs:
+            record_cache("cards", hit=True, count=len(jobs) - misses)
+            record_cache("cards", hit=False, count=misses)
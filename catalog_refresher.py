@@ -0,0 +1,199 @@
+"""
+Background refresh of the job catalog.
+
+Without a refresher, every request checks the catalog's sources (the Mongo
+catalog version and a stat of each scraper CSV) and, when one has changed,
+rebuilds the catalog inline, so whichever request comes first after a
+scraper run or an ingest pays for the rebuild. CatalogRefresher moves that
+work to a daemon thread. The thread checks the sources, builds a new
+catalog when they change, and publishes it with one reference swap.
+Requests just read the current snapshot, without checking the sources and
+without taking a lock.
+
+On Linux, where the Pipfile installs inotify_simple, the thread watches
+the CSV directories with inotify and wakes as soon as a scraper replaces a
+file. Elsewhere, or if a directory cannot be watched, it polls every
+CATALOG_POLL_SECONDS.
+The Mongo catalog version is polled at that interval either way. A failed
+check is logged and the current catalog is kept.
+
+The thread is started by the first request in each process, never at
+import or app creation, so each worker of a forking server runs its own.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+
+try:
+    import inotify_simple
+except ImportError:  # Linux only (see the Pipfile); poll instead
+    inotify_simple = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "CATALOG_REFRESH_ENABLED": True,
+    "CATALOG_POLL_SECONDS": 5.0,
+    "CATALOG_SETTLE_SECONDS": 0.5,
+}
+
+# Scrapers write to a temp file and rename it into place (csv_store.save_jobs_csv)
+if inotify_simple is not None:
+    WATCH_FLAGS = (
+        inotify_simple.flags.CLOSE_WRITE
+        | inotify_simple.flags.MOVED_TO
+        | inotify_simple.flags.MOVED_FROM
+        | inotify_simple.flags.DELETE
+    )
+
+# Running refreshers by id(db), for keeps_current
+_running = {}
+
+
+def _env_config():
+    return {
+        "CATALOG_REFRESH_ENABLED": os.getenv("CATALOG_REFRESH_ENABLED", "1") not in ("", "0", "false"),
+        "CATALOG_POLL_SECONDS": float(
+            os.getenv("CATALOG_POLL_SECONDS", DEFAULTS["CATALOG_POLL_SECONDS"])
+        ),
+        "CATALOG_SETTLE_SECONDS": float(
+            os.getenv("CATALOG_SETTLE_SECONDS", DEFAULTS["CATALOG_SETTLE_SECONDS"])
+        ),
+    }
+
+
+def keeps_current(db) -> bool:
+    """Whether a running refresher in this process keeps db's catalog current."""
+    refresher = _running.get(id(db))
+    return refresher is not None and refresher.db is db and refresher.is_alive()
+
+
+class CatalogRefresher:
+    """
+    Calls refresh(db, key) from a daemon thread whenever source_key(db)
+    changes. refresh builds and publishes the catalog for that key.
+    """
+
+    def __init__(self, app, db, source_key, refresh, watch_dirs=()):
+        self.app = app
+        self.db = db
+        self.watch_dirs = list(watch_dirs)
+        self.mode = None  # "inotify" or "poll" while running
+        self.last_check = None
+        self.last_error = None
+        self._source_key = source_key
+        self._refresh = refresh
+        self._key = None
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def is_alive(self) -> bool:
+        # Threads do not survive a fork, so this is False in a fresh worker
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def start(self):
+        """Start the thread for this process if it is not running yet."""
+        if self._pid == os.getpid() and self.is_alive():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid() and self.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="catalog-refresher", daemon=True
+            )
+            self._thread.start()
+            _running[id(self.db)] = self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        if _running.get(id(self.db)) is self:
+            del _running[id(self.db)]
+
+    def check(self):
+        """Rebuild and publish the catalog if a source changed since the last check."""
+        key = self._source_key(self.db)
+        if key != self._key:
+            self._refresh(self.db, key)
+            self._key = key
+        self.last_check = time.time()
+
+    def status(self):
+        return {
+            "running": self.is_alive(),
+            "mode": self.mode,
+            "checked_seconds_ago": (
+                round(time.time() - self.last_check, 1) if self.last_check else None
+            ),
+            "error": self.last_error,
+        }
+
+    def _open_watcher(self):
+        if inotify_simple is None or not self.watch_dirs:
+            return None
+        watcher = inotify_simple.INotify()
+        try:
+            for directory in self.watch_dirs:
+                watcher.add_watch(directory, WATCH_FLAGS)
+        except OSError as e:
+            watcher.close()
+            logger.info("Not watching %s (%s); polling for catalog changes", self.watch_dirs, e)
+            return None
+        return watcher
+
+    def _wait(self, watcher):
+        poll = self.app.config["CATALOG_POLL_SECONDS"]
+        if watcher is None:
+            self._stop.wait(poll)
+            return
+        if watcher.read(timeout=int(poll * 1000)):
+            # A scraper run replaces several files; rebuild once they have all landed
+            settle = int(self.app.config["CATALOG_SETTLE_SECONDS"] * 1000)
+            deadline = time.monotonic() + poll
+            while watcher.read(timeout=settle) and time.monotonic() < deadline:
+                pass
+
+    def _run(self):
+        watcher = self._open_watcher()
+        self.mode = "inotify" if watcher is not None else "poll"
+        try:
+            while not self._stop.is_set():
+                try:
+                    with self.app.app_context():
+                        self.check()
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.warning("Catalog refresh failed; keeping the current catalog: %s", e)
+                self._wait(watcher)
+        finally:
+            if watcher is not None:
+                watcher.close()
+            self.mode = None
+
+
+def init_catalog_refresher(app, db, source_key, refresh, watch_dirs=()):
+    """Keep db's catalog current from a background thread, started by the first request."""
+    for key, value in _env_config().items():
+        app.config.setdefault(key, value)
+
+    refresher = CatalogRefresher(app, db, source_key, refresh, watch_dirs)
+    app.extensions["catalog_refresher"] = refresher
+
+    @app.before_request
+    def _start_catalog_refresher():
+        if app.config["CATALOG_REFRESH_ENABLED"]:
+            refresher.start()
+
+    return refresher
@@ -0,0 +1,193 @@
+"""
+Compact in-memory record for catalog jobs.
+
+The catalog keeps every scraped job for the lifetime of a worker, so each
+one is a __slots__ object instead of a ten-key dict. Company, location,
+department and type repeat thousands of times, so they are stored once
+in per-column CategoryTables and each record holds small integer codes
+into them; scoring compares codes instead of strings. Tags are a shared
+tuple of interned strings, and the scrape time is an epoch int rather
+than two datetime objects. JobRecord reads like a dict (get, [], keys,
+items, dict(record)), so templates, dedupe, hashing and ingest work on
+it unchanged; copy() returns a plain dict for callers that add fields.
+"""
+
+from __future__ import annotations
+
+import datetime
+import sys
+import threading
+from datetime import timezone
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_epoch(dt: datetime.datetime | None) -> int | None:
+    if dt is None:
+        return None
+    return int((dt - EPOCH).total_seconds())
+
+
+def from_epoch(ts: int | None) -> datetime.datetime | None:
+    if ts is None:
+        return None
+    return EPOCH + datetime.timedelta(seconds=ts)
+
+
+def intern(value: str) -> str:
+    return sys.intern(value) if value else ""
+
+
+class CategoryTable:
+    """Append-only table mapping each distinct value of one column to a small int code."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.values = []
+        self._codes = {}
+        self._lock = threading.Lock()
+
+    def code(self, value: str) -> int:
+        """The value's code, adding it to the table if it is new."""
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def lookup(self, value):
+        """The value's code, or None if no job has it; never grows the table."""
+        return self._codes.get(value)
+
+    def __len__(self):
+        return len(self.values)
+
+
+COMPANY = CategoryTable("company")
+LOCATION = CategoryTable("location")
+DEPARTMENT = CategoryTable("department")
+JOB_TYPE = CategoryTable("type")
+
+_COMPANY_VALUES = COMPANY.values
+_LOCATION_VALUES = LOCATION.values
+_DEPARTMENT_VALUES = DEPARTMENT.values
+_JOB_TYPE_VALUES = JOB_TYPE.values
+
+
+class JobRecord:
+    """One scraped job, with the same keys the CSV loader used to put in a dict."""
+
+    __slots__ = (
+        "title",
+        "location_code",
+        "department_code",
+        "job_id",
+        "url",
+        "scraped_ts",
+        "company_code",
+        "type_code",
+        "tags",
+    )
+
+    KEYS = (
+        "title",
+        "location",
+        "department",
+        "job_id",
+        "url",
+        "scraped_at",
+        "posted_date",
+        "company",
+        "type",
+        "tags",
+    )
+    _ATTR_KEYS = frozenset(("title", "location", "department", "job_id", "url", "company", "type"))
+    # scraped_at and posted_date are the same moment, stored once
+    _DATETIME_KEYS = frozenset(("scraped_at", "posted_date"))
+
+    def __init__(self, title, location, department, job_id, url, scraped_ts, company, job_type, tags):
+        self.title = title
+        self.location_code = LOCATION.code(location)
+        self.department_code = DEPARTMENT.code(department)
+        self.job_id = job_id
+        self.url = url
+        self.scraped_ts = scraped_ts
+        self.company_code = COMPANY.code(company)
+        self.type_code = JOB_TYPE.code(job_type)
+        self.tags = tuple(intern(t) for t in tags)
+
+    @property
+    def company(self) -> str:
+        return _COMPANY_VALUES[self.company_code]
+
+    @property
+    def location(self) -> str:
+        return _LOCATION_VALUES[self.location_code]
+
+    @property
+    def department(self) -> str:
+        return _DEPARTMENT_VALUES[self.department_code]
+
+    @property
+    def type(self) -> str:
+        return _JOB_TYPE_VALUES[self.type_code]
+
+    def get(self, key, default=None):
+        if key in self._ATTR_KEYS:
+            return getattr(self, key)
+        if key in self._DATETIME_KEYS:
+            return from_epoch(self.scraped_ts)
+        if key == "tags":
+            # the shared tuple stays on the record (record.tags); dict access gets a list like before
+            return list(self.tags)
+        return default
+
+    def __getitem__(self, key):
+        if key in self.KEYS:
+            return self.get(key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def keys(self):
+        return self.KEYS
+
+    def items(self):
+        return self.copy().items()
+
+    def copy(self) -> dict:
+        """A plain dict with the loader's original keys, like dict.copy()."""
+        dt = from_epoch(self.scraped_ts)
+        return {
+            "title": self.title,
+            "location": self.location,
+            "department": self.department,
+            "job_id": self.job_id,
+            "url": self.url,
+            "scraped_at": dt,
+            "posted_date": dt,
+            "company": self.company,
+            "type": self.type,
+            "tags": list(self.tags),
+        }
+
+    def __eq__(self, other):
+        if isinstance(other, JobRecord):
+            return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"JobRecord({self.company!r}, {self.job_id!r}, {self.title!r})"
@@ -0,0 +1,621 @@
+"""
+Application metrics for the Flask app, served on /metrics in the
+Prometheus text format.
+
+MetricsRegistry holds counters, gauges and histograms. With
+METRICS_MULTIPROC_DIR set, every worker process writes its samples to
+<dir>/metrics-<pid>.json and /metrics merges all of them, so the numbers
+are the same whichever worker answers the scrape: counters and histograms
+are summed (including from workers that have exited), gauges take the
+most recent value from a live worker, and active sessions are the union
+of the users every worker has seen. The files of exited workers are
+folded into <dir>/metrics-archive.json and removed, so the directory does
+not grow with every worker ever started and a new worker that reuses a
+pid cannot overwrite what the old one counted.
+
+record_cache counts lookups per cache and /metrics renders each cache's
+hit ratio: the job catalog, header summaries, job cards, and score_facts,
+the score cache. Scoring keeps no per-user results, so score_facts counts
+jobs scored from their catalog's precomputed facts as hits and jobs whose
+facts had to be derived per request as misses.
+
+QueryMonitor is a pymongo CommandListener that tags every command with the
+Flask route that issued it and keeps round trips, time and documents
+returned per route and command. Requests that issue more commands than
+their query budget are logged with a per-command breakdown, which is how
+N+1 loops (one insert_one per item, one find per row) show up.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import glob
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter as _TallyCounter
+
+from flask import (
+    Response,
+    current_app,
+    g,
+    has_app_context,
+    has_request_context,
+    request,
+    session,
+)
+from pymongo import monitoring
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; archiving is then not serialized between workers
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+NO_ROUTE = "<none>"
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+EXPORT_INTERVAL = 1.0
+ACTIVE_SESSION_WINDOW = 15 * 60
+
+# Counters and histograms of exited workers, in the multiproc dir
+ARCHIVE_FILE = "metrics-archive.json"
+LOCK_FILE = ".metrics.lock"
+
+
+def prom_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def _labels(names, values, extra=""):
+    parts = [f'{n}="{prom_label(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry, name, help_text, labelnames=()):
+        self._registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels))
+
+    def state(self):
+        return {
+            "kind": self.kind,
+            "help": self.help,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(k), v] for k, v in self._values.items()],
+        }
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._registry.lock:
+            self._values[key] = self._values.get(key, 0) + amount
+            self._registry.dirty = True
+
+
+class Gauge(_Metric):
+    """Last value set; across workers the most recently set value wins."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._registry.lock:
+            self._values[self._key(labels)] = [value, time.time()]
+            self._registry.dirty = True
+
+    def value(self, **labels):
+        sample = self._values.get(self._key(labels))
+        return sample[0] if sample else None
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._registry.lock:
+            # per-bucket counts (not cumulative), then +Inf, sum, count
+            sample = self._values.get(key)
+            if sample is None:
+                sample = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample[i] += 1
+                    break
+            else:
+                sample[len(self.buckets)] += 1
+            sample[-2] += value
+            sample[-1] += 1
+            self._registry.dirty = True
+
+    def state(self):
+        state = super().state()
+        state["buckets"] = list(self.buckets)
+        return state
+
+
+class ActiveSet(_Metric):
+    """Gauge of distinct members seen within the last `window` seconds."""
+
+    kind = "active"
+
+    def __init__(self, registry, name, help_text, window=ACTIVE_SESSION_WINDOW):
+        super().__init__(registry, name, help_text)
+        self.window = window
+
+    def touch(self, member):
+        now = time.time()
+        with self._registry.lock:
+            seen = self._values.setdefault((), {})
+            previous = seen.get(str(member))
+            seen[str(member)] = now
+            if previous is None or now - previous > EXPORT_INTERVAL:
+                self._registry.dirty = True
+            if len(seen) > 1000 and previous is None:
+                cutoff = now - self.window
+                for key in [k for k, ts in seen.items() if ts < cutoff]:
+                    del seen[key]
+
+    def value(self):
+        cutoff = time.time() - self.window
+        return sum(1 for ts in self._values.get((), {}).values() if ts >= cutoff)
+
+    def state(self):
+        state = super().state()
+        state["window"] = self.window
+        return state
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms for one process, optionally shared through a directory."""
+
+    def __init__(self, multiproc_dir=None):
+        self.lock = threading.RLock()
+        self.metrics = {}
+        self.multiproc_dir = multiproc_dir
+        self.dirty = False
+        self._exporter_pid = None
+        self._exported_pid = None
+        if hasattr(os, "register_at_fork"):
+            # a forked worker must not re-report what its parent counted
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self):
+        self.lock = threading.RLock()
+        for metric in self.metrics.values():
+            metric._values.clear()
+        self._exporter_pid = None
+        self._exported_pid = None
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(self, name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def active_set(self, name, help_text, window=ACTIVE_SESSION_WINDOW):
+        return self._get_or_create(ActiveSet, name, help_text, window=window)
+
+    def state(self):
+        with self.lock:
+            return json.loads(json.dumps({name: m.state() for name, m in self.metrics.items()}))
+
+    # -- multi-process ------------------------------------------------------
+
+    def _export_path(self, pid=None):
+        return os.path.join(self.multiproc_dir, f"metrics-{pid or os.getpid()}.json")
+
+    def export(self):
+        """Write this process's samples for the other workers to merge."""
+        if not self.multiproc_dir:
+            return
+        if self._exported_pid != os.getpid():
+            # A file under our pid is from an exited process that had it before us
+            self.archive_dead_workers()
+        with self.lock:
+            state = self.state()
+            self.dirty = False
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        path = self._export_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        self._exported_pid = os.getpid()
+
+    @contextlib.contextmanager
+    def _dir_lock(self, exclusive):
+        """Serialize archiving against itself (exclusive) and against merging (shared)."""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        with open(os.path.join(self.multiproc_dir, LOCK_FILE), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def _worker_files(self):
+        """(pid, path) of every worker's export file."""
+        for path in glob.glob(os.path.join(self.multiproc_dir, "metrics-*.json")):
+            match = re.search(r"metrics-(\d+)\.json$", path)
+            if match:
+                yield int(match.group(1)), path
+
+    def _is_ours_or_alive(self, pid):
+        if pid == os.getpid():
+            return self._exported_pid == pid
+        return _pid_alive(pid)
+
+    def archive_dead_workers(self):
+        """
+        Fold the counters and histograms of exited workers into ARCHIVE_FILE
+        and delete their files. Their gauges and active sessions are dropped,
+        as the merge would ignore them anyway.
+        """
+        if not self.multiproc_dir or not os.path.isdir(self.multiproc_dir):
+            return
+        with self._dir_lock(exclusive=True):
+            dead = [path for pid, path in self._worker_files() if not self._is_ours_or_alive(pid)]
+            if not dead:
+                return
+            archive_path = os.path.join(self.multiproc_dir, ARCHIVE_FILE)
+            states = [(None, state) for state in map(_read_state, [archive_path, *dead]) if state]
+            tmp_path = f"{archive_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(merge_states(states), f)
+            os.replace(tmp_path, archive_path)
+            for path in dead:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+
+    def start_exporter(self):
+        """Flush dirty samples every EXPORT_INTERVAL from a daemon thread, once per process."""
+        if not self.multiproc_dir or self._exporter_pid == os.getpid():
+            return
+        self._exporter_pid = os.getpid()
+
+        def loop():
+            while True:
+                time.sleep(EXPORT_INTERVAL)
+                if self.dirty:
+                    try:
+                        self.export()
+                    except OSError:
+                        logger.exception("Could not export metrics to %s", self.multiproc_dir)
+
+        threading.Thread(target=loop, name="metrics-exporter", daemon=True).start()
+
+    def collect(self):
+        """Merged state of every worker, or just this process without a multiproc dir."""
+        if not self.multiproc_dir:
+            return self.state()
+
+        self.archive_dead_workers()
+        self.export()
+        with self._dir_lock(exclusive=False):
+            states = [(pid, _read_state(path)) for pid, path in self._worker_files()]
+            states.append((None, _read_state(os.path.join(self.multiproc_dir, ARCHIVE_FILE))))
+        return merge_states([(pid, state) for pid, state in states if state])
+
+    def render(self):
+        return render_state(self.collect())
+
+
+def _read_state(path):
+    """A worker's exported state, or None if it is gone or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def merge_states(states):
+    """Merge [(pid, state)] from several workers into one state; pid None is the archive."""
+    merged = {}
+    for pid, state in states:
+        alive = pid is not None and (pid == os.getpid() or _pid_alive(pid))
+        for name, metric in state.items():
+            kind = metric["kind"]
+            target = merged.setdefault(name, {**metric, "samples": {}})
+            samples = target["samples"]
+            for labels, value in metric["samples"]:
+                key = tuple(labels)
+                if kind == "counter":
+                    samples[key] = samples.get(key, 0) + value
+                elif kind == "histogram":
+                    current = samples.get(key)
+                    samples[key] = value if current is None else [a + b for a, b in zip(current, value)]
+                elif not alive:
+                    continue
+                elif kind == "gauge":
+                    current = samples.get(key)
+                    if current is None or value[1] > current[1]:
+                        samples[key] = value
+                elif kind == "active":
+                    seen = samples.setdefault(key, {})
+                    for member, ts in value.items():
+                        seen[member] = max(ts, seen.get(member, 0))
+
+    for metric in merged.values():
+        metric["samples"] = [[list(k), v] for k, v in metric["samples"].items()]
+    return merged
+
+
+def render_state(state) -> str:
+    """Prometheus text exposition of a (merged) registry state."""
+    lines = []
+    now = time.time()
+    for name in sorted(state):
+        metric = state[name]
+        kind = metric["kind"]
+        names = metric["labelnames"]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {'gauge' if kind == 'active' else kind}")
+        for labels, value in sorted(metric["samples"]):
+            if kind == "counter":
+                lines.append(f"{name}{_labels(names, labels)} {_fmt(value)}")
+            elif kind == "gauge":
+                lines.append(f"{name}{_labels(names, labels)} {_fmt(value[0])}")
+            elif kind == "active":
+                cutoff = now - metric["window"]
+                count = sum(1 for ts in value.values() if ts >= cutoff)
+                lines.append(f"{name}{_labels(names, labels)} {count}")
+            elif kind == "histogram":
+                cumulative = 0
+                for bound, count in zip(metric["buckets"] + ["+Inf"], value):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{name}_bucket{_labels(names, labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_labels(names, labels)} {_fmt(value[-2])}")
+                lines.append(f"{name}_count{_labels(names, labels)} {value[-1]}")
+
+    cache = state.get("cache_requests_total")
+    if cache:
+        totals = {}
+        for (cache_name, result), count in cache["samples"]:
+            hits, total = totals.get(cache_name, (0, 0))
+            totals[cache_name] = (hits + (count if result == "hit" else 0), total + count)
+        lines.append("# HELP cache_hit_ratio Share of cache lookups that were hits")
+        lines.append("# TYPE cache_hit_ratio gauge")
+        for cache_name, (hits, total) in sorted(totals.items()):
+            lines.append(f'cache_hit_ratio{{cache="{prom_label(cache_name)}"}} {_fmt(hits / total)}')
+    return "\n".join(lines) + "\n"
+
+
+def app_registry():
+    """The current app's registry, or None outside an app context (CLI scripts, benchmarks)."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("metrics_registry")
+
+
+def record_cache(cache: str, hit: bool, count: int = 1):
+    registry = app_registry()
+    if registry is not None and count:
+        registry.counter(
+            "cache_requests_total", "Cache lookups by cache and result", ("cache", "result")
+        ).inc(count, cache=cache, result="hit" if hit else "miss")
+
+
+def record_csv_load(company: str, seconds: float):
+    registry = app_registry()
+    if registry is not None:
+        registry.histogram(
+            "csv_load_seconds", "Time to load and normalize a scraper CSV", ("company",)
+        ).observe(seconds, company=company)
+
+
+def record_catalog_build(seconds: float, size: int):
+    registry = app_registry()
+    if registry is not None:
+        registry.histogram("catalog_build_seconds", "Time to rebuild the job catalog").observe(seconds)
+        registry.gauge("catalog_jobs", "Jobs in the current catalog").set(size)
+
+
+def _current_route():
+    if not has_request_context():
+        return NO_ROUTE
+    rule = request.url_rule
+    return rule.rule if rule is not None else UNMATCHED_ROUTE
+
+
+def documents_returned(command_name: str, reply) -> int:
+    """How many documents a command reply carried back to the app."""
+    if not isinstance(reply, dict):
+        return 0
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch", []))
+        return len(batch)
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+    return 0
+
+
+class QueryMonitor(monitoring.CommandListener):
+    """Per-route Mongo round trips, latency and documents returned."""
+
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        route_command = ("route", "command")
+        self._commands = self.registry.counter(
+            "mongo_commands_total", "Mongo round trips by route and command", route_command
+        )
+        self._seconds = self.registry.counter(
+            "mongo_command_seconds_total", "Time spent in Mongo commands by route and command", route_command
+        )
+        self._documents = self.registry.counter(
+            "mongo_documents_returned_total", "Documents returned by Mongo by route and command", route_command
+        )
+        self._failures = self.registry.counter(
+            "mongo_command_failures_total", "Failed Mongo commands by route and command", route_command
+        )
+        self._requests = self.registry.counter("http_requests_total", "Requests served by route", ("route",))
+        self._over_budget = self.registry.counter(
+            "mongo_query_budget_exceeded_total",
+            "Requests that went over their Mongo query budget",
+            ("route",),
+        )
+
+    def started(self, event):
+        pass
+
+    def _record(self, event, docs, failed):
+        labels = {"route": _current_route(), "command": event.command_name}
+        self._commands.inc(**labels)
+        self._seconds.inc(event.duration_micros / 1_000_000, **labels)
+        self._documents.inc(docs, **labels)
+        self._failures.inc(int(failed), **labels)
+
+        if has_request_context():
+            per_request = g.get("_mongo_commands")
+            if per_request is None:
+                per_request = g._mongo_commands = _TallyCounter()
+            per_request[event.command_name] += 1
+
+    def succeeded(self, event):
+        self._record(event, documents_returned(event.command_name, event.reply), False)
+
+    def failed(self, event):
+        self._record(event, 0, True)
+
+    def finish_request(self, route: str, budget: int):
+        """Close out one request; returns its per-command Counter if it went over budget."""
+        per_request = g.pop("_mongo_commands", None) or _TallyCounter()
+        over = sum(per_request.values()) > budget
+        self._requests.inc(route=route)
+        self._over_budget.inc(int(over), route=route)
+        return per_request if over else None
+
+    def snapshot(self):
+        """This process's counts as ({(route, command): [count, seconds, docs, failures]},
+        {route: [requests, over_budget]})."""
+        with self.registry.lock:
+            commands = {
+                key: [
+                    self._commands._values[key],
+                    self._seconds._values.get(key, 0.0),
+                    self._documents._values.get(key, 0),
+                    self._failures._values.get(key, 0),
+                ]
+                for key in self._commands._values
+            }
+            requests = {
+                key[0]: [count, self._over_budget._values.get(key, 0)]
+                for key, count in self._requests._values.items()
+            }
+        return commands, requests
+
+    def prometheus_text(self) -> str:
+        return self.registry.render()
+
+
+def init_metrics(app, monitor: QueryMonitor):
+    """Record request metrics, enforce query budgets and serve /metrics."""
+    app.config.setdefault("QUERY_BUDGET", int(os.getenv("QUERY_BUDGET", "25")))
+    # Per-route overrides, keyed by URL rule, e.g. {"/profile": 40}
+    app.config.setdefault("QUERY_BUDGETS", {})
+    registry = monitor.registry
+    if registry.multiproc_dir is None:
+        registry.multiproc_dir = os.getenv("METRICS_MULTIPROC_DIR") or None
+    app.extensions["query_monitor"] = monitor
+    app.extensions["metrics_registry"] = registry
+
+    latency = registry.histogram(
+        "http_request_duration_seconds", "Request latency by endpoint", ("endpoint", "method")
+    )
+    sessions = registry.active_set(
+        "active_sessions", "Logged-in users seen in the last 15 minutes", ACTIVE_SESSION_WINDOW
+    )
+
+    @app.before_request
+    def _start_request_metrics():
+        g._metrics_start = time.perf_counter()
+        user_id = session.get("_user_id")  # set by flask_login, no db lookup needed
+        if user_id:
+            sessions.touch(user_id)
+
+    @app.after_request
+    def _finish_request_metrics(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            latency.observe(
+                time.perf_counter() - start,
+                endpoint=request.endpoint or UNMATCHED_ROUTE,
+                method=request.method,
+            )
+
+        route = _current_route()
+        budget = app.config["QUERY_BUDGETS"].get(route, app.config["QUERY_BUDGET"])
+        over = monitor.finish_request(route, budget)
+        if over is not None:
+            breakdown = ", ".join(f"{name} x{count}" for name, count in over.most_common())
+            logger.warning(
+                "Query budget exceeded on %s %s: %d Mongo commands (budget %d) [%s]",
+                request.method,
+                route,
+                sum(over.values()),
+                budget,
+                breakdown,
+            )
+
+        registry.start_exporter()
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+    return registry
@@ -0,0 +1,264 @@
+"""
+Opt-in per-request profiling for the Flask app.
+
+When PROFILING_ENABLED is set, every request collects named timing spans
+(CSV loads, Mongo commands, scoring, sorts, template rendering). They are
+reported in a Server-Timing response header and, for requests slower than
+SLOW_REQUEST_MS, logged with their breakdown. With PROFILE_SAMPLE_RATE > 0
+a sample of requests also runs under cProfile (or pyinstrument, with
+PROFILER=pyinstrument) and the profiles of the slowest ones are kept in
+PROFILE_DIR.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import heapq
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "PROFILING_ENABLED": False,
+    "SLOW_REQUEST_MS": 500,
+    "PROFILE_SAMPLE_RATE": 0.0,
+    "PROFILE_DIR": "profiles",
+    "PROFILE_KEEP": 20,
+    "PROFILER": "cprofile",
+}
+
+# cProfile (sys.monitoring on 3.12+) allows one active profiler per process
+_profiler_lock = threading.Lock()
+
+
+def _env_config():
+    return {
+        "PROFILING_ENABLED": os.getenv("PROFILING_ENABLED", "0") not in ("", "0", "false"),
+        "SLOW_REQUEST_MS": float(os.getenv("SLOW_REQUEST_MS", DEFAULTS["SLOW_REQUEST_MS"])),
+        "PROFILE_SAMPLE_RATE": float(
+            os.getenv("PROFILE_SAMPLE_RATE", DEFAULTS["PROFILE_SAMPLE_RATE"])
+        ),
+        "PROFILE_DIR": os.getenv("PROFILE_DIR", DEFAULTS["PROFILE_DIR"]),
+        "PROFILE_KEEP": int(os.getenv("PROFILE_KEEP", DEFAULTS["PROFILE_KEEP"])),
+        "PROFILER": os.getenv("PROFILER", DEFAULTS["PROFILER"]),
+    }
+
+
+def _spans():
+    """The current request's span list, or None when profiling is off."""
+    if not has_request_context():
+        return None
+    return g.get("_profiling_spans")
+
+
+def record_span(name: str, seconds: float):
+    spans = _spans()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+@contextmanager
+def span(name: str):
+    """Time a block as a named span of the current request; a no-op when profiling is off."""
+    spans = _spans()
+    if spans is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans.append((name, time.perf_counter() - start))
+
+
+def timed(name: str):
+    """Decorator form of span()."""
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class MongoSpanListener(monitoring.CommandListener):
+    """Record every Mongo command as a "mongo" span of the request that issued it."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record_span("mongo", event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        record_span("mongo", event.duration_micros / 1_000_000)
+
+
+def summarize_spans(spans):
+    """Collapse spans into {name: (total_seconds, count)}, in first-seen order."""
+    summary = {}
+    for name, seconds in spans:
+        total, count = summary.get(name, (0.0, 0))
+        summary[name] = (total + seconds, count + 1)
+    return summary
+
+
+def server_timing_header(summary, total_seconds):
+    parts = []
+    for name, (seconds, count) in summary.items():
+        parts.append(f'{name};dur={seconds * 1000:.1f};desc="{count}x"')
+    parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class _ProfileStore:
+    """Keep only the PROFILE_KEEP slowest profiles on disk."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._kept = []  # min-heap of (seconds, path)
+
+    def offer(self, seconds, write, directory, keep, suffix):
+        with self._lock:
+            if len(self._kept) >= keep and seconds <= self._kept[0][0]:
+                return None
+            os.makedirs(directory, exist_ok=True)
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", request.path).strip("_") or "root"
+            path = os.path.join(
+                directory, f"{int(seconds * 1000):06d}ms-{slug}-{int(time.time() * 1000)}{suffix}"
+            )
+            write(path)
+            heapq.heappush(self._kept, (seconds, path))
+            while len(self._kept) > keep:
+                _, evicted = heapq.heappop(self._kept)
+                try:
+                    os.remove(evicted)
+                except OSError:
+                    pass
+            return path
+
+
+def _start_profiler(kind):
+    if kind == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("PROFILER=pyinstrument but pyinstrument is not installed; using cProfile")
+        else:
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def _stop_profiler(profiler):
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        return profiler.dump_stats, ".prof"
+    profiler.stop()
+
+    def write_html(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(profiler.output_html())
+
+    return write_html, ".html"
+
+
+def init_profiling(app):
+    """Register the profiling hooks on app; they only do work when PROFILING_ENABLED is set."""
+    for key, value in _env_config().items():
+        app.config.setdefault(key, value)
+
+    store = _ProfileStore()
+
+    @app.before_request
+    def _start_request_profile():
+        if not app.config["PROFILING_ENABLED"]:
+            return
+        g._profiling_spans = []
+        g._profiling_start = time.perf_counter()
+
+        rate = app.config["PROFILE_SAMPLE_RATE"]
+        if rate and random.random() < rate and _profiler_lock.acquire(blocking=False):
+            try:
+                g._profiler = _start_profiler(app.config["PROFILER"])
+            except Exception:
+                _profiler_lock.release()
+                raise
+
+    @app.after_request
+    def _finish_request_profile(response):
+        spans = g.pop("_profiling_spans", None)
+        if spans is None:
+            return response
+        total = time.perf_counter() - g.pop("_profiling_start")
+        summary = summarize_spans(spans)
+        response.headers["Server-Timing"] = server_timing_header(summary, total)
+
+        profile_path = None
+        profiler = g.pop("_profiler", None)
+        if profiler is not None:
+            try:
+                write, suffix = _stop_profiler(profiler)
+            finally:
+                _profiler_lock.release()
+            if total * 1000 >= app.config["SLOW_REQUEST_MS"]:
+                profile_path = store.offer(
+                    total, write, app.config["PROFILE_DIR"], app.config["PROFILE_KEEP"], suffix
+                )
+
+        if total * 1000 >= app.config["SLOW_REQUEST_MS"]:
+            breakdown = ", ".join(
+                f"{name}={seconds * 1000:.1f}ms/{count}x"
+                for name, (seconds, count) in summary.items()
+            )
+            logger.warning(
+                "Slow request %s %s took %.1fms [%s]%s",
+                request.method,
+                request.path,
+                total * 1000,
+                breakdown or "no spans",
+                f" profile={profile_path}" if profile_path else "",
+            )
+        return response
+
+    @app.teardown_request
+    def _release_profiler(exc):
+        # after_request is skipped on unhandled errors; never leave the profiler running
+        profiler = g.pop("_profiler", None)
+        if profiler is not None:
+            try:
+                _stop_profiler(profiler)
+            finally:
+                _profiler_lock.release()
+
+    def _template_started(sender, template, context, **extra):
+        if _spans() is not None:
+            g._profiling_render_start = time.perf_counter()
+
+    def _template_finished(sender, template, context, **extra):
+        start = g.pop("_profiling_render_start", None) if has_request_context() else None
+        if start is not None:
+            record_span("render", time.perf_counter() - start)
+
+    # blinker holds receivers weakly by default, and these closures have no other owner
+    before_render_template.connect(_template_started, app, weak=False)
+    template_rendered.connect(_template_finished, app, weak=False)
+
+    return app
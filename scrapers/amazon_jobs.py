@@ -1,39 +1,41 @@
-import csv
-import os
 import time
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
 
+from browser import PaginationError, setup_driver
+from checkpoint import clear_checkpoint, has_checkpoint, load_checkpoint, save_checkpoint
+from csv_store import save_jobs_csv
+from retries import with_retries
+from run_metrics import ScrapeMetrics
 
-def setup_driver():
-    """Setup Chrome driver with options"""
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-    
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
+
+START_URL = "https://www.amazon.jobs/en/search?offset=0&result_limit=10&sort=relevant&category%5B%5D=software-development&category%5B%5D=project-program-product-management-technical&category%5B%5D=machine-learning-science&category%5B%5D=systems-quality-security-engineering&country%5B%5D=USA&distanceType=Mi&radius=24km&latitude=38.89036&longitude=-77.03196&loc_group_id=&loc_query=&base_query=&city=&country=USA&region=&county=&query_options=&"
 
 
-def scrape_page_jobs(driver, wait, page_num):
+def scrape_page_jobs(driver, wait, page_num, metrics=None):
     """Extract jobs from current page"""
     page_jobs = []
     
     try:
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-tile")))
+        with_retries(
+            lambda: wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-tile"))),
+            TimeoutException,
+            metrics,
+            before_retry=driver.refresh,
+        )
         time.sleep(0.5)
     except TimeoutException:
         print(f"Timeout waiting for job listings to load on page {page_num}")
+        if metrics:
+            metrics.incr('timeouts')
         return page_jobs
     
+    if metrics:
+        metrics.mark_loaded()
+    
     job_elements = driver.find_elements(By.CSS_SELECTOR, "div.job-tile")
     
     if not job_elements:
@@ -75,12 +77,17 @@ def scrape_page_jobs(driver, wait, page_num):
             
         except Exception as e:
             print(f"Error processing job {idx}: {e}")
+            if metrics:
+                metrics.incr('errors')
     
     return page_jobs
 
 
 def click_next_button(driver, wait):
-    """Click the next page button and return True if successful"""
+    """
+    Go to the next results page. Return False if there is none; raise
+    PaginationError if there is one but getting to it failed.
+    """
     try:
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         time.sleep(1)
@@ -153,31 +160,53 @@ def click_next_button(driver, wait):
         try:
             wait.until(EC.staleness_of(next_button))
             return True
-        except:
-            return False
+        except TimeoutException:
+            raise PaginationError("Page did not change after clicking next")
         
+    except PaginationError:
+        raise
     except Exception as e:
-        print(f"\nError during pagination: {e}")
-        return False
+        raise PaginationError(f"Error during pagination: {e}") from e
 
 
-def scrape_amazon_jobs(url):
-    """Scrape jobs"""
-    driver = setup_driver()
+def scrape_amazon_jobs(url, resume=True, driver=None):
+    """
+    Scrape jobs, resuming from the last checkpoint if a previous run did not finish.
+    Pass driver to reuse an existing browser; it is left open afterwards.
+    """
+    owns_driver = driver is None
+    if owns_driver:
+        driver = setup_driver('amazon')
     jobs_data = []
     seen_job_ids = set()
+    page_num = 1
+    completed = False
+    metrics = ScrapeMetrics('amazon')
     
+    state = load_checkpoint('amazon') if resume else None
+    if state:
+        jobs_data = state['jobs']
+        seen_job_ids = state['seen_ids']
+        page_num = state['page_num']
+        url = state['url'] or url
+        print(f"Resuming from page {page_num} with {len(jobs_data)} jobs already collected")
+        metrics.resumed(page_num)
+    
+    # Checkpoint before the first page too: a run that fails anywhere,
+    # even on page 1, is resumed rather than saved as complete
+    save_checkpoint('amazon', page_num, url, seen_job_ids, jobs_data)
+
     try:
+        metrics.start_page(page_num)
         print(f"Loading page: {url}")
         driver.get(url)
         
         wait = WebDriverWait(driver, 20)
-        page_num = 1
         
         while True:
             print(f"\nScraping page {page_num}...")
             
-            page_jobs = scrape_page_jobs(driver, wait, page_num)
+            page_jobs = scrape_page_jobs(driver, wait, page_num, metrics)
             
             new_jobs_count = 0
             for job in page_jobs:
@@ -187,22 +216,33 @@ def scrape_amazon_jobs(url):
                     seen_job_ids.add(job_id)
                     new_jobs_count += 1
             
+            metrics.end_page(page_num, new_jobs_count)
             print(f"\nAdded {new_jobs_count} new jobs from page {page_num}")
             print(f"Total unique jobs so far: {len(jobs_data)}")
             
-            if not click_next_button(driver, wait):
+            click_start = time.perf_counter()
+            if not with_retries(lambda: click_next_button(driver, wait), PaginationError, metrics):
                 print("\nReached last page.")
                 break
             
+            metrics.record_pagination(time.perf_counter() - click_start)
+            
             page_num += 1
+            save_checkpoint('amazon', page_num, driver.current_url, seen_job_ids, jobs_data)
+            metrics.start_page(page_num)
         
+        completed = True
         print(f"\nSuccessfully scraped {len(jobs_data)} total unique jobs across {page_num} pages")
+        clear_checkpoint('amazon')
         
     except Exception as e:
         print(f"Error during scraping: {e}")
+        print(f"Progress checkpointed, rerun to resume from page {page_num}")
     
     finally:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
+        metrics.finish(len(jobs_data), completed)
     
     return jobs_data
 
@@ -213,60 +253,22 @@ def save_to_csv(jobs_data, filename='data/amazon_jobs.csv'):
         print("No data to save")
         return
     
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    
-    fieldnames = ['title', 'location', 'department', 'job_id', 'url', 'scraped_at']
+    result = save_jobs_csv(jobs_data, filename)
     
-    # Read existing jobs to preserve scraped_at dates
-    existing_jobs = {}
-    if os.path.exists(filename):
-        try:
-            with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    job_id = row.get('job_id') or row.get('url')
-                    if job_id:
-                        existing_jobs[job_id] = row
-            print(f"Found {len(existing_jobs)} existing jobs in CSV")
-        except Exception as e:
-            print(f"Error reading existing CSV: {e}")
-    
-    # Process current jobs and preserve original scraped_at dates
-    active_jobs = []
-    new_jobs = []
-    delisted_count = len(existing_jobs)
-    
-    for job in jobs_data:
-        job_id = job.get('job_id') or job.get('url')
-        if job_id:
-            if job_id in existing_jobs:
-                # Preserve original scraped_at date for existing jobs
-                job['scraped_at'] = existing_jobs[job_id]['scraped_at']
-            else:
-                new_jobs.append(job)
-            active_jobs.append(job)
-    
-    delisted_count -= len(active_jobs) - len(new_jobs)
-    
-    # Write only active jobs
-    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(active_jobs)
-    
-    print(f"\nAdded {len(new_jobs)} new jobs")
-    print(f"Removed {delisted_count} delisted jobs")
-    print(f"Total active jobs in CSV: {len(active_jobs)}")
+    print(f"\nAdded {result['added']} new jobs")
+    print(f"Removed {result['delisted']} delisted jobs")
+    print(f"Total active jobs in CSV: {result['total']} (generation {result['manifest']['generation']})")
 
 
 def main():
     """Main execution function"""
-    url = "https://www.amazon.jobs/en/search?offset=0&result_limit=10&sort=relevant&category%5B%5D=software-development&category%5B%5D=project-program-product-management-technical&category%5B%5D=machine-learning-science&category%5B%5D=systems-quality-security-engineering&country%5B%5D=USA&distanceType=Mi&radius=24km&latitude=38.89036&longitude=-77.03196&loc_group_id=&loc_query=&base_query=&city=&country=USA&region=&county=&query_options=&"
-    
     print("Starting Amazon Jobs Scraper...")
-    jobs = scrape_amazon_jobs(url)
+    jobs = scrape_amazon_jobs(START_URL)
     
-    if jobs:
+    if has_checkpoint('amazon'):
+        # Saving a partial run would mark every unscraped job as delisted
+        print("\nRun did not finish, skipping save. Rerun to resume from the checkpoint.")
+    elif jobs:
         save_to_csv(jobs)
         print("\nScraping completed successfully!")
     else:
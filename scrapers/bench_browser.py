@@ -0,0 +1,121 @@
+"""
+Compare the default and lightweight Chrome profiles on a real scraper.
+
+    python bench_browser.py amazon --pages 5
+
+Reports pages per minute and peak RSS of the whole browser process tree
+(chromedriver plus every Chrome process) for each profile. Needs psutil.
+"""
+import argparse
+import importlib
+import json
+import threading
+import time
+
+import psutil
+from selenium.webdriver.support.ui import WebDriverWait
+
+from browser import setup_driver
+
+
+def browser_rss(driver):
+    """Total resident memory of chromedriver and all of its children, in bytes"""
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        procs = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return 0
+
+    total = 0
+    for proc in procs:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+class PeakRssSampler(threading.Thread):
+    """Poll browser RSS in the background and keep the highest value seen"""
+
+    def __init__(self, driver, interval=0.25):
+        super().__init__(daemon=True)
+        self.driver = driver
+        self.interval = interval
+        self.peak = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.peak = max(self.peak, browser_rss(self.driver))
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def run_profile(scraper, label, pages, **driver_kwargs):
+    """Walk up to pages result pages with one browser profile"""
+    driver = setup_driver(**driver_kwargs)
+    sampler = PeakRssSampler(driver)
+    sampler.start()
+
+    pages_done = 0
+    jobs_found = 0
+    start = time.perf_counter()
+    try:
+        driver.get(scraper.START_URL)
+        wait = WebDriverWait(driver, 20)
+        for page_num in range(1, pages + 1):
+            jobs_found += len(scraper.scrape_page_jobs(driver, wait, page_num))
+            pages_done += 1
+            if page_num == pages or not scraper.click_next_button(driver, wait):
+                break
+    finally:
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+        driver.quit()
+
+    return {
+        'profile': label,
+        'pages': pages_done,
+        'jobs': jobs_found,
+        'seconds': round(elapsed, 2),
+        'pages_per_minute': round(pages_done / elapsed * 60, 2) if elapsed else 0.0,
+        'peak_rss_mb': round(sampler.peak / (1024 * 1024), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('scraper', choices=['amazon', 'apple', 'google', 'meta', 'microsoft'])
+    parser.add_argument('--pages', type=int, default=5, help='result pages to walk per profile')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    scraper = importlib.import_module(f'{args.scraper}_jobs')
+
+    results = [
+        run_profile(scraper, 'default', args.pages, lightweight=False),
+        run_profile(
+            scraper,
+            'lightweight',
+            args.pages,
+            name=f'bench-{args.scraper}',
+            lightweight=True,
+            block_stylesheets=args.scraper != 'meta',
+        ),
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n{'profile':<12} {'pages':>5} {'jobs':>6} {'pages/min':>10} {'peak RSS MB':>12}")
+    for r in results:
+        print(f"{r['profile']:<12} {r['pages']:>5} {r['jobs']:>6} {r['pages_per_minute']:>10} {r['peak_rss_mb']:>12}")
+
+
+if __name__ == '__main__':
+    main()
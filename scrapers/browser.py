@@ -0,0 +1,93 @@
+import os
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Each scraper gets its own persistent profile under here; Chrome locks a
+# user-data dir, so scrapers running side by side cannot share one
+PROFILE_ROOT = os.path.join('data', 'chrome-profile')
+
+# Requests to these hosts are dropped when request blocking is on. None of
+# them carry job listings, they only cost bandwidth, CPU and memory.
+BLOCKED_URL_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*googlesyndication.com*',
+    '*facebook.net*',
+    '*connect.facebook.com*',
+    '*hotjar.com*',
+    '*segment.io*',
+    '*cdn.segment.com*',
+    '*newrelic.com*',
+    '*nr-data.net*',
+    '*optimizely.com*',
+    '*adobedtm.com*',
+    '*demdex.net*',
+    '*omtrdc.net*',
+    '*clarity.ms*',
+    '*bat.bing.com*',
+    '*linkedin.com/px*',
+    '*ads.linkedin.com*',
+    '*.woff',
+    '*.woff2',
+    '*.ttf',
+]
+
+
+class PaginationError(Exception):
+    """
+    Moving to the next results page failed: an error, or the page did not
+    change. Unlike a missing next button this does not mean the last page
+    was reached, so the run must not be treated as complete.
+    """
+
+
+def setup_driver(name=None, lightweight=None, block_stylesheets=True, block_requests=None):
+    """
+    Setup Chrome driver with options.
+
+    With lightweight on (the default, SCRAPER_LIGHTWEIGHT=0 turns it off)
+    images and stylesheets are not loaded, pages count as loaded once the
+    DOM is ready, analytics and web-font requests are dropped, and the
+    browser reuses a per-scraper user-data dir so its HTTP cache survives
+    between runs.
+    """
+    if lightweight is None:
+        lightweight = os.getenv('SCRAPER_LIGHTWEIGHT', '1') != '0'
+    if block_requests is None:
+        block_requests = lightweight
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+
+    if lightweight:
+        chrome_options.page_load_strategy = 'eager'
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_argument('--disable-extensions')
+        chrome_options.add_argument('--disable-background-networking')
+        chrome_options.add_argument('--mute-audio')
+
+        prefs = {'profile.managed_default_content_settings.images': 2}
+        if block_stylesheets:
+            prefs['profile.managed_default_content_settings.stylesheets'] = 2
+        chrome_options.add_experimental_option('prefs', prefs)
+
+        if name:
+            profile_dir = os.path.abspath(os.path.join(PROFILE_ROOT, name))
+            os.makedirs(profile_dir, exist_ok=True)
+            chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+
+    driver = webdriver.Chrome(options=chrome_options)
+
+    if block_requests:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+
+    return driver
@@ -0,0 +1,70 @@
+import json
+import os
+from datetime import datetime
+
+
+CHECKPOINT_DIR = os.path.join('data', 'checkpoints')
+
+
+def checkpoint_path(name, checkpoint_dir=CHECKPOINT_DIR):
+    """Return the checkpoint file used by the scraper called name"""
+    return os.path.join(checkpoint_dir, f'{name}.json')
+
+
+def has_checkpoint(name, checkpoint_dir=CHECKPOINT_DIR):
+    """Return True if a scraper left an unfinished run behind"""
+    return os.path.exists(checkpoint_path(name, checkpoint_dir))
+
+
+def load_checkpoint(name, checkpoint_dir=CHECKPOINT_DIR):
+    """Load the last saved checkpoint for a scraper, or None if there isn't one"""
+    path = checkpoint_path(name, checkpoint_dir)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable checkpoint {path}: {e}")
+        return None
+
+    state['seen_ids'] = set(state.get('seen_ids') or [])
+    state['jobs'] = state.get('jobs') or []
+    return state
+
+
+def save_checkpoint(name, page_num, url, seen_ids, jobs_data, checkpoint_dir=CHECKPOINT_DIR):
+    """
+    Record scraper progress after a page has been fully processed.
+    page_num is the next page to scrape, so a restart resumes there
+    instead of at page 1. url is where the restart loads: that page's own
+    URL, or, for scrapers whose URL does not follow their pagination
+    (Meta, Apple), the start URL they replay the pages from.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = checkpoint_path(name, checkpoint_dir)
+
+    state = {
+        'page_num': page_num,
+        'url': url,
+        'seen_ids': sorted(seen_ids),
+        'jobs': jobs_data,
+        'saved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+    # Write to a temp file and rename so a crash mid-write never leaves
+    # a truncated checkpoint behind
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(name, checkpoint_dir=CHECKPOINT_DIR):
+    """Remove the checkpoint once a scraper has finished a complete run"""
+    path = checkpoint_path(name, checkpoint_dir)
+    if os.path.exists(path):
+        os.remove(path)
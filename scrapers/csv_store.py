@@ -0,0 +1,130 @@
+import csv
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+
+
+FIELDNAMES = ['title', 'location', 'department', 'job_id', 'url', 'scraped_at']
+
+
+class _HashingWriter:
+    """File wrapper that hashes everything written through it"""
+
+    def __init__(self, f):
+        self._f = f
+        self.sha256 = hashlib.sha256()
+
+    def write(self, text):
+        self.sha256.update(text.encode('utf-8'))
+        return self._f.write(text)
+
+
+def manifest_path(filename):
+    """Return the sidecar manifest path for a CSV, e.g. data/amazon_jobs.manifest.json"""
+    return os.path.splitext(filename)[0] + '.manifest.json'
+
+
+def read_manifest(filename):
+    """Read the manifest written next to a CSV, or None if there isn't one"""
+    try:
+        with open(manifest_path(filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _atomic_write_json(path, data):
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _existing_scraped_at(filename):
+    """Stream the current CSV and keep only job_id -> scraped_at"""
+    scraped_at = {}
+    if not os.path.exists(filename):
+        return scraped_at
+
+    try:
+        with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
+            for row in csv.DictReader(csvfile):
+                job_id = row.get('job_id') or row.get('url')
+                if job_id:
+                    scraped_at[job_id] = row.get('scraped_at', '')
+        print(f"Found {len(scraped_at)} existing jobs in CSV")
+    except Exception as e:
+        print(f"Error reading existing CSV: {e}")
+    return scraped_at
+
+
+def save_jobs_csv(jobs_data, filename):
+    """
+    Save job data to CSV, keeping only active jobs and preserving original scraped_at dates.
+
+    Rows are streamed into a temp file in the same directory which then
+    replaces the CSV in a single rename, so readers only ever see the old
+    file or the complete new one. A manifest with the row count, content
+    hash and a generation number is written next to the CSV afterwards.
+    """
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+
+    existing = _existing_scraped_at(filename)
+    seen = set()
+    new_count = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filename) or '.', prefix='.tmp-', suffix='.csv')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as csvfile:
+            out = _HashingWriter(csvfile)
+            writer = csv.DictWriter(out, fieldnames=FIELDNAMES, extrasaction='ignore')
+            writer.writeheader()
+
+            for job in jobs_data:
+                job_id = job.get('job_id') or job.get('url')
+                if not job_id or job_id in seen:
+                    continue
+                seen.add(job_id)
+
+                if job_id in existing:
+                    # Preserve original scraped_at date for existing jobs
+                    job['scraped_at'] = existing[job_id]
+                else:
+                    new_count += 1
+                writer.writerow(job)
+
+            csvfile.flush()
+            os.fsync(csvfile.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    previous = read_manifest(filename) or {}
+    manifest = {
+        'file': os.path.basename(filename),
+        'rows': len(seen),
+        'sha256': out.sha256.hexdigest(),
+        'generation': previous.get('generation', 0) + 1,
+        'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    _atomic_write_json(manifest_path(filename), manifest)
+
+    delisted_count = len(existing) - (len(seen) - new_count)
+    return {
+        'added': new_count,
+        'delisted': delisted_count,
+        'total': len(seen),
+        'manifest': manifest,
+    }
@@ -0,0 +1,28 @@
+import os
+
+
+# Extra attempts at a page whose job cards did not appear, or at a
+# next-page click that did not land, before the run gives up on it
+RETRIES = int(os.getenv('SCRAPER_RETRIES', '2'))
+
+
+def with_retries(action, retry_on, metrics=None, before_retry=None, retries=None):
+    """
+    Return action(), calling it again when it raises one of retry_on, up
+    to `retries` more times. before_retry() runs ahead of each new attempt
+    (e.g. reloading the page) and each one is counted as a retry in
+    metrics. The last failure is raised.
+    """
+    if retries is None:
+        retries = RETRIES
+    for attempt in range(retries + 1):
+        try:
+            return action()
+        except retry_on as e:
+            if attempt == retries:
+                raise
+            print(f"{e.__class__.__name__}: {e}; retrying ({attempt + 1}/{retries})")
+            if metrics:
+                metrics.incr('retries')
+            if before_retry:
+                before_retry()
@@ -0,0 +1,153 @@
+import json
+import os
+import time
+from datetime import datetime
+
+
+METRICS_DIR = os.getenv('SCRAPER_METRICS_DIR', os.path.join('data', 'metrics'))
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class ScrapeMetrics:
+    """
+    Timings and counters for one scraper run.
+
+    The scrape loop calls start_page / end_page around each page,
+    scrape_page_jobs calls mark_loaded once the job cards are on screen,
+    and record_pagination is given the time from clicking next until the
+    next page was ready. retries counts page reloads and next-page clicks
+    that were tried again (see retries.with_retries); resumes counts a
+    start from a checkpoint. finish() writes the run as one JSON line and
+    as a Prometheus text file.
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.started_at = datetime.now()
+        self._run_start = time.perf_counter()
+        self._page_start = None
+        self._loaded_at = None
+        self.time_to_first_card = None
+        self.pages = []
+        self.pagination_seconds = []
+        self.counters = {'timeouts': 0, 'errors': 0, 'retries': 0, 'resumes': 0}
+        self.resumed_from_page = None
+
+    def incr(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def resumed(self, page_num):
+        """Note that this run picked up from a checkpoint instead of page 1"""
+        self.resumed_from_page = page_num
+        self.incr('resumes')
+
+    def start_page(self, page_num):
+        self._page_start = time.perf_counter()
+        self._loaded_at = None
+
+    def mark_loaded(self):
+        self._loaded_at = time.perf_counter()
+        if self.time_to_first_card is None:
+            self.time_to_first_card = self._loaded_at - self._run_start
+
+    def end_page(self, page_num, jobs_found):
+        end = time.perf_counter()
+        loaded_at = self._loaded_at or end
+        self.pages.append({
+            'page': page_num,
+            'load_seconds': round(loaded_at - self._page_start, 3),
+            'extract_seconds': round(end - loaded_at, 3),
+            'jobs': jobs_found,
+        })
+
+    def record_pagination(self, seconds):
+        self.pagination_seconds.append(round(seconds, 3))
+
+    def summary(self, total_jobs, completed):
+        elapsed = time.perf_counter() - self._run_start
+        load = [p['load_seconds'] for p in self.pages]
+        extract = [p['extract_seconds'] for p in self.pages]
+        return {
+            'scraper': self.scraper,
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'completed': completed,
+            'resumed_from_page': self.resumed_from_page,
+            'seconds': round(elapsed, 3),
+            'pages': len(self.pages),
+            'jobs': total_jobs,
+            'jobs_per_second': round(total_jobs / elapsed, 3) if elapsed else 0.0,
+            'time_to_first_card_seconds': (
+                round(self.time_to_first_card, 3) if self.time_to_first_card is not None else None
+            ),
+            'page_load_seconds_p50': _percentile(load, 50),
+            'page_load_seconds_p95': _percentile(load, 95),
+            'extract_seconds_p50': _percentile(extract, 50),
+            'extract_seconds_p95': _percentile(extract, 95),
+            'pagination_seconds_p50': _percentile(self.pagination_seconds, 50),
+            'pagination_seconds_p95': _percentile(self.pagination_seconds, 95),
+            **self.counters,
+            'page_timings': self.pages,
+            'pagination_timings': self.pagination_seconds,
+        }
+
+    def prometheus_text(self, summary):
+        """Render a run summary in the Prometheus text exposition format"""
+        label = f'scraper="{self.scraper}"'
+        gauges = [
+            ('scraper_last_run_completed', 'Whether the last run reached the final page', int(summary['completed'])),
+            ('scraper_last_run_seconds', 'Wall time of the last run', summary['seconds']),
+            ('scraper_last_run_pages', 'Pages scraped in the last run', summary['pages']),
+            ('scraper_last_run_jobs', 'Unique jobs collected in the last run', summary['jobs']),
+            ('scraper_last_run_jobs_per_second', 'Jobs collected per second in the last run', summary['jobs_per_second']),
+            ('scraper_time_to_first_card_seconds', 'Time from start until the first job card appeared', summary['time_to_first_card_seconds'] or 0),
+            ('scraper_last_run_timeouts', 'Timeouts waiting for job cards in the last run', summary['timeouts']),
+            ('scraper_last_run_errors', 'Job cards that failed to parse in the last run', summary['errors']),
+            ('scraper_last_run_retries', 'Page loads and next-page clicks retried in the last run', summary['retries']),
+            ('scraper_last_run_resumes', 'Whether the last run resumed from a checkpoint', summary['resumes']),
+            ('scraper_last_run_timestamp_seconds', 'Unix time the last run started', int(self.started_at.timestamp())),
+        ]
+        lines = []
+        for name, help_text, value in gauges:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name}{{{label}}} {value}')
+
+        for name, help_text, key in [
+            ('scraper_page_load_seconds', 'Per-page time until job cards were present', 'page_load_seconds'),
+            ('scraper_page_extract_seconds', 'Per-page time spent extracting job cards', 'extract_seconds'),
+            ('scraper_pagination_seconds', 'Time from clicking next until the next page was ready', 'pagination_seconds'),
+        ]:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} summary')
+            for quantile in ('50', '95'):
+                value = summary[f'{key}_p{quantile}']
+                lines.append(f'{name}{{{label},quantile="0.{quantile}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def finish(self, total_jobs, completed, metrics_dir=METRICS_DIR):
+        """Append the run to scrape_runs.jsonl and rewrite <scraper>.prom"""
+        summary = self.summary(total_jobs, completed)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+        with open(os.path.join(metrics_dir, 'scrape_runs.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary) + '\n')
+
+        prom_path = os.path.join(metrics_dir, f'{self.scraper}.prom')
+        tmp_path = prom_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text(summary))
+        os.replace(tmp_path, prom_path)
+
+        print(
+            f"[metrics] {self.scraper}: {summary['pages']} pages, {summary['jobs']} jobs "
+            f"in {summary['seconds']}s ({summary['jobs_per_second']} jobs/s), "
+            f"{summary['timeouts']} timeouts, {summary['errors']} errors, {summary['retries']} retries"
+        )
+        return summary
@@ -1,47 +1,297 @@
 document.addEventListener("DOMContentLoaded", function () {
   var searchInput = document.getElementById("job-search");
   var chips = document.querySelectorAll(".chip");
-  var cards = document.querySelectorAll("#job-board-cards .card--board");
+  var boardContainer = document.getElementById("job-board-cards");
+  var emptyMessage = document.getElementById("job-board-empty");
 
   var activeFilter = "all";
   var activeTypeFilter = null;
 
+  // Filtering waits this long after the last keystroke
+  var SEARCH_DEBOUNCE_MS = 80;
+  // Rows rendered above and below the viewport
+  var OVERSCAN_ROWS = 3;
+
   function normalize(text) {
     return (text || "").toLowerCase();
   }
 
-  function applyFilters() {
-    var query = normalize(searchInput ? searchInput.value : "");
+  function debounce(fn, wait) {
+    var timer = null;
+    return function () {
+      clearTimeout(timer);
+      timer = setTimeout(fn, wait);
+    };
+  }
 
-    cards.forEach(function (card) {
-      var title = normalize(card.querySelector("h3")?.textContent);
-      var company = normalize(card.dataset.company);
-      var location = normalize(card.dataset.location);
-      var tags = normalize(card.dataset.tags);
-      var type = card.dataset.type;
-      var isRemote = card.dataset.remote === "true";
-      var match = parseInt(card.dataset.match || "0", 10);
+  // The board as parallel arrays, built once from /api/jobs
+  function buildIndex(payload) {
+    var rows = payload.jobs;
+    var companies = payload.companies;
+    var locations = payload.locations;
+    var types = payload.types;
+    var index = {
+      jobs: [],
+      haystack: new Array(rows.length),
+      match: new Array(rows.length),
+      remote: new Array(rows.length),
+      type: new Array(rows.length),
+    };
 
-      var visible = true;
+    for (var i = 0; i < rows.length; i++) {
+      var row = rows[i];
+      var company = companies[row[1]];
+      var job = {
+        title: row[0],
+        company: company[0],
+        companySlug: company[1],
+        location: locations[row[2]],
+        type: types[row[3]],
+        tags: row[4],
+        match: row[5],
+        identifier: row[6],
+        posted: row[7],
+        favorited: row[8] === 1,
+      };
+      index.jobs.push(job);
+      index.haystack[i] = normalize(
+        job.title + " " + job.company + " " + job.location + " " + job.tags
+      );
+      index.match[i] = job.match;
+      index.remote[i] = normalize(job.location).indexOf("remote") !== -1;
+      index.type[i] = job.type;
+    }
+    return index;
+  }
 
-      if (query) {
-        var haystack = title + " " + company + " " + location + " " + tags;
-        if (!haystack.includes(query)) visible = false;
-      }
+  // Positions in index.jobs that pass the search box and chips, in board order
+  function filterIndex(index, query, filter, typeFilter) {
+    var visible = [];
+    var n = index.jobs.length;
+    for (var i = 0; i < n; i++) {
+      if (query && index.haystack[i].indexOf(query) === -1) continue;
+      if (filter === "top-matches" && index.match[i] < 70) continue;
+      if (filter === "remote" && !index.remote[i]) continue;
+      if (typeFilter && index.type[i] !== typeFilter) continue;
+      visible.push(i);
+    }
+    return visible;
+  }
+
+  function setFavoriteState(button, favorited) {
+    if (favorited) {
+      button.classList.add("card__favorite--active", "job-detail__favorite--active");
+      button.textContent = "♥";
+      button.setAttribute("aria-label", "Unfavorite job");
+    } else {
+      button.classList.remove("card__favorite--active", "job-detail__favorite--active");
+      button.textContent = "♡";
+      button.setAttribute("aria-label", "Favorite job");
+    }
+  }
+
+  function fillOrRemove(element, text, removeTarget) {
+    if (text) {
+      element.textContent = text;
+    } else {
+      (removeTarget || element).remove();
+    }
+  }
+
+  // Renders only the rows of cards near the viewport; the container keeps the
+  // full height so the page scrolls as if every card were there
+  function VirtualBoard(container, index, template, detailUrl) {
+    this.container = container;
+    this.index = index;
+    this.template = template;
+    this.detailUrl = detailUrl;
+    this.visible = [];
+    this.columns = 1;
+    this.rowStride = 0;
+    this.renderedRange = null;
+    this.frame = null;
+
+    container.textContent = "";
+    container.classList.add("cards--virtual");
+    this.windowEl = document.createElement("div");
+    this.windowEl.className = "cards cards--board cards__window";
+    container.appendChild(this.windowEl);
+
+    var self = this;
+    var schedule = function () {
+      self.schedule(false);
+    };
+    window.addEventListener("scroll", schedule, { passive: true });
+    window.addEventListener("resize", function () {
+      self.rowStride = 0;
+      self.schedule(true);
+    });
+  }
+
+  VirtualBoard.prototype.renderCard = function (position) {
+    var job = this.index.jobs[position];
+    var card = this.template.content.firstElementChild.cloneNode(true);
+
+    card.dataset.index = position;
+    card.dataset.company = job.company;
+    card.dataset.location = job.location;
+    card.dataset.type = job.type;
+    card.dataset.tags = job.tags;
+    card.dataset.match = job.match;
+    card.dataset.remote = this.index.remote[position] ? "true" : "false";
+
+    var link = card.querySelector(".card__overlay-link");
+    link.href = this.detailUrl
+      .replace("__slug__", encodeURIComponent(job.companySlug))
+      .replace("__id__", encodeURIComponent(job.identifier));
+    link.setAttribute("aria-label", "View details for " + job.title);
+
+    var favorite = card.querySelector(".card__favorite");
+    if (favorite) {
+      favorite.dataset.companySlug = job.companySlug;
+      favorite.dataset.identifier = job.identifier;
+      setFavoriteState(favorite, job.favorited);
+    }
+
+    card.querySelector(".tag--match").textContent = "Match " + job.match + "%";
+    card.querySelector("h3").textContent = job.title;
+    fillOrRemove(
+      card.querySelector(".tag--company-pill"),
+      job.company,
+      card.querySelector(".card__company-row")
+    );
+    fillOrRemove(card.querySelector(".card__location"), job.location);
+    fillOrRemove(card.querySelector(".tag--soft"), job.type);
+    fillOrRemove(card.querySelector(".card__posted"), job.posted ? "Posted " + job.posted : "");
+    return card;
+  };
+
+  VirtualBoard.prototype.setVisible = function (visible) {
+    this.visible = visible;
+    this.renderedRange = null;
+    if (emptyMessage) emptyMessage.hidden = visible.length > 0;
+    this.schedule(true);
+  };
+
+  VirtualBoard.prototype.setFavorite = function (position, favorited) {
+    this.index.jobs[position].favorited = favorited;
+  };
+
+  VirtualBoard.prototype.schedule = function (force) {
+    if (force) this.renderedRange = null;
+    if (this.frame !== null) return;
+    var self = this;
+    this.frame = requestAnimationFrame(function () {
+      self.frame = null;
+      self.render();
+    });
+  };
+
+  // Card size comes from the stylesheet; measure one card to lay out the grid
+  VirtualBoard.prototype.measure = function () {
+    var probe = this.renderCard(this.visible[0]);
+    this.windowEl.textContent = "";
+    this.windowEl.appendChild(probe);
+    var gap = parseFloat(getComputedStyle(this.windowEl).rowGap) || 0;
+    var width = this.windowEl.clientWidth;
+    var cardWidth = probe.offsetWidth;
+    this.columns = Math.max(1, Math.floor((width + gap) / (cardWidth + gap)));
+    this.rowStride = probe.offsetHeight + gap;
+    this.gap = gap;
+  };
+
+  VirtualBoard.prototype.render = function () {
+    var count = this.visible.length;
+    if (count === 0) {
+      this.windowEl.textContent = "";
+      this.container.style.height = "0px";
+      return;
+    }
+    if (!this.rowStride) this.measure();
+
+    var rows = Math.ceil(count / this.columns);
+    this.container.style.height = rows * this.rowStride - this.gap + "px";
 
-      if (activeFilter === "top-matches" && match < 70) visible = false;
-      if (activeFilter === "remote" && !isRemote) visible = false;
+    var top = this.container.getBoundingClientRect().top;
+    var scrolled = Math.max(0, -top);
+    var firstRow = Math.max(0, Math.floor(scrolled / this.rowStride) - OVERSCAN_ROWS);
+    var lastRow = Math.min(
+      rows - 1,
+      Math.ceil((scrolled + window.innerHeight) / this.rowStride) + OVERSCAN_ROWS
+    );
+    var start = firstRow * this.columns;
+    var end = Math.min(count, (lastRow + 1) * this.columns);
 
-      if (activeTypeFilter && type !== activeTypeFilter) visible = false;
+    var range = this.renderedRange;
+    if (range && range[0] === start && range[1] === end) return;
+    this.renderedRange = [start, end];
 
+    var fragment = document.createDocumentFragment();
+    for (var i = start; i < end; i++) {
+      fragment.appendChild(this.renderCard(this.visible[i]));
+    }
+    this.windowEl.textContent = "";
+    this.windowEl.appendChild(fragment);
+    this.windowEl.style.transform = "translateY(" + firstRow * this.rowStride + "px)";
+  };
+
+  var board = null;
+
+  // Fallback for pages without /api/jobs (or before it has loaded): filter
+  // the server-rendered cards in place
+  function filterRenderedCards(query) {
+    var cards = boardContainer
+      ? boardContainer.querySelectorAll(".card--board")
+      : [];
+    cards.forEach(function (card) {
+      var haystack = normalize(
+        card.querySelector("h3")?.textContent + " " + card.dataset.company + " " +
+          card.dataset.location + " " + card.dataset.tags
+      );
+      var visible = true;
+      if (query && !haystack.includes(query)) visible = false;
+      if (activeFilter === "top-matches" && parseInt(card.dataset.match || "0", 10) < 70) visible = false;
+      if (activeFilter === "remote" && card.dataset.remote !== "true") visible = false;
+      if (activeTypeFilter && card.dataset.type !== activeTypeFilter) visible = false;
       card.style.display = visible ? "" : "none";
     });
   }
 
+  function applyFilters() {
+    var query = normalize(searchInput ? searchInput.value.trim() : "");
+    if (board) {
+      board.setVisible(filterIndex(board.index, query, activeFilter, activeTypeFilter));
+    } else {
+      filterRenderedCards(query);
+    }
+  }
+
+  function loadBoard() {
+    var template = document.getElementById("job-card-template");
+    if (!boardContainer || !boardContainer.dataset.source || !template) return;
+
+    fetch(boardContainer.dataset.source, { credentials: "same-origin" })
+      .then(function (response) {
+        if (!response.ok) throw new Error("HTTP " + response.status);
+        return response.json();
+      })
+      .then(function (payload) {
+        board = new VirtualBoard(
+          boardContainer,
+          buildIndex(payload),
+          template,
+          boardContainer.dataset.detailUrl
+        );
+        applyFilters();
+      })
+      .catch(function (error) {
+        // Keep the server-rendered cards; filtering still works on those
+        console.error("Error loading job board:", error);
+      });
+  }
+
   if (searchInput) {
-    searchInput.addEventListener("input", function () {
-      applyFilters();
-    });
+    searchInput.addEventListener("input", debounce(applyFilters, SEARCH_DEBOUNCE_MS));
   }
 
   chips.forEach(function (chip) {
@@ -63,56 +313,48 @@ document.addEventListener("DOMContentLoaded", function () {
     });
   });
 
-  // Favorite button functionality
-  var favoriteButtons = document.querySelectorAll(".card__favorite, .job-detail__favorite");
-  favoriteButtons.forEach(function (button) {
-    button.addEventListener("click", function (e) {
-      e.preventDefault();
-      e.stopPropagation();
+  loadBoard();
 
-      var companySlug = button.dataset.companySlug;
-      var identifier = button.dataset.identifier;
+  // Favorite button functionality; delegated, since board cards come and go
+  document.addEventListener("click", function (e) {
+    var button = e.target.closest(".card__favorite, .job-detail__favorite");
+    if (!button) {
+      return;
+    }
+    e.preventDefault();
+    e.stopPropagation();
 
-      if (!companySlug || !identifier) {
-        return;
-      }
+    var companySlug = button.dataset.companySlug;
+    var identifier = button.dataset.identifier;
+
+    if (!companySlug || !identifier) {
+      return;
+    }
+
+    var wasActive = button.classList.contains("card__favorite--active") ||
+                    button.classList.contains("job-detail__favorite--active");
+    var card = button.closest("[data-index]");
 
-      // Toggle visual state immediately for better UX
-      var wasActive = button.classList.contains("card__favorite--active") || 
-                      button.classList.contains("job-detail__favorite--active");
-      
-      // Identifier is already URL-encoded from the template, use it directly
-      fetch("/favorite/" + companySlug + "/" + identifier, {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
+    // Identifier is already URL-encoded from the template, use it directly
+    fetch("/favorite/" + companySlug + "/" + identifier, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+    })
+      .then(function (response) {
+        return response.json();
       })
-        .then(function (response) {
-          return response.json();
-        })
-        .then(function (data) {
-          if (data.favorited) {
-            button.classList.add("card__favorite--active", "job-detail__favorite--active");
-            button.textContent = "♥";
-            button.setAttribute("aria-label", "Unfavorite job");
-          } else {
-            button.classList.remove("card__favorite--active", "job-detail__favorite--active");
-            button.textContent = "♡";
-            button.setAttribute("aria-label", "Favorite job");
-          }
-        })
-        .catch(function (error) {
-          console.error("Error toggling favorite:", error);
-          // Revert visual state on error
-          if (wasActive) {
-            button.classList.add("card__favorite--active", "job-detail__favorite--active");
-            button.textContent = "♥";
-          } else {
-            button.classList.remove("card__favorite--active", "job-detail__favorite--active");
-            button.textContent = "♡";
-          }
-        });
-    });
+      .then(function (data) {
+        setFavoriteState(button, data.favorited);
+        if (board && card) {
+          board.setFavorite(parseInt(card.dataset.index, 10), data.favorited);
+        }
+      })
+      .catch(function (error) {
+        console.error("Error toggling favorite:", error);
+        // Revert visual state on error
+        setFavoriteState(button, wasActive);
+      });
   });
-});
\ No newline at end of file
+});
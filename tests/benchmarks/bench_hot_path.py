@@ -0,0 +1,258 @@
+"""
+Benchmarks for the load-and-score hot path.
+
+Each stage is timed on its own against synthetic catalogs:
+  - load_jobs_from_csv   parse and normalize a scraper CSV
+  - dedupe_jobs          merge Mongo + CSV jobs on (company, identifier)
+  - job_facts            derive the user-independent scoring inputs (once per catalog build)
+  - score_jobs_for_user  score the catalog against one user's preferences
+  - get_recommended_jobs pick the top matches from the scored catalog
+
+Usage (from the repo root):
+    python tests/benchmarks/bench_hot_path.py --output tests/benchmarks/baseline.json
+    python tests/benchmarks/bench_hot_path.py --compare tests/benchmarks/baseline.json --threshold 0.2
+
+With --compare the run exits non-zero if any stage's median got slower
+than the baseline by more than the threshold.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+SEED = 5
+
+COMPANIES = ["Google", "Microsoft", "Apple", "Amazon", "Meta"]
+TITLE_PREFIXES = ["", "Senior ", "Staff ", "Principal ", "Lead "]
+TITLE_SUFFIXES = ["", ", Ads", ", Cloud", " Intern", ", Payments", " (Contract)"]
+DEPARTMENTS = ["", "AI Research +1 more", "Software Engineering", "Infrastructure +2 more"]
+LOCATIONS = [
+    "Remote",
+    "New York, NY",
+    "Seattle, WA",
+    "Menlo Park, CA +2 locations",
+    "Austin, TX",
+    "United States, Multiple Locations, Multiple Locations",
+]
+
+
+def _ensure_app_importable():
+    """Put the repo root on sys.path; importing app needs no MongoDB or Mongo settings."""
+    repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+
+def make_rows(n, seed=SEED):
+    """Deterministic scraper-style CSV rows."""
+    import app
+
+    rng = random.Random(seed)
+    start = datetime.datetime(2025, 12, 1)
+    rows = []
+    for i in range(n):
+        scraped = start + datetime.timedelta(minutes=rng.randrange(60 * 24 * 30))
+        title = rng.choice(TITLE_PREFIXES) + rng.choice(app.ROLES) + rng.choice(TITLE_SUFFIXES)
+        rows.append(
+            {
+                "title": title,
+                "location": rng.choice(LOCATIONS),
+                "department": rng.choice(DEPARTMENTS),
+                "job_id": str(10_000_000 + i),
+                "url": f"https://careers.example.com/jobs/{10_000_000 + i}",
+                "scraped_at": scraped.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        )
+    return rows
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(
+            f, fieldnames=["title", "location", "department", "job_id", "url", "scraped_at"]
+        )
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def make_db(seed=SEED):
+    """MagicMock db shaped like the one in tests/conftest.py, with a realistic preference profile."""
+    import app
+
+    rng = random.Random(seed)
+    db = MagicMock()
+    db.company_preferences.find.return_value = [
+        {"company": c, "rank": rng.choice(app.TIERS)} for c in app.COMPANIES
+    ]
+    db.location_preferences.find.return_value = [
+        {"location": loc, "rank": rng.choice(app.TIERS)} for loc in app.LOCATIONS
+    ]
+    db.role_preferences.find.return_value = [
+        {"role": r, "rank": rng.choice(app.TIERS)} for r in app.ROLES
+    ]
+    db.job_type_preferences.find_one.return_value = {"types": ["Full-time", "Internship"]}
+    db.favorites.find.return_value = []
+    return db
+
+
+def _time(fn, repeats):
+    timings = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def _stats(timings):
+    return {
+        "min": round(min(timings), 6),
+        "median": round(statistics.median(timings), 6),
+        "max": round(max(timings), 6),
+        "repeats": len(timings),
+    }
+
+
+def repeats_for(n, requested=None):
+    if requested:
+        return requested
+    if n >= 1_000_000:
+        return 1
+    if n >= 100_000:
+        return 3
+    return 7
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeats=None, log=print):
+    """Time every stage at every catalog size and return {stage: {size: stats}}."""
+    _ensure_app_importable()
+    import app
+
+    results = {
+        "load_jobs_from_csv": {},
+        "dedupe_jobs": {},
+        "job_facts": {},
+        "score_jobs_for_user": {},
+        "get_recommended_jobs": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            r = repeats_for(n, repeats)
+            path = os.path.join(tmp, f"jobs_{n}.csv")
+            write_csv(make_rows(n), path)
+
+            with patch("builtins.print"):
+                timings, jobs = _time(lambda: app.load_jobs_from_csv(path, "Google"), r)
+            results["load_jobs_from_csv"][str(n)] = _stats(timings)
+
+            # A tenth of the catalog also lives in Mongo, so dedupe has work to do
+            mongo_jobs = [dict(j, _id=i) for i, j in enumerate(jobs[: n // 10])]
+            timings, unique = _time(lambda: app.dedupe_jobs(mongo_jobs + jobs), r)
+            results["dedupe_jobs"][str(n)] = _stats(timings)
+
+            timings, facts = _time(lambda: [app.job_facts(j) for j in unique], r)
+            results["job_facts"][str(n)] = _stats(timings)
+
+            db = make_db()
+            timings, scored = _time(
+                lambda: app.score_jobs_for_user(
+                    db, "bench-user", unique, mark_favorites=True, facts=facts
+                ),
+                r,
+            )
+            results["score_jobs_for_user"][str(n)] = _stats(timings)
+
+            timings, _ = _time(lambda: app.get_recommended_jobs(scored), r)
+            results["get_recommended_jobs"][str(n)] = _stats(timings)
+
+            log(
+                f"{n:>9,} jobs  "
+                + "  ".join(
+                    f"{stage}={results[stage][str(n)]['median'] * 1000:.1f}ms"
+                    for stage in results
+                )
+            )
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return a list of (stage, size, baseline_s, current_s, ratio) that regressed past threshold."""
+    regressions = []
+    for stage, by_size in results.items():
+        for size, stats in by_size.items():
+            base = baseline.get("results", {}).get(stage, {}).get(size)
+            if not base or not base.get("median"):
+                continue
+            ratio = stats["median"] / base["median"]
+            if ratio > 1 + threshold:
+                regressions.append((stage, size, base["median"], stats["median"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the load-and-score hot path.")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(n) for n in DEFAULT_SIZES),
+        help="comma separated catalog sizes (default: %(default)s)",
+    )
+    parser.add_argument("--repeats", type=int, help="runs per stage (default: scales with size)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown before --compare fails, as a fraction (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results = run_suite(sizes, args.repeats)
+
+    report = {
+        "meta": {
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for stage, size, base, current, ratio in regressions:
+            print(
+                f"REGRESSION {stage} @ {size}: {base * 1000:.1f}ms -> "
+                f"{current * 1000:.1f}ms ({ratio:.2f}x)"
+            )
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
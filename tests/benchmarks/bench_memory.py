@@ -0,0 +1,110 @@
+"""
+Bytes per catalog job, measured with tracemalloc.
+
+Loads the scraper CSVs twice: once into the dicts the loader used to
+produce (a fresh string per field per row, a tags list, two keys holding
+the scrape datetime) and once into the compact JobRecords the catalog
+keeps now. Reports the memory each representation retains per job.
+
+Usage (from the repo root):
+    python tests/benchmarks/bench_memory.py
+    python tests/benchmarks/bench_memory.py --synthetic 100000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_hot_path import _ensure_app_importable, make_rows, write_csv  # noqa: E402
+
+
+def _fresh(value):
+    """A new string object equal to value, like the old per-row strip() produced."""
+    return "".join(list(value)) if len(value) > 1 else value
+
+
+def legacy_job(record):
+    """The dict the CSV loader built for each row before JobRecord."""
+    from job_records import from_epoch
+
+    scraped = from_epoch(record.scraped_ts)
+    return {
+        "title": record.title,
+        "location": _fresh(record.location),
+        "department": _fresh(record.department),
+        "job_id": record.job_id,
+        "url": record.url,
+        "scraped_at": scraped,
+        "posted_date": scraped,
+        "company": record.company,
+        "type": record.type,
+        "tags": [_fresh(t) for t in record.tags],
+    }
+
+
+def _retained(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        jobs = build()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return jobs, after - before
+
+
+def measure(sources):
+    """Return {"jobs", "dict_bytes_per_job", "record_bytes_per_job", "ratio"} for the given CSVs."""
+    _ensure_app_importable()
+    import app
+
+    def load_records():
+        return [job for path, company in sources for job in app.iter_jobs_from_csv(path, company)]
+
+    def load_dicts():
+        return [legacy_job(job) for path, company in sources for job in app.iter_jobs_from_csv(path, company)]
+
+    dicts, dict_bytes = _retained(load_dicts)
+    del dicts
+    records, record_bytes = _retained(load_records)
+
+    n = len(records) or 1
+    return {
+        "jobs": len(records),
+        "dict_bytes_per_job": round(dict_bytes / n),
+        "record_bytes_per_job": round(record_bytes / n),
+        "ratio": round(record_bytes / dict_bytes, 3) if dict_bytes else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure bytes per catalog job with tracemalloc.")
+    parser.add_argument("--synthetic", type=int, help="measure N synthetic jobs instead of the scraper CSVs")
+    args = parser.parse_args(argv)
+
+    _ensure_app_importable()
+    import app
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "jobs.csv")
+            write_csv(make_rows(args.synthetic), path)
+            result = measure([(path, "Google")])
+    else:
+        result = measure([(path, company) for path, company in app.CSV_SOURCES if os.path.exists(path)])
+
+    print(f"{result['jobs']:,} jobs")
+    print(f"  dict      {result['dict_bytes_per_job']:>6} bytes/job")
+    print(f"  JobRecord {result['record_bytes_per_job']:>6} bytes/job ({result['ratio']:.0%} of dict)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
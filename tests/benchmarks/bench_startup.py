@@ -0,0 +1,119 @@
+"""
+Cold-start benchmark: how long `import app` takes in a fresh interpreter.
+
+Each run is a new `python -X importtime -c "import app"` with every
+network call (DNS lookups and socket connects) made to fail, so a run
+also proves that importing the app, which builds it, does no network
+I/O and starts no threads. The report is the median cumulative import
+time of `app` and of the heaviest modules it pulls in, taken from
+-X importtime.
+
+Usage (from the repo root):
+    python tests/benchmarks/bench_startup.py
+    python tests/benchmarks/bench_startup.py --budget-ms 500
+
+With --budget-ms the run exits non-zero if importing app takes longer.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_RUNS = 5
+DEFAULT_TOP = 10
+
+# Runs in the child: the import fails if it tried to reach the network
+# (even if the app caught the error) or left threads running, e.g. a
+# MongoClient's monitors, which a forking server would not carry over
+NO_NETWORK_IMPORT = """
+import socket
+import sys
+import threading
+
+attempts = []
+
+def _no_network(*args, **kwargs):
+    attempts.append(args)
+    raise OSError("network I/O while importing app")
+
+socket.getaddrinfo = _no_network
+socket.socket.connect = _no_network
+socket.socket.connect_ex = _no_network
+socket.create_connection = _no_network
+
+import app
+
+if attempts:
+    sys.exit(f"import app tried to reach the network: {attempts[0]!r}")
+if threading.active_count() > 1:
+    sys.exit(f"import app started threads: {threading.enumerate()!r}")
+"""
+
+
+def parse_importtime(stderr: str):
+    """{module: cumulative microseconds} for every line of -X importtime output."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # the header row
+        cumulative[fields[2].strip()] = int(fields[1])
+    return cumulative
+
+
+def import_once(env=None):
+    """Import app in a fresh interpreter; return its parsed -X importtime report."""
+    child_env = dict(os.environ if env is None else env)
+    # As in an image build or a fresh container: no Mongo settings at all
+    child_env.pop("MONGO_URI", None)
+    child_env.pop("MONGO_DBNAME", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", NO_NETWORK_IMPORT],
+        cwd=REPO_ROOT,
+        env=child_env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import app failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def run(runs=DEFAULT_RUNS, top=DEFAULT_TOP):
+    """Median import milliseconds for app and its `top` heaviest imports."""
+    reports = [import_once() for _ in range(runs)]
+    modules = set.intersection(*(set(report) for report in reports))
+    medians = {
+        name: statistics.median(report[name] for report in reports) / 1000 for name in modules
+    }
+    heaviest = sorted(
+        (name for name in medians if name != "app"), key=medians.get, reverse=True
+    )[:top]
+    return {"app_ms": medians["app"], "modules": {name: medians[name] for name in heaviest}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time `import app` in a fresh interpreter.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="imports to time (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="heaviest modules to list (default: %(default)s)")
+    parser.add_argument("--budget-ms", type=float, help="fail if importing app takes longer than this")
+    args = parser.parse_args(argv)
+
+    result = run(args.runs, args.top)
+    print(f"import app: {result['app_ms']:.1f}ms (median of {args.runs})")
+    for name, ms in result["modules"].items():
+        print(f"  {ms:8.1f}ms  {name}")
+
+    if args.budget_ms is not None and result["app_ms"] > args.budget_ms:
+        print(f"OVER BUDGET: {result['app_ms']:.1f}ms > {args.budget_ms:.0f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
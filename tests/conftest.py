@@ -5,6 +5,10 @@ import os
 from unittest.mock import Mock, patch, MagicMock
 from pymongo.errors import ConnectionFailure
 
+# Tests drive catalog rebuilds themselves; a refresher thread polling the
+# mocked db would race with their call counts
+os.environ['CATALOG_REFRESH_ENABLED'] = '0'
+
 
 @pytest.fixture
 def app():
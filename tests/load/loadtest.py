@@ -0,0 +1,334 @@
+"""
+End-to-end HTTP load test against a local stand-in MongoDB.
+
+Starts the real Flask app on a local port, backed by mongomock (or a local
+mongod with --mongo-uri), seeds it with users, preferences and favorites,
+and drives concurrent logged-in sessions over HTTP. Jobs come from the
+bundled scraper CSVs. Reports p50/p95/p99 latency per route and overall
+throughput.
+
+Usage (from the repo root):
+    python tests/load/loadtest.py
+    python tests/load/loadtest.py --scenario tests/load/scenarios/smoke.json --output /tmp/load.json
+    python tests/load/loadtest.py --mongo-uri mongodb://localhost:27017/ --dbname loadtest
+
+Scenario files pin the seed, user count, session count and route mix so
+runs are reproducible.
+"""
+
+import argparse
+import datetime
+import http.cookiejar
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from unittest.mock import patch
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_SCENARIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios", "default.json")
+PASSWORD = "loadtest-password"
+
+ROUTE_LABELS = {
+    "home": "/",
+    "jobs": "/jobs",
+    "job_detail": "/jobs/<slug>/<id>",
+    "profile": "/profile",
+    "favorite": "/favorite/...",
+}
+
+
+def load_scenario(path):
+    with open(path, encoding="utf-8") as f:
+        scenario = json.load(f)
+    unknown = set(scenario["routes"]) - set(ROUTE_LABELS)
+    if unknown:
+        raise ValueError(f"Unknown routes in {path}: {sorted(unknown)}")
+    return scenario
+
+
+def start_app(mongo_uri=None, dbname="loadtest"):
+    """Import and create the app against mongomock, or a real mongod if mongo_uri is given."""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    if mongo_uri:
+        import app as app_module
+
+        return app_module.create_app(mongo_uri, dbname)
+
+    import mongomock
+
+    with patch("pymongo.MongoClient", mongomock.MongoClient):
+        import app as app_module
+
+        return app_module.create_app("mongodb://localhost:27017/", dbname)
+
+
+def seed_database(db, scenario, jobs):
+    """Create users with preferences and favorites. Returns the usernames."""
+    import app as app_module
+    from werkzeug.security import generate_password_hash
+
+    rng = random.Random(scenario["seed"])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    password_hash = generate_password_hash(PASSWORD)
+
+    for name in (
+        "users",
+        "company_preferences",
+        "location_preferences",
+        "role_preferences",
+        "job_type_preferences",
+        "favorites",
+    ):
+        db[name].delete_many({})
+
+    usernames = []
+    for i in range(scenario["users"]):
+        username = f"loaduser{i:04d}"
+        user_id = str(
+            db.users.insert_one(
+                {
+                    "username": username,
+                    "email": f"{username}@example.com",
+                    "password": password_hash,
+                    "created_at": now,
+                }
+            ).inserted_id
+        )
+        usernames.append(username)
+
+        db.company_preferences.insert_many(
+            [
+                {"user_id": user_id, "company": c, "rank": rng.choice(app_module.TIERS), "created_at": now}
+                for c in app_module.COMPANIES
+            ]
+        )
+        db.location_preferences.insert_many(
+            [
+                {"user_id": user_id, "location": loc, "rank": rng.choice(app_module.TIERS), "created_at": now}
+                for loc in rng.sample(app_module.LOCATIONS, 4)
+            ]
+        )
+        db.role_preferences.insert_many(
+            [
+                {"user_id": user_id, "role": r, "rank": rng.choice(app_module.TIERS), "created_at": now}
+                for r in rng.sample(app_module.ROLES, 5)
+            ]
+        )
+        db.job_type_preferences.insert_one(
+            {"user_id": user_id, "types": rng.sample(app_module.JOB_TYPES, 2), "created_at": now}
+        )
+
+        favorites = []
+        for job in rng.sample(jobs, min(scenario["favorites_per_user"], len(jobs))):
+            favorites.append(
+                {
+                    "user_id": user_id,
+                    "company": job["company"],
+                    "identifier": job["identifier"],
+                    "company_slug": job["company_slug"],
+                    "created_at": now,
+                }
+            )
+        if favorites:
+            db.favorites.insert_many(favorites)
+
+    return usernames
+
+
+def job_links(db):
+    """Scored catalog jobs carry the slug and identifier the routes expect."""
+    import app as app_module
+
+    return app_module.score_jobs_for_user(db, "loadtest-seed", app_module.get_job_catalog(db).jobs)
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Session:
+    """One simulated browser: its own cookie jar, logged in as one user."""
+
+    def __init__(self, base_url, username):
+        self.base_url = base_url
+        self.username = username
+        jar = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar), NoRedirect)
+
+    def request(self, path, method="GET", data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self.opener.open(req, timeout=60) as resp:
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+    def login(self):
+        status = self.request("/login", "POST", {"username": self.username, "password": PASSWORD})
+        if status != 302:
+            raise RuntimeError(f"Login failed for {self.username}: HTTP {status}")
+
+
+def run_session(base_url, username, scenario, session_index, jobs, samples, lock):
+    rng = random.Random(f"{scenario['seed']}:{session_index}")
+    routes = list(scenario["routes"])
+    weights = [scenario["routes"][r] for r in routes]
+    think = scenario.get("think_time_ms", 0) / 1000
+
+    session = Session(base_url, username)
+    session.login()
+
+    for _ in range(scenario["requests_per_session"]):
+        route = rng.choices(routes, weights)[0]
+        method = "GET"
+        if route == "home":
+            path = "/"
+        elif route == "jobs":
+            path = "/jobs"
+        elif route == "profile":
+            path = "/profile"
+        else:
+            job = rng.choice(jobs)
+            path = f"/jobs/{job['company_slug']}/{job['identifier']}"
+            if route == "favorite":
+                path = f"/favorite/{job['company_slug']}/{job['identifier']}"
+                method = "POST"
+
+        start = time.perf_counter()
+        status = session.request(path, method)
+        elapsed = time.perf_counter() - start
+
+        with lock:
+            samples.append((route, elapsed, status))
+        if think:
+            time.sleep(think)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(samples, elapsed):
+    report = {"routes": {}, "total_requests": len(samples), "seconds": round(elapsed, 3)}
+    report["requests_per_second"] = round(len(samples) / elapsed, 2) if elapsed else 0.0
+
+    by_route = {}
+    for route, seconds, status in samples:
+        by_route.setdefault(route, []).append((seconds, status))
+
+    for route, entries in sorted(by_route.items()):
+        latencies = [s for s, _ in entries]
+        report["routes"][ROUTE_LABELS[route]] = {
+            "requests": len(entries),
+            # The session's own pages and links: a 4xx is as broken as a 5xx
+            "errors": sum(1 for _, status in entries if status >= 400),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        }
+    return report
+
+
+def run(scenario, mongo_uri=None, dbname="loadtest"):
+    from werkzeug.serving import make_server
+
+    # The app reads the scraper CSVs relative to the working directory
+    cwd = os.getcwd()
+    os.chdir(REPO_ROOT)
+    app = start_app(mongo_uri, dbname)
+    server = None
+    try:
+        db = app.extensions["db"]
+
+        jobs = job_links(db)
+        if not jobs:
+            raise RuntimeError("No jobs in the catalog; run from a checkout with scrapers/data/*.csv")
+        usernames = seed_database(db, scenario, jobs)
+
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+
+        samples = []
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(
+                target=run_session,
+                args=(base_url, usernames[i % len(usernames)], scenario, i, jobs, samples, lock),
+            )
+            for i in range(scenario["sessions"])
+        ]
+
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.shutdown()
+        # Its CSV paths are relative too, so it must not outlive the chdir
+        app.extensions["catalog_refresher"].stop(timeout=5)
+        os.chdir(cwd)
+    return summarize(samples, elapsed)
+
+
+def print_report(report):
+    print(f"\n{'route':<20} {'reqs':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, r in report["routes"].items():
+        print(
+            f"{route:<20} {r['requests']:>6} {r['errors']:>6} "
+            f"{r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}"
+        )
+    print(
+        f"\n{report['total_requests']} requests in {report['seconds']}s "
+        f"= {report['requests_per_second']} req/s"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the app against a local stand-in MongoDB.")
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO, help="scenario JSON (default: %(default)s)")
+    parser.add_argument("--mongo-uri", help="use this mongod instead of mongomock")
+    parser.add_argument("--dbname", default="loadtest", help="database name (default: %(default)s)")
+    parser.add_argument("--output", help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    scenario = load_scenario(args.scenario)
+    report = run(scenario, args.mongo_uri, args.dbname)
+    report["scenario"] = os.path.relpath(args.scenario, REPO_ROOT)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
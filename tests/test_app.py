@@ -5,6 +5,7 @@ import datetime
 from unittest.mock import MagicMock, patch
 from bson import ObjectId
 import app as app_module
+import assets
 
 
 class TestHomeRoute:
@@ -65,6 +66,14 @@ class TestHomeRoute:
 
 class TestPreferencesRoute:
     """Test cases for user preferences routes."""
+
+    @staticmethod
+    def _sign_in(test_client, mock_db):
+        """Sign the test client in as a user the mocked db knows."""
+        user_id = ObjectId()
+        mock_db.users.find_one.return_value = {'_id': user_id, 'username': 'alice', 'email': ''}
+        with test_client.session_transaction() as sess:
+            sess['_user_id'] = str(user_id)
     
     def test_preferences_page_loads(self, client):
         """Test that preferences page loads successfully."""
@@ -75,7 +84,8 @@ class TestPreferencesRoute:
         mock_db.location_preferences.find.return_value = iter([])
         mock_db.job_type_preferences.find_one.return_value = None
         
-        response = test_client.get('/preferences/testuser')
+        self._sign_in(test_client, mock_db)
+        response = test_client.get('/preferences')
         assert response.status_code == 200
     
     def test_preferences_companies_tab(self, client):
@@ -87,7 +97,8 @@ class TestPreferencesRoute:
         mock_db.location_preferences.find.return_value = iter([])
         mock_db.job_type_preferences.find_one.return_value = None
         
-        response = test_client.get('/preferences/testuser?tab=companies')
+        self._sign_in(test_client, mock_db)
+        response = test_client.get('/preferences?tab=companies')
         assert response.status_code == 200
     
     def test_preferences_roles_tab(self, client):
@@ -99,7 +110,8 @@ class TestPreferencesRoute:
         mock_db.location_preferences.find.return_value = iter([])
         mock_db.job_type_preferences.find_one.return_value = None
         
-        response = test_client.get('/preferences/testuser?tab=roles')
+        self._sign_in(test_client, mock_db)
+        response = test_client.get('/preferences?tab=roles')
         assert response.status_code == 200
     
     def test_preferences_locations_tab(self, client):
@@ -111,7 +123,8 @@ class TestPreferencesRoute:
         mock_db.location_preferences.find.return_value = iter([])
         mock_db.job_type_preferences.find_one.return_value = None
         
-        response = test_client.get('/preferences/testuser?tab=locations')
+        self._sign_in(test_client, mock_db)
+        response = test_client.get('/preferences?tab=locations')
         assert response.status_code == 200
     
     def test_preferences_job_types_tab(self, client):
@@ -123,7 +136,8 @@ class TestPreferencesRoute:
         mock_db.location_preferences.find.return_value = iter([])
         mock_db.job_type_preferences.find_one.return_value = None
         
-        response = test_client.get('/preferences/testuser?tab=job_types')
+        self._sign_in(test_client, mock_db)
+        response = test_client.get('/preferences?tab=job_types')
         assert response.status_code == 200
 
 
@@ -208,6 +222,394 @@ class TestPreferencesSubmission:
         assert response.status_code == 200
 
 
+class TestHeaderMetrics:
+    """Test cases for the header metrics injected into every template."""
+
+    def test_header_does_not_score_the_catalog(self, client, monkeypatch):
+        """Test that rendering a page never scores jobs just for the header."""
+        test_client, mock_db, _ = client
+        mock_db.company_preferences.count_documents.return_value = 2
+        mock_db.job_type_preferences.find_one.return_value = None
+
+        def fail(*args, **kwargs):
+            raise AssertionError("header metrics should not score jobs")
+
+        monkeypatch.setattr(app_module, "score_jobs_for_user", fail)
+
+        response = test_client.get('/login')
+        assert response.status_code == 200
+
+    def test_preference_summary_is_cached(self, client):
+        """Test that the preference counts are read once, then served from cache."""
+        test_client, mock_db, _ = client
+        mock_db.company_preferences.count_documents.return_value = 2
+        mock_db.job_type_preferences.find_one.return_value = None
+
+        test_client.get('/login')
+        test_client.get('/login')
+        test_client.get('/register')
+
+        assert mock_db.company_preferences.count_documents.call_count == 1
+        assert mock_db.job_type_preferences.find_one.call_count == 1
+
+    def test_saving_preferences_invalidates_summary(self, client):
+        """Test that saving preferences refreshes the cached header counts."""
+        test_client, mock_db, _ = client
+        mock_db.company_preferences.count_documents.return_value = 2
+        mock_db.job_type_preferences.find_one.return_value = None
+        mock_db.user_revisions.find_one.return_value = None
+
+        test_client.get('/login')
+        test_client.post('/preferences/testuser/companies', data={'company_Google': '1'})
+        mock_db.user_revisions.find_one.return_value = {'preferences': 1}
+        test_client.get('/login')
+
+        assert mock_db.company_preferences.count_documents.call_count == 2
+
+    def test_cached_header_makes_no_mongo_calls(self, client):
+        """Test that a cached header render on a page without an ETag makes no find_one calls."""
+        test_client, mock_db, _ = client
+        mock_db.company_preferences.count_documents.return_value = 2
+        mock_db.job_type_preferences.find_one.return_value = None
+        mock_db.user_revisions.find_one.return_value = None
+
+        test_client.get('/login')
+        mock_db.user_revisions.find_one.reset_mock()
+        mock_db.job_type_preferences.find_one.reset_mock()
+        mock_db.company_preferences.count_documents.reset_mock()
+
+        assert test_client.get('/register').status_code == 200
+        assert mock_db.user_revisions.find_one.call_count == 0
+        assert mock_db.job_type_preferences.find_one.call_count == 0
+        assert mock_db.company_preferences.count_documents.call_count == 0
+
+    def test_save_in_another_worker_is_seen_after_the_ttl(self, client, monkeypatch):
+        """Test that a preferences revision bumped elsewhere retires the entry once it is rechecked."""
+        test_client, mock_db, _ = client
+        monkeypatch.setattr(app_module, "HEADER_SUMMARY_TTL", 0)
+        mock_db.company_preferences.count_documents.return_value = 2
+        mock_db.job_type_preferences.find_one.return_value = None
+        mock_db.user_revisions.find_one.return_value = {'preferences': 3, 'favorites': 1}
+
+        test_client.get('/login')
+        mock_db.user_revisions.find_one.return_value = {'preferences': 3, 'favorites': 2}
+        test_client.get('/login')
+        assert mock_db.company_preferences.count_documents.call_count == 1
+
+        mock_db.user_revisions.find_one.return_value = {'preferences': 4, 'favorites': 2}
+        test_client.get('/login')
+        assert mock_db.company_preferences.count_documents.call_count == 2
+
+    def test_etag_pages_check_the_revision_they_already_read(self, client):
+        """Test that pages with an ETag see another worker's save at once, with one revisions read."""
+        test_client, mock_db, _ = client
+        for name in ('company_preferences', 'location_preferences', 'role_preferences', 'favorites', 'jobs'):
+            getattr(mock_db, name).find.return_value = []
+        mock_db.company_preferences.count_documents.return_value = 2
+        mock_db.job_type_preferences.find_one.return_value = None
+        mock_db.user_revisions.find_one.return_value = {'preferences': 3}
+
+        test_client.get('/jobs')
+        mock_db.user_revisions.find_one.return_value = {'preferences': 4}
+        mock_db.user_revisions.find_one.reset_mock()
+        test_client.get('/jobs')
+
+        assert mock_db.company_preferences.count_documents.call_count == 2
+        assert mock_db.user_revisions.find_one.call_count == 1
+
+
+class TestConditionalGet:
+    """Test cases for ETag revalidation of per-user pages."""
+
+    @pytest.fixture
+    def board(self, client):
+        test_client, mock_db, _ = client
+        for name in ('company_preferences', 'location_preferences', 'role_preferences', 'favorites', 'jobs'):
+            getattr(mock_db, name).find.return_value = []
+        mock_db.job_type_preferences.find_one.return_value = None
+        mock_db.user_revisions.find_one.return_value = None
+        return test_client, mock_db
+
+    def test_matching_etag_skips_scoring_and_rendering(self, board, monkeypatch):
+        """Test that a revalidation with the current ETag gets a bodyless 304."""
+        test_client, _ = board
+        first = test_client.get('/jobs')
+        etag = first.headers['ETag']
+        assert etag.startswith('W/"')
+        assert first.headers['Cache-Control'] == 'private, no-cache'
+        assert 'Cookie' in first.headers['Vary']
+
+        def fail(*args, **kwargs):
+            raise AssertionError("a 304 should not score or render")
+
+        monkeypatch.setattr(app_module, "load_and_score_jobs", fail)
+        monkeypatch.setattr(app_module, "score_jobs_for_user", fail)
+        monkeypatch.setattr(app_module, "render_template", fail)
+
+        response = test_client.get('/jobs', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+
+    def test_pages_have_their_own_etags(self, board):
+        """Test that / and /jobs are validated separately."""
+        test_client, _ = board
+        home = test_client.get('/').headers['ETag']
+        response = test_client.get('/jobs', headers={'If-None-Match': home})
+        assert response.status_code == 200
+
+    def test_saving_preferences_changes_the_etag(self, board):
+        """Test that a preference save bumps the user's revision and so the ETag."""
+        test_client, mock_db = board
+        etag = test_client.get('/').headers['ETag']
+
+        test_client.post('/preferences/testuser/companies', data={'company_Google': '1'})
+        mock_db.user_revisions.update_one.assert_called_once_with(
+            {'_id': 'testuser'}, {'$inc': {'preferences': 1}}, upsert=True
+        )
+        mock_db.user_revisions.find_one.return_value = {'preferences': 1}
+
+        response = test_client.get('/', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+    def test_flashed_messages_are_not_revalidated(self, board):
+        """Test that a page showing a flash message carries no ETag."""
+        test_client, _ = board
+        with test_client.session_transaction() as sess:
+            sess['_flashes'] = [('info', 'You have been logged out.')]
+
+        response = test_client.get('/')
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
+
+
+class TestJobBoardStreaming:
+    """Test cases for the streamed /jobs page."""
+
+    def test_header_and_first_cards_arrive_first(self, client, monkeypatch):
+        """Test that /jobs is sent in chunks, starting with the page header."""
+        test_client, mock_db, _ = client
+        mock_db.user_revisions.find_one.return_value = None
+        jobs = [
+            {
+                'title': f'Engineer {i}',
+                'company': 'Google',
+                'company_slug': 'google',
+                'identifier': str(i),
+                'location': 'Remote',
+                'match_score': 50,
+                'is_favorited': False,
+            }
+            for i in range(400)
+        ]
+        monkeypatch.setattr(app_module, "load_and_score_jobs", lambda db, uid, catalog=None: jobs)
+
+        response = test_client.get('/jobs', buffered=False)
+        assert response.is_streamed
+        chunks = [chunk.decode() for chunk in response.response]
+        response.close()
+
+        assert len(chunks) > 1
+        assert 'job-board-cards' in chunks[0]
+        assert '<article' in chunks[0]
+        # the top of the board; main.js fetches the rest from /api/jobs
+        assert ''.join(chunks).count('data-match=') == app_module.BOARD_INITIAL_CARDS
+
+
+    def test_cards_and_jobs_come_from_one_snapshot(self, client, monkeypatch):
+        """Test that the card cache version is the version of the catalog that was scored."""
+        test_client, mock_db, _ = client
+        mock_db.user_revisions.find_one.return_value = None
+        monkeypatch.setattr(app_module, "_catalog_state", (None, None, None))
+        scored = []
+        monkeypatch.setattr(
+            app_module,
+            "load_and_score_jobs",
+            lambda db, uid, catalog=None: scored.append(catalog) or [],
+        )
+        cache = test_client.application.extensions['card_cache']
+        versions = []
+        original = cache.iter_render
+
+        def iter_render(jobs, variant, version, *args, **kwargs):
+            versions.append(version)
+            return original(jobs, variant, version, *args, **kwargs)
+
+        monkeypatch.setattr(cache, "iter_render", iter_render)
+
+        test_client.get('/jobs').close()
+
+        assert scored[0] is not None
+        assert versions == [scored[0].version]
+
+
+class TestJobBoardApi:
+    """Test cases for the /api/jobs payload behind the client-side board."""
+
+    @pytest.fixture
+    def jobs(self, client, monkeypatch):
+        _, mock_db, _ = client
+        mock_db.user_revisions.find_one.return_value = None
+        jobs = [
+            {
+                'title': f'Engineer {i}',
+                'company': 'Google' if i % 2 else 'Meta',
+                'company_slug': 'google' if i % 2 else 'meta',
+                'identifier': str(i),
+                'location': 'Remote',
+                'type': 'Full-time',
+                'tags': ['python', 'go'],
+                'posted': 'Dec 03',
+                'match_score': i % 97,
+                'is_favorited': i == 5,
+            }
+            for i in range(100)
+        ]
+        monkeypatch.setattr(app_module, "load_and_score_jobs", lambda db, uid, catalog=None: jobs)
+        return jobs
+
+    def test_payload_is_the_whole_board_in_order(self, client, jobs):
+        """Test that every job is sent, in board order, against lookup tables."""
+        test_client, _, _ = client
+        payload = test_client.get('/api/jobs').get_json()
+
+        assert sorted(payload['companies']) == [['Google', 'google'], ['Meta', 'meta']]
+        assert payload['locations'] == ['Remote']
+        assert payload['types'] == ['Full-time']
+
+        expected = [job['identifier'] for job in app_module.board_order(jobs)]
+        assert [row[6] for row in payload['jobs']] == expected
+
+        row = next(row for row in payload['jobs'] if row[6] == '5')
+        assert row == ['Engineer 5', row[1], 0, 0, 'python,go', 5, '5', 'Dec 03', 1]
+        assert payload['companies'][row[1]] == ['Google', 'google']
+
+    def test_page_shows_the_head_of_the_payload(self, client, jobs):
+        """Test that the server-rendered cards are the first rows of the payload."""
+        test_client, _, _ = client
+        html = test_client.get('/jobs').get_data(as_text=True)
+        payload = test_client.get('/api/jobs').get_json()
+
+        head = payload['jobs'][:app_module.BOARD_INITIAL_CARDS]
+        slugs = [payload['companies'][row[1]][1] for row in head]
+        positions = [html.index(f'/jobs/{slug}/{row[6]}?') for slug, row in zip(slugs, head)]
+        assert positions == sorted(positions)
+        assert html.count('data-match=') == len(head)
+        assert 'id="job-card-template"' in html
+        assert 'data-source="/api/jobs"' in html
+
+    def test_payload_is_revalidated(self, client, jobs):
+        """Test that /api/jobs answers a matching ETag with a 304."""
+        test_client, _, _ = client
+        etag = test_client.get('/api/jobs').headers['ETag']
+
+        response = test_client.get('/api/jobs', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+
+class TestHealthEndpoints:
+    """Test cases for the liveness and readiness probes."""
+
+    def test_app_does_not_connect_at_startup(self, app):
+        """Test that the Mongo client is created lazily and never pinged up front."""
+        _, mock_db, mock_client = app
+        assert mock_client.call_args.kwargs['connect'] is False
+        assert mock_client.return_value.admin.command.call_count == 0
+        assert mock_db.mock_calls == []
+
+    def test_app_can_be_created_without_mongo_settings(self, monkeypatch):
+        """Test that a missing MONGO_DBNAME only fails once the database is used."""
+        monkeypatch.delenv('MONGO_URI', raising=False)
+        monkeypatch.delenv('MONGO_DBNAME', raising=False)
+
+        db = app_module.create_app().extensions['db']
+
+        assert isinstance(db, app_module.MissingDatabase)
+        with pytest.raises(RuntimeError, match='MONGO_DBNAME'):
+            db.jobs.find({})
+
+    def test_app_creation_reads_no_templates_or_manifest(self, app, monkeypatch):
+        """Test that the page fingerprint is computed on the first validator, not at import."""
+        _, mock_db, _ = app
+        reads = []
+        fingerprint = app_module.template_fingerprint
+        monkeypatch.setattr(
+            app_module, "template_fingerprint", lambda folder: reads.append(folder) or fingerprint(folder)
+        )
+        monkeypatch.setattr(
+            assets, "load_manifest", MagicMock(side_effect=AssertionError("manifest read at creation"))
+        )
+
+        with patch('pymongo.MongoClient') as mock_client:
+            mock_client.return_value.__getitem__.return_value = mock_db
+            app_instance = app_module.create_app()
+        assert reads == []
+
+        monkeypatch.setattr(assets, "load_manifest", lambda folder: {})
+        for name in ('company_preferences', 'location_preferences', 'role_preferences', 'favorites', 'jobs'):
+            getattr(mock_db, name).find.return_value = []
+        mock_db.job_type_preferences.find_one.return_value = None
+        mock_db.user_revisions.find_one.return_value = None
+        client = app_instance.test_client()
+        assert 'ETag' in client.get('/jobs').headers
+        client.get('/jobs')
+        assert len(reads) == 1
+
+    def test_healthz_touches_nothing(self, client):
+        """Test that liveness answers without any database work."""
+        test_client, mock_db, mock_client = client
+        pings = mock_client.return_value.admin.command.call_count
+
+        response = test_client.get('/healthz')
+
+        assert response.status_code == 200
+        assert response.data == b'ok'
+        assert mock_db.mock_calls == []
+        assert mock_client.return_value.admin.command.call_count == pings
+
+    def test_readyz_caches_the_mongo_ping(self, client):
+        """Test that readiness reports Mongo and reuses a recent ping."""
+        test_client, mock_db, mock_client = client
+        pings = mock_client.return_value.admin.command.call_count
+
+        first = test_client.get('/readyz')
+        second = test_client.get('/readyz')
+
+        assert first.status_code == 200
+        assert first.json['ready'] is True
+        assert first.json['mongo']['ok'] is True
+        assert second.status_code == 200
+        assert mock_client.return_value.admin.command.call_count == pings + 1
+        assert mock_db.jobs.find.call_count == 0
+
+    def test_readyz_unavailable_without_mongo(self, client):
+        """Test that readiness fails while Mongo does not answer."""
+        test_client, _, mock_client = client
+        mock_client.return_value.admin.command.side_effect = Exception("connection refused")
+
+        response = test_client.get('/readyz')
+
+        assert response.status_code == 503
+        assert response.json['ready'] is False
+        assert 'connection refused' in response.json['mongo']['error']
+
+    def test_readyz_reports_catalog(self, client):
+        """Test that readiness reports the loaded catalog's version and size."""
+        test_client, mock_db, _ = client
+        for name in ('company_preferences', 'location_preferences', 'role_preferences', 'favorites', 'jobs'):
+            getattr(mock_db, name).find.return_value = []
+        mock_db.job_type_preferences.find_one.return_value = None
+
+        assert test_client.get('/readyz').json['catalog'] == {'loaded': False}
+        test_client.get('/')
+        catalog = test_client.get('/readyz').json['catalog']
+
+        assert catalog['loaded'] is True
+        assert catalog['jobs'] > 0
+        assert len(catalog['version']) == 12
+
+
 class TestErrorHandling:
     """Test error handling."""
     
@@ -216,7 +618,39 @@ class TestErrorHandling:
         test_client, mock_db, _ = client
         
         response = test_client.get('/nonexistent')
-        assert response.status_code in [200, 404]
+        assert response.status_code == 404
+        assert b'Something went wrong' in response.data
+
+    def test_unhandled_exception_returns_500(self, client, monkeypatch):
+        """Test that a view that raises renders the error page with status 500."""
+        test_client, _, _ = client
+
+        def boom(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setitem(test_client.application.view_functions, "login", boom)
+        response = test_client.get('/login')
+        assert response.status_code == 500
+        assert b'Something went wrong' in response.data
+
+    def test_404_does_no_catalog_or_preference_work(self, client, monkeypatch):
+        """Test that a 404 renders without CSV reads, job queries or preference queries."""
+        test_client, mock_db, _ = client
+        monkeypatch.setattr(app_module, "_catalog_state", (None, None, None))
+        csv_reads = MagicMock(side_effect=AssertionError("error pages must not read CSVs"))
+        monkeypatch.setattr(app_module, "iter_jobs_from_csv", csv_reads)
+        monkeypatch.setattr(app_module, "load_jobs_from_csv", csv_reads)
+
+        for _ in range(3):
+            response = test_client.get('/wp-login.php')
+            assert response.status_code == 404
+            assert b'Something went wrong' in response.data
+
+        csv_reads.assert_not_called()
+        assert mock_db.jobs.find.call_count == 0
+        assert mock_db.catalog_meta.find_one.call_count == 0
+        assert mock_db.company_preferences.count_documents.call_count == 0
+        assert mock_db.job_type_preferences.find_one.call_count == 0
 
 
 class TestAuthAndFavorites:
@@ -283,7 +717,7 @@ class TestAuthAndFavorites:
             MagicMock(id="user1", is_authenticated=True),
         )
         mock_jobs = [{"company": "TestCo", "identifier": "42", "company_slug": "testco"}]
-        monkeypatch.setattr(app_module, "load_and_score_jobs", lambda db, uid: mock_jobs)
+        monkeypatch.setattr(app_module, "load_and_score_jobs", lambda db, uid, catalog=None: mock_jobs)
         _, mock_db, _ = client
         mock_db.favorites.find.return_value = [{"company": "TestCo", "identifier": "42"}]
 
@@ -299,7 +733,7 @@ class TestAuthAndFavorites:
             MagicMock(id="user1", is_authenticated=True),
         )
         job = {"company": "TestCo", "identifier": "42", "company_slug": "testco"}
-        monkeypatch.setattr(app_module, "load_and_score_jobs", lambda db, uid: [job])
+        monkeypatch.setattr(app_module, "load_and_score_jobs", lambda db, uid, catalog=None: [job])
         mock_db.favorites.find_one.return_value = {"_id": ObjectId(), "company": "TestCo", "identifier": "42"}
 
         response = app_module.app.test_client().post("/favorite/testco/42")
@@ -314,7 +748,7 @@ class TestAuthAndFavorites:
             "current_user",
             MagicMock(id="user1", is_authenticated=True),
         )
-        monkeypatch.setattr(app_module, "load_and_score_jobs", lambda db, uid: [])
+        monkeypatch.setattr(app_module, "load_and_score_jobs", lambda db, uid, catalog=None: [])
 
         response = app_module.app.test_client().post("/favorite/testco/42")
         assert response.status_code == 404
@@ -0,0 +1,169 @@
+"""Tests for response compression and fingerprinted static assets."""
+
+import gzip
+import json
+import os
+import shutil
+import zlib
+
+import pytest
+from flask import Response, url_for
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+import assets
+
+
+@pytest.fixture
+def compressing(app):
+    app_instance, _, _ = app
+    app_instance.config["COMPRESS_MIN_SIZE"] = 100
+
+    @app_instance.route("/_test/html/<int:size>")
+    def sized_page(size):
+        return "<p>" + "x" * size + "</p>"
+
+    return app_instance
+
+
+@pytest.fixture
+def built(app, tmp_path):
+    """App serving a copy of static/ that has been through build-assets."""
+    app_instance, _, _ = app
+    static = tmp_path / "static"
+    shutil.copytree(app_instance.static_folder, static)
+    app_instance.static_folder = str(static)
+    bundle = app_instance.extensions["assets"]
+    bundle.static_folder = str(static)
+    assets.build_assets(str(static))
+    bundle.reload()
+    return app_instance, static
+
+
+class TestChooseEncoding:
+    def parse(self, header):
+        return parse_accept_header(header, Accept)
+
+    def test_prefers_brotli_when_available(self):
+        accept = self.parse("gzip, deflate, br")
+        assert assets.choose_encoding(accept, ("br", "gzip")) == "br"
+        assert assets.choose_encoding(accept, ("gzip",)) == "gzip"
+
+    def test_honours_quality(self):
+        assert assets.choose_encoding(self.parse("br;q=0.1, gzip;q=0.9"), ("br", "gzip")) == "gzip"
+        assert assets.choose_encoding(self.parse("identity"), ("br", "gzip")) is None
+
+
+class TestResponseCompression:
+    def test_large_html_is_gzipped(self, compressing):
+        response = compressing.test_client().get(
+            "/_test/html/5000", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert gzip.decompress(response.data) == b"<p>" + b"x" * 5000 + b"</p>"
+
+    def test_small_or_unaccepted_responses_are_left_alone(self, compressing):
+        client = compressing.test_client()
+        small = client.get("/_test/html/10", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/_test/html/5000")
+
+        assert "Content-Encoding" not in small.headers
+        assert "Content-Encoding" not in plain.headers
+        assert "Accept-Encoding" in plain.headers["Vary"]
+
+    def test_streamed_response_is_compressed_chunk_by_chunk(self, compressing):
+        @compressing.route("/_test/stream")
+        def stream():
+            return Response((f"<p>{i}</p>" * 500 for i in range(3)), mimetype="text/html")
+
+        response = compressing.test_client().get(
+            "/_test/stream", headers={"Accept-Encoding": "gzip"}, buffered=False
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+
+        # every chunk is decodable as soon as it arrives
+        decoder = zlib.decompressobj(31)
+        received = [decoder.decompress(chunk) for chunk in response.response]
+        response.close()
+        assert received[0] == b"<p>0</p>" * 500
+        assert b"".join(received) == b"".join(f"<p>{i}</p>".encode() * 500 for i in range(3))
+
+    def test_strong_etag_is_weakened(self, compressing):
+        @compressing.after_request
+        def tag(response):
+            response.set_etag("abc")
+            return response
+
+        response = compressing.test_client().get(
+            "/_test/html/5000", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["ETag"] == 'W/"abc"'
+
+
+class TestBrotli:
+    """Brotli, when the client prefers it and the package is installed."""
+
+    def test_large_html_is_brotli_compressed(self, compressing):
+        """Test that a client preferring br gets a brotli body."""
+        brotli = pytest.importorskip("brotli")
+        response = compressing.test_client().get(
+            "/_test/html/5000", headers={"Accept-Encoding": "gzip, br"}
+        )
+        assert response.headers["Content-Encoding"] == "br"
+        assert brotli.decompress(response.data) == b"<p>" + b"x" * 5000 + b"</p>"
+
+
+class TestBuiltAssets:
+    def test_manifest_maps_files_to_hashed_copies(self, built):
+        _, static = built
+        manifest = json.loads((static / "dist" / "manifest.json").read_text())
+
+        hashed = manifest["main.js"]
+        assert hashed.startswith("dist/main.") and hashed.endswith(".js")
+        assert (static / hashed).read_bytes() == (static / "main.js").read_bytes()
+        assert gzip.decompress((static / (hashed + ".gz")).read_bytes()) == (static / "main.js").read_bytes()
+
+    def test_standalone_build_needs_no_app_config(self, tmp_path, monkeypatch):
+        """Test that `python -m assets build` runs without the Mongo settings."""
+        monkeypatch.delenv("MONGO_URI", raising=False)
+        monkeypatch.delenv("MONGO_DBNAME", raising=False)
+        static = tmp_path / "static"
+        shutil.copytree(os.path.join(os.path.dirname(assets.__file__), "static"), static)
+
+        assert assets.main(["build", str(static)]) == 0
+        manifest = json.loads((static / "dist" / "manifest.json").read_text())
+        assert (static / manifest["main.js"]).exists()
+
+    def test_url_for_emits_hashed_names(self, built):
+        app_instance, _ = built
+        manifest = app_instance.extensions["assets"].manifest
+        with app_instance.test_request_context():
+            assert url_for("static", filename="base.css") == "/static/" + manifest["base.css"]
+            assert url_for("static", filename="missing.png") == "/static/missing.png"
+
+    def test_hashed_assets_are_immutable_and_precompressed(self, built):
+        app_instance, static = built
+        hashed = app_instance.extensions["assets"].manifest["jobs.css"]
+        client = app_instance.test_client()
+
+        response = client.get(f"/static/{hashed}", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.mimetype == "text/css"
+        assert response.headers["Cache-Control"] == assets.IMMUTABLE_CACHE_CONTROL
+        assert gzip.decompress(response.data) == (static / "jobs.css").read_bytes()
+        response.close()
+
+        plain = client.get(f"/static/{hashed}")
+        assert "Content-Encoding" not in plain.headers
+        assert plain.data == (static / "jobs.css").read_bytes()
+        plain.close()
+
+    def test_unhashed_files_keep_default_caching(self, built):
+        app_instance, _ = built
+        response = app_instance.test_client().get("/static/main.js")
+        assert response.status_code == 200
+        assert response.headers.get("Cache-Control") != assets.IMMUTABLE_CACHE_CONTROL
+        response.close()
@@ -0,0 +1,127 @@
+"""Tests for the hot-path benchmark harness."""
+
+import os
+
+import pytest
+
+from tests.benchmarks import bench_hot_path
+from tests.load import loadtest
+
+
+class TestBenchmarkHarness:
+    """Keep the benchmark runnable and its regression check honest."""
+
+    def test_suite_runs_on_small_catalog(self):
+        """Test that every stage reports timings for each size."""
+        results = bench_hot_path.run_suite(sizes=[200], repeats=1, log=lambda *_: None)
+
+        assert set(results) == {
+            "load_jobs_from_csv",
+            "dedupe_jobs",
+            "job_facts",
+            "score_jobs_for_user",
+            "get_recommended_jobs",
+        }
+        for by_size in results.values():
+            assert by_size["200"]["median"] >= 0
+
+    def test_compare_flags_regressions_past_threshold(self):
+        """Test that only slowdowns beyond the threshold are reported."""
+        baseline = {"results": {"score_jobs_for_user": {"1000": {"median": 0.010}}}}
+        slower = {"score_jobs_for_user": {"1000": {"median": 0.013}}}
+        similar = {"score_jobs_for_user": {"1000": {"median": 0.011}}}
+
+        assert bench_hot_path.compare(slower, baseline, threshold=0.2)
+        assert bench_hot_path.compare(similar, baseline, threshold=0.2) == []
+
+    def test_compare_ignores_sizes_missing_from_baseline(self):
+        """Test that new sizes or stages never count as regressions."""
+        results = {"dedupe_jobs": {"1000000": {"median": 1.0}}}
+        assert bench_hot_path.compare(results, {"results": {}}, threshold=0.1) == []
+
+
+class TestLoadHarness:
+    """Keep the HTTP load harness runnable."""
+
+    def test_smoke_scenario_reports_every_route_it_hit(self, tmp_path, monkeypatch):
+        """Test that a tiny scenario runs end to end without server errors or leftover state."""
+        pytest.importorskip("mongomock")
+        monkeypatch.chdir(tmp_path)
+        environ = dict(os.environ)
+
+        scenario = loadtest.load_scenario(
+            os.path.join(os.path.dirname(loadtest.__file__), "scenarios", "smoke.json")
+        )
+        report = loadtest.run(scenario)
+
+        assert os.getcwd() == str(tmp_path)
+        assert dict(os.environ) == environ
+
+        assert report["total_requests"] == scenario["sessions"] * scenario["requests_per_session"]
+        for route in report["routes"].values():
+            assert route["errors"] == 0
+
+    def test_broken_route_is_reported_as_errors(self, monkeypatch):
+        """Test that a route whose view raises is counted as errors, not as a fast success."""
+        pytest.importorskip("mongomock")
+        start_app = loadtest.start_app
+
+        def start_broken_app(*args, **kwargs):
+            app = start_app(*args, **kwargs)
+
+            def boom(*args, **kwargs):
+                raise RuntimeError("profile is broken")
+
+            app.view_functions["profile"] = boom
+            return app
+
+        monkeypatch.setattr(loadtest, "start_app", start_broken_app)
+        scenario = dict(
+            loadtest.load_scenario(
+                os.path.join(os.path.dirname(loadtest.__file__), "scenarios", "smoke.json")
+            ),
+            routes={"home": 1, "profile": 1},
+        )
+        report = loadtest.run(scenario)
+
+        profile = report["routes"]["/profile"]
+        assert profile["errors"] == profile["requests"] > 0
+        assert report["routes"]["/"]["errors"] == 0
+
+
+class TestMemoryBenchmark:
+    """Keep the tracemalloc memory measurement runnable."""
+
+    def test_records_are_smaller_than_dicts(self, tmp_path):
+        """Test that the compact record retains less memory per job than the old dict."""
+        from tests.benchmarks import bench_hot_path, bench_memory
+
+        path = tmp_path / "jobs.csv"
+        bench_hot_path.write_csv(bench_hot_path.make_rows(2000), str(path))
+
+        result = bench_memory.measure([(str(path), "Google")])
+
+        assert result["jobs"] == 2000
+        assert 0 < result["record_bytes_per_job"] < result["dict_bytes_per_job"]
+
+
+class TestStartupBenchmark:
+    """Keep the cold-start measurement runnable, and importing app free of network I/O."""
+
+    def test_parse_importtime(self):
+        """Test that cumulative times are read per module and the header is skipped."""
+        from tests.benchmarks import bench_startup
+
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:      2500 |      40000 | app\n"
+        )
+        assert bench_startup.parse_importtime(stderr) == {"json.decoder": 120, "app": 40000}
+
+    def test_import_app_does_no_network_io(self):
+        """Test that importing app connects to nothing and starts no threads."""
+        from tests.benchmarks import bench_startup
+
+        report = bench_startup.import_once()
+        assert report["app"] > 0
@@ -0,0 +1,138 @@
+"""Tests for the shared job-card fragment cache."""
+
+import re
+
+import pytest
+
+import card_cache
+
+
+def job(identifier, **extra):
+    """A catalog job as the card template sees it, with extra overriding fields."""
+    return {
+        "title": f"Engineer {identifier}",
+        "company": "Google",
+        "company_slug": "google",
+        "identifier": identifier,
+        "location": "Remote",
+        "type": "Full-time",
+        "tags": ["python"],
+        "posted": "Dec 03",
+        "match_score": 80,
+        "is_favorited": False,
+        **extra,
+    }
+
+
+@pytest.fixture
+def cards(app):
+    """The app's card cache, inside a request context for url_for."""
+    app_instance, _, _ = app
+    cache = app_instance.extensions["card_cache"]
+    with app_instance.test_request_context():
+        yield cache
+
+
+def count_renders(cache, monkeypatch):
+    """Record (variant, identifier) for every card the cache renders from the template."""
+    calls = []
+    original = cache.render_fragment
+
+    def render_fragment(job, variant):
+        calls.append((variant, job["identifier"]))
+        return original(job, variant)
+
+    monkeypatch.setattr(cache, "render_fragment", render_fragment)
+    return calls
+
+
+class TestSplitSlots:
+    """Test cases for splitting a rendered card around its slot markers."""
+
+    def test_chunks_around_slots(self):
+        """Test that the HTML is split at each marker, keeping the slot names in order."""
+        markers = card_cache.slot_markers("abc")
+        html = f'<a m="{markers["match"]}">{{x}}{markers["favorite"]}</a>'
+        chunks, slots = card_cache.split_slots(html, "abc")
+        assert chunks == ('<a m="', '">{x}', "</a>")
+        assert slots == ("match", "favorite")
+
+    def test_other_tokens_are_left_alone(self):
+        """Test that markers made with another token are ordinary text."""
+        html = card_cache.slot_markers("other")["match"] + "__card_match__"
+        chunks, slots = card_cache.split_slots(html, "abc")
+        assert chunks == (html,)
+        assert slots == ()
+
+
+class TestCardCache:
+    """Test cases for rendering pages of cards from cached fragments."""
+
+    def test_cards_are_rendered_once_for_every_user(self, cards, monkeypatch):
+        """Test that each card is rendered once, then filled in with each user's values."""
+        calls = count_renders(cards, monkeypatch)
+        jobs = [job("1"), job("2")]
+
+        first = cards.render(jobs, "board", "v1", "alice", show_favorite=True)
+        second = cards.render(
+            [job("1", match_score=12, is_favorited=True), job("2")], "board", "v1", "bob", True
+        )
+
+        assert calls == [("board", "1"), ("board", "2")]
+        assert first.count("<article") == 2
+        assert 'data-match="80"' in first and 'data-match="12"' in second
+        assert "Match 12%" in second
+        assert "user_id=alice" in first and "user_id=bob" in second
+        assert "card__favorite--active" not in first
+        assert second.count("card__favorite--active") == 1
+
+    def test_signed_out_cards_have_no_favorite_button(self, cards):
+        """Test that signed-out cards get no favorite button and no leftover markers."""
+        html = cards.render([job("1")], "home", "v1", "testuser", show_favorite=False)
+        assert "card__favorite" not in html
+        assert not re.search(r"__[0-9a-f]{16}_", html)
+        assert "user_id" not in html
+
+    def test_job_text_is_escaped_once(self, cards):
+        """Test that job text is escaped by the template and not again when the page is built."""
+        html = cards.render([job("1", title="R&D <Lead> {x}")], "home", "v1", "u", False)
+        assert "R&amp;D &lt;Lead&gt; {x}" in html
+
+    def test_job_text_that_looks_like_a_slot_is_just_text(self, cards):
+        """Test that a title containing marker-like text renders as that text."""
+        title = "__card_x__ __card_match__ __0123456789abcdef_match__"
+        html = cards.render([job("1", title=title)], "board", "v1", "u", True)
+        assert f"<h3>{title}</h3>" in html
+        assert "Match 80%" in html
+
+    def test_new_catalog_version_renders_again(self, cards, monkeypatch):
+        """Test that a new catalog version drops the cached fragments."""
+        calls = count_renders(cards, monkeypatch)
+        cards.render([job("1")], "home", "v1", "u", False)
+        cards.render([job("1", title="Renamed")], "home", "v1", "u", False)
+        html = cards.render([job("1", title="Renamed")], "home", "v2", "u", False)
+
+        assert len(calls) == 2
+        assert "Renamed" in html
+
+    def test_cache_is_bounded(self, cards, monkeypatch):
+        """Test that cards past max_cards are rendered every time instead of cached."""
+        calls = count_renders(cards, monkeypatch)
+        cards.max_cards = 1
+        for _ in range(2):
+            cards.render([job("1"), job("2")], "home", "v1", "u", False)
+        assert calls.count(("home", "1")) == 1
+        assert calls.count(("home", "2")) == 2
+
+    def test_iter_render_yields_batches(self, cards):
+        """Test that iter_render yields batch-sized chunks that join to the full render."""
+        jobs = [job(str(i)) for i in range(5)]
+        batches = list(cards.iter_render(jobs, "home", "v1", "u", False, batch=2))
+
+        assert [b.count("<article") for b in batches] == [2, 2, 1]
+        assert "".join(batches) == cards.render(jobs, "home", "v1", "u", False)
+
+    def test_unknown_variant(self, cards):
+        """Test that an unknown variant is rejected."""
+        with pytest.raises(ValueError):
+            cards.render([job("1")], "grid", "v1", "u", False)
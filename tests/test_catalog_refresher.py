@@ -0,0 +1,164 @@
+"""Tests for the background catalog refresher."""
+
+import time
+
+import pytest
+
+import app as app_module
+import catalog_refresher
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll condition until it holds, failing after timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the refresher")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def refreshing(app):
+    """App with the refresher enabled, polling the mocked db every 10ms."""
+    app_instance, mock_db, _ = app
+    for name in ('company_preferences', 'location_preferences', 'role_preferences', 'favorites', 'jobs'):
+        getattr(mock_db, name).find.return_value = []
+    mock_db.job_type_preferences.find_one.return_value = None
+    mock_db.user_revisions.find_one.return_value = None
+    mock_db.catalog_meta.find_one.return_value = {'version': 1}
+    app_instance.config['CATALOG_REFRESH_ENABLED'] = True
+    app_instance.config['CATALOG_POLL_SECONDS'] = 0.01
+
+    refresher = app_instance.extensions['catalog_refresher']
+    yield app_instance, mock_db, refresher
+    refresher.stop(timeout=5)
+
+
+class TestCheck:
+    """Test cases for a single check of the catalog's sources."""
+
+    def test_refreshes_only_when_the_key_changes(self, app):
+        """Test that the catalog is rebuilt only when the source key changes."""
+        app_instance, _, _ = app
+        keys = iter([1, 1, 2])
+        refreshed = []
+        refresher = catalog_refresher.CatalogRefresher(
+            app_instance, object(), lambda db: next(keys), lambda db, key: refreshed.append(key)
+        )
+
+        for _ in range(3):
+            refresher.check()
+        assert refreshed == [1, 2]
+
+
+class TestRefresherThread:
+    """Test cases for the per-process refresher thread."""
+
+    def test_first_request_starts_it(self, refreshing):
+        """Test that the first request starts the thread, which loads the catalog."""
+        app_instance, mock_db, refresher = refreshing
+        assert not refresher.is_alive()
+
+        app_instance.test_client().get('/healthz')
+
+        assert refresher.is_alive()
+        assert catalog_refresher.keeps_current(mock_db)
+        wait_for(lambda: app_module.catalog_status(mock_db)['loaded'])
+
+    def test_new_catalog_is_published_off_the_request_path(self, refreshing, monkeypatch):
+        """Test that requests never check sources while the thread publishes new catalogs."""
+        app_instance, mock_db, refresher = refreshing
+        client = app_instance.test_client()
+        client.get('/healthz')
+        wait_for(lambda: app_module.catalog_status(mock_db)['loaded'])
+        before = app_module.get_job_catalog(mock_db)
+
+        def fail(db):
+            raise AssertionError("requests must not check the catalog's sources")
+
+        # The refresher holds its own reference; only the request path is stopped
+        monkeypatch.setattr(app_module, "catalog_source_key", fail)
+        assert client.get('/jobs').status_code == 200
+
+        mock_db.catalog_meta.find_one.return_value = {'version': 2}
+        wait_for(lambda: app_module.get_job_catalog(mock_db) is not before)
+        assert app_module.get_job_catalog(mock_db).version != before.version
+
+    def test_failed_check_keeps_the_current_catalog(self, refreshing):
+        """Test that a failed check is reported and the current catalog is kept."""
+        app_instance, mock_db, refresher = refreshing
+        app_instance.test_client().get('/healthz')
+        wait_for(lambda: app_module.catalog_status(mock_db)['loaded'])
+        catalog = app_module.get_job_catalog(mock_db)
+
+        mock_db.catalog_meta.find_one.side_effect = Exception("connection refused")
+        wait_for(lambda: refresher.last_error is not None)
+
+        assert app_module.get_job_catalog(mock_db) is catalog
+        assert 'connection refused' in refresher.status()['error']
+
+    def test_readyz_reports_it(self, refreshing):
+        """Test that /readyz reports the thread's state."""
+        app_instance, _, refresher = refreshing
+        client = app_instance.test_client()
+        client.get('/healthz')
+        wait_for(lambda: refresher.last_check is not None)
+
+        status = client.get('/readyz').json['catalog_refresher']
+        assert status['running'] is True
+        assert status['mode'] in ('inotify', 'poll')
+
+    def test_disabled_refresher_never_starts(self, app):
+        """Test that CATALOG_REFRESH_ENABLED off keeps the thread from starting."""
+        app_instance, _, _ = app
+        app_instance.test_client().get('/healthz')
+        assert not app_instance.extensions['catalog_refresher'].is_alive()
+
+
+class TestFileWatching:
+    """Test cases for waking the thread with inotify."""
+
+    def test_file_change_wakes_it_before_the_next_poll(self, app, tmp_path):
+        """Test that replacing a CSV triggers a rebuild long before the next poll."""
+        pytest.importorskip("inotify_simple")
+        app_instance, _, _ = app
+        app_instance.config['CATALOG_POLL_SECONDS'] = 60
+        app_instance.config['CATALOG_SETTLE_SECONDS'] = 0.01
+        version = {'n': 0}
+        refreshed = []
+        refresher = catalog_refresher.CatalogRefresher(
+            app_instance,
+            object(),
+            lambda db: version['n'],
+            lambda db, key: refreshed.append(key),
+            watch_dirs=[str(tmp_path)],
+        )
+        refresher.start()
+        try:
+            wait_for(lambda: refreshed == [0])
+            version['n'] = 1
+            (tmp_path / 'google_jobs.csv').write_text('title\n')
+            wait_for(lambda: refreshed == [0, 1])
+            assert refresher.mode == 'inotify'
+        finally:
+            refresher.stop(timeout=0)
+
+    def test_unwatchable_directory_falls_back_to_polling(self, app, tmp_path):
+        """Test that a directory inotify cannot watch leaves the thread polling."""
+        pytest.importorskip("inotify_simple")
+        app_instance, _, _ = app
+        app_instance.config['CATALOG_POLL_SECONDS'] = 0.01
+        refreshed = []
+        refresher = catalog_refresher.CatalogRefresher(
+            app_instance,
+            object(),
+            lambda db: len(refreshed),
+            lambda db, key: refreshed.append(key),
+            watch_dirs=[str(tmp_path / 'missing')],
+        )
+        refresher.start()
+        try:
+            wait_for(lambda: len(refreshed) >= 2)
+            assert refresher.mode == 'poll'
+        finally:
+            refresher.stop(timeout=5)
@@ -0,0 +1,127 @@
+"""Tests for the scraper-to-Mongo ingestion pipeline."""
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from app import (  # noqa: E402
+    CATALOG_META_ID,
+    build_job_catalog,
+    ingest_csv_sources,
+    ingest_jobs,
+)
+
+
+def make_job(job_id, title="Software Engineer", company="Google"):
+    return {
+        "title": title,
+        "location": "New York, NY",
+        "department": "",
+        "job_id": job_id,
+        "url": f"https://example.com/{job_id}",
+        "scraped_at": None,
+        "posted_date": None,
+        "company": company,
+        "type": "Full-time",
+        "tags": [],
+    }
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # pymongo >= 4.9 passes sort= to add_update, which mongomock's bulk
+    # builder does not accept yet
+    builder = mongomock.collection.BulkOperationBuilder
+    add_update = builder.add_update
+
+    def add_update_without_sort(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+
+    monkeypatch.setattr(builder, "add_update", add_update_without_sort)
+    return mongomock.MongoClient().db
+
+
+class TestIngestJobs:
+    """Test cases for ingest_jobs."""
+
+    def test_inserts_new_jobs_in_batches(self, db):
+        """Test that every row is upserted even when spread across batches."""
+        jobs = [make_job(str(i)) for i in range(5)]
+        stats = ingest_jobs(db, "Google", jobs, batch_size=2)
+
+        assert stats["upserted"] == 5
+        assert db.jobs.count_documents({"company": "Google"}) == 5
+
+    def test_unchanged_rows_are_skipped(self, db):
+        """Test that re-ingesting identical rows writes nothing."""
+        ingest_jobs(db, "Google", [make_job("1"), make_job("2")])
+        stats = ingest_jobs(db, "Google", [make_job("1"), make_job("2")])
+
+        assert stats["unchanged"] == 2
+        assert stats["upserted"] == 0
+        assert stats["modified"] == 0
+
+    def test_changed_rows_are_updated(self, db):
+        """Test that a changed title updates the stored job."""
+        ingest_jobs(db, "Google", [make_job("1")])
+        stats = ingest_jobs(db, "Google", [make_job("1", title="Staff Engineer")])
+
+        assert stats["modified"] == 1
+        assert db.jobs.find_one({"job_id": "1"})["title"] == "Staff Engineer"
+
+    def test_missing_jobs_are_delisted_and_relisted(self, db):
+        """Test that jobs missing from a run are delisted and come back when seen again."""
+        ingest_jobs(db, "Google", [make_job("1"), make_job("2")])
+        stats = ingest_jobs(db, "Google", [make_job("1")])
+
+        assert stats["delisted"] == 1
+        assert db.jobs.find_one({"job_id": "2"})["delisted"] is True
+
+        stats = ingest_jobs(db, "Google", [make_job("1"), make_job("2")])
+        assert stats["modified"] == 1
+        assert db.jobs.find_one({"job_id": "2"})["delisted"] is False
+
+    def test_delisting_is_scoped_to_company(self, db):
+        """Test that ingesting one company never delists another company's jobs."""
+        ingest_jobs(db, "Google", [make_job("1")])
+        ingest_jobs(db, "Meta", [make_job("9", company="Meta")])
+
+        assert db.jobs.find_one({"job_id": "1"})["delisted"] is False
+
+
+class TestIngestCsvSources:
+    """Test cases for ingest_csv_sources and the catalog version."""
+
+    def write_csv(self, path, rows):
+        lines = ["title,location,department,job_id,url,scraped_at"]
+        lines += [
+            f"Engineer {r},Remote,,{r},https://example.com/{r},2025-12-10 12:00:00"
+            for r in rows
+        ]
+        path.write_text("\n".join(lines) + "\n")
+
+    def test_version_bumps_only_on_change(self, db, tmp_path):
+        """Test that the catalog version moves only when db.jobs changes."""
+        csv_path = tmp_path / "acme_jobs.csv"
+        self.write_csv(csv_path, ["1", "2"])
+        sources = [(str(csv_path), "Acme")]
+
+        _, version = ingest_csv_sources(db, sources)
+        assert version == 1
+
+        _, version = ingest_csv_sources(db, sources)
+        assert version is None
+        assert db.catalog_meta.find_one({"_id": CATALOG_META_ID})["version"] == 1
+
+        self.write_csv(csv_path, ["1"])
+        _, version = ingest_csv_sources(db, sources)
+        assert version == 2
+
+    def test_catalog_excludes_delisted_jobs(self, db, monkeypatch):
+        """Test that delisted jobs never reach the catalog."""
+        monkeypatch.setattr("app.CSV_SOURCES", [])
+        ingest_jobs(db, "Google", [make_job("1"), make_job("2")])
+        ingest_jobs(db, "Google", [make_job("1")])
+
+        catalog = build_job_catalog(db)
+        assert [job["job_id"] for job in catalog.jobs] == ["1"]
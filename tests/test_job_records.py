@@ -0,0 +1,100 @@
+"""Tests for the compact catalog job record."""
+
+import datetime
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from job_records import CategoryTable, JobRecord, from_epoch, to_epoch
+
+SCRAPED = datetime.datetime(2025, 12, 3, 14, 30, tzinfo=datetime.timezone.utc)
+
+
+def make_record(**overrides):
+    fields = dict(
+        title="Software Engineer, Ads",
+        location="Menlo Park, CA +2 locations",
+        department="AI Research +1 more",
+        job_id="12345",
+        url="https://example.com/jobs/12345",
+        scraped_ts=to_epoch(SCRAPED),
+        company="Meta",
+        job_type="Full-time",
+        tags=["AI Research", "Menlo Park, CA"],
+    )
+    fields.update(overrides)
+    return JobRecord(**fields)
+
+
+class TestJobRecord:
+    def test_reads_like_the_old_dict(self):
+        record = make_record()
+
+        assert record["title"] == "Software Engineer, Ads"
+        assert record["scraped_at"] == SCRAPED
+        assert record["posted_date"] == SCRAPED
+        assert record.get("_id") is None
+        assert record.get("missing", "x") == "x"
+        assert "company" in record and "_id" not in record
+        with pytest.raises(KeyError):
+            record["scraped_ts"]
+
+    def test_dict_conversion(self):
+        record = make_record()
+        as_dict = dict(record)
+
+        assert as_dict == record.copy()
+        assert list(as_dict) == list(JobRecord.KEYS)
+        assert as_dict["tags"] == ["AI Research", "Menlo Park, CA"]
+        copied = record.copy()
+        assert copied["scraped_at"] is copied["posted_date"]
+
+    def test_missing_scrape_time(self):
+        record = make_record(scraped_ts=None)
+        assert record["scraped_at"] is None
+        assert from_epoch(to_epoch(SCRAPED)) == SCRAPED
+
+    def test_repeated_values_are_shared(self):
+        location = "".join(["Seattle", ", WA"])
+        a = make_record(location=location)
+        b = make_record(location="Seattle, WA")
+
+        assert a.location_code == b.location_code
+        assert a.location is b.location
+        assert a.tags[0] is b.tags[0] is sys.intern("AI Research")
+        assert not hasattr(a, "__dict__")
+
+
+class TestCategoryTable:
+    def test_codes_are_stable_and_dense(self):
+        table = CategoryTable("test")
+        assert [table.code(v) for v in ("Remote", "Austin, TX", "Remote")] == [0, 1, 0]
+        assert table.values == ["Remote", "Austin, TX"]
+        assert len(table) == 2
+
+    def test_lookup_never_grows_the_table(self):
+        table = CategoryTable("test")
+        table.code("Remote")
+        assert table.lookup("Remote") == 0
+        assert table.lookup("Mars") is None
+        assert len(table) == 1
+
+    def test_scores_the_same_as_a_dict(self):
+        from app import score_jobs_for_user
+
+        db = MagicMock()
+        db.company_preferences.find.return_value = [{"company": "Meta", "rank": 1}]
+        db.location_preferences.find.return_value = [
+            {"location": "Menlo Park, CA +2 locations", "rank": 2},
+            {"location": "Nowhere, ZZ", "rank": 1},
+        ]
+        db.role_preferences.find.return_value = [{"role": "Software Engineer", "rank": 2}]
+        db.job_type_preferences.find_one.return_value = {"types": ["Full-time"]}
+
+        record = make_record()
+        [from_record] = score_jobs_for_user(db, "u1", [record])
+        [from_dict] = score_jobs_for_user(db, "u1", [record.copy()])
+
+        assert from_record == from_dict
+        assert isinstance(from_record, dict)
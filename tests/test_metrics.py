@@ -0,0 +1,239 @@
+"""Tests for the Mongo query monitor and /metrics endpoint."""
+
+import json
+import logging
+import os
+import re
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+import app as app_module
+import metrics
+
+
+def event(command_name, micros=1000, reply=None):
+    return SimpleNamespace(command_name=command_name, duration_micros=micros, reply=reply or {})
+
+
+@pytest.fixture
+def monitored(app):
+    """App with a route that issues `n` fake Mongo commands through the monitor."""
+    app_instance, _, _ = app
+    monitor = app_instance.extensions["query_monitor"]
+
+    @app_instance.route("/_test/queries/<int:n>")
+    def issue_queries(n):
+        monitor.succeeded(event("find", reply={"cursor": {"firstBatch": [{}, {}]}}))
+        for _ in range(n - 1):
+            monitor.succeeded(event("insert"))
+        return "ok"
+
+    return app_instance, monitor
+
+
+class TestDocumentsReturned:
+    def test_cursor_batches(self):
+        assert metrics.documents_returned("find", {"cursor": {"firstBatch": [1, 2, 3]}}) == 3
+        assert metrics.documents_returned("getMore", {"cursor": {"nextBatch": [1]}}) == 1
+
+    def test_find_and_modify(self):
+        assert metrics.documents_returned("findAndModify", {"value": {"v": 1}}) == 1
+        assert metrics.documents_returned("findAndModify", {"value": None}) == 0
+
+    def test_writes_return_nothing(self):
+        assert metrics.documents_returned("insert", {"n": 5}) == 0
+
+
+class TestQueryMonitor:
+    def test_commands_are_tagged_with_route(self, monitored):
+        app_instance, monitor = monitored
+        app_instance.test_client().get("/_test/queries/3")
+
+        commands, requests = monitor.snapshot()
+        assert commands[("/_test/queries/<int:n>", "find")][:3] == [1, pytest.approx(0.001), 2]
+        assert commands[("/_test/queries/<int:n>", "insert")][0] == 2
+        assert requests["/_test/queries/<int:n>"] == [1, 0]
+
+    def test_commands_outside_requests(self):
+        monitor = metrics.QueryMonitor()
+        monitor.failed(event("ping"))
+        commands, _ = monitor.snapshot()
+        assert commands[(metrics.NO_ROUTE, "ping")] == [1, pytest.approx(0.001), 0, 1]
+
+    def test_budget_warning_names_the_loop(self, monitored, caplog):
+        app_instance, monitor = monitored
+        app_instance.config["QUERY_BUDGET"] = 5
+
+        with caplog.at_level(logging.WARNING, logger="metrics"):
+            app_instance.test_client().get("/_test/queries/5")
+            app_instance.test_client().get("/_test/queries/12")
+
+        messages = [r.getMessage() for r in caplog.records if r.name == "metrics"]
+        assert len(messages) == 1
+        assert "12 Mongo commands (budget 5)" in messages[0]
+        assert "insert x11" in messages[0]
+        assert monitor.snapshot()[1]["/_test/queries/<int:n>"] == [2, 1]
+
+    def test_per_route_budget_override(self, monitored, caplog):
+        app_instance, _ = monitored
+        app_instance.config["QUERY_BUDGET"] = 5
+        app_instance.config["QUERY_BUDGETS"] = {"/_test/queries/<int:n>": 50}
+
+        with caplog.at_level(logging.WARNING, logger="metrics"):
+            app_instance.test_client().get("/_test/queries/12")
+        assert not [r for r in caplog.records if r.name == "metrics"]
+
+    def test_metrics_endpoint(self, monitored):
+        app_instance, _ = monitored
+        client = app_instance.test_client()
+        client.get("/_test/queries/2")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        body = response.get_data(as_text=True)
+        assert 'mongo_commands_total{route="/_test/queries/<int:n>",command="insert"} 1' in body
+        assert 'mongo_documents_returned_total{route="/_test/queries/<int:n>",command="find"} 2' in body
+        assert 'http_requests_total{route="/_test/queries/<int:n>"} 1' in body
+
+
+def dead_pid():
+    """A pid with no running process behind it."""
+    pid = 4_000_000
+    while metrics._pid_alive(pid):
+        pid += 1
+    return pid
+
+
+class TestRegistry:
+    """Test cases for the metrics registry and merging workers' samples."""
+
+    def test_histogram_renders_cumulative_buckets(self):
+        """Test that per-bucket counts are rendered cumulatively."""
+        registry = metrics.MetricsRegistry()
+        hist = registry.histogram("work_seconds", "Work", ("kind",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            hist.observe(value, kind="a")
+
+        text = registry.render()
+        assert 'work_seconds_bucket{kind="a",le="0.1"} 1' in text
+        assert 'work_seconds_bucket{kind="a",le="1.0"} 3' in text
+        assert 'work_seconds_bucket{kind="a",le="+Inf"} 4' in text
+        assert 'work_seconds_count{kind="a"} 4' in text
+        assert 'work_seconds_sum{kind="a"} 4.25' in text
+
+    def test_cache_hit_ratio(self):
+        """Test that cache hits and misses are rendered as a ratio per cache."""
+        registry = metrics.MetricsRegistry()
+        cache = registry.counter("cache_requests_total", "Cache", ("cache", "result"))
+        cache.inc(3, cache="catalog", result="hit")
+        cache.inc(1, cache="catalog", result="miss")
+        assert 'cache_hit_ratio{cache="catalog"} 0.75' in registry.render()
+
+    def test_workers_are_merged(self, tmp_path):
+        """Test that counters are summed across workers and gauges come from live ones."""
+        ours = metrics.MetricsRegistry(str(tmp_path))
+        ours.counter("jobs_total", "Jobs").inc(2)
+        ours.gauge("catalog_jobs", "Size").set(10)
+        ours.active_set("active_sessions", "Users").touch("alice")
+
+        # a worker that has since exited: its counters still count, its gauges do not
+        other = metrics.MetricsRegistry()
+        other.counter("jobs_total", "Jobs").inc(5)
+        other.gauge("catalog_jobs", "Size").set(99)
+        other.active_set("active_sessions", "Users").touch("bob")
+        with open(tmp_path / f"metrics-{dead_pid()}.json", "w") as f:
+            json.dump(other.state(), f)
+
+        # a live worker that saw the same user
+        live = metrics.MetricsRegistry()
+        live.counter("jobs_total", "Jobs").inc(1)
+        live.active_set("active_sessions", "Users").touch("alice")
+        live.active_set("active_sessions", "Users").touch("carol")
+        with open(tmp_path / f"metrics-{os.getppid()}.json", "w") as f:
+            json.dump(live.state(), f)
+
+        text = ours.render()
+        assert "jobs_total 8" in text
+        assert "catalog_jobs 10" in text
+        assert "active_sessions 2" in text
+        assert (tmp_path / f"metrics-{os.getpid()}.json").exists()
+
+    def test_dead_workers_are_archived(self, tmp_path):
+        """Test that an exited worker's file is folded into the archive without losing counts."""
+        ours = metrics.MetricsRegistry(str(tmp_path))
+        ours.counter("jobs_total", "Jobs").inc(2)
+        # Two exited workers, one after the other, with the same pid
+        for amount, total in ((5, 7), (7, 14)):
+            other = metrics.MetricsRegistry()
+            other.counter("jobs_total", "Jobs").inc(amount)
+            other.gauge("catalog_jobs", "Size").set(99)
+            with open(tmp_path / f"metrics-{dead_pid()}.json", "w") as f:
+                json.dump(other.state(), f)
+            assert f"jobs_total {total}\n" in ours.render()
+
+        text = ours.render()
+        assert "jobs_total 14\n" in text
+        assert "catalog_jobs 99" not in text
+        assert {p.name for p in tmp_path.glob("metrics-*.json")} == {
+            metrics.ARCHIVE_FILE,
+            f"metrics-{os.getpid()}.json",
+        }
+        assert "jobs_total 14" in ours.render()
+
+    def test_reused_pid_keeps_the_old_workers_counts(self, tmp_path):
+        """Test that a file left under this process's pid is archived, not overwritten."""
+        previous = metrics.MetricsRegistry()
+        previous.counter("jobs_total", "Jobs").inc(5)
+        with open(tmp_path / f"metrics-{os.getpid()}.json", "w") as f:
+            json.dump(previous.state(), f)
+
+        ours = metrics.MetricsRegistry(str(tmp_path))
+        ours.counter("jobs_total", "Jobs").inc(1)
+        ours.export()
+
+        assert "jobs_total 6" in ours.render()
+        assert (tmp_path / metrics.ARCHIVE_FILE).exists()
+
+
+class TestAppMetrics:
+    """Test cases for the metrics the app records on its hot paths."""
+
+    def test_hot_path_metrics(self, app):
+        """Test that page views record latency, CSV loads, catalog builds and sessions."""
+        app_instance, mock_db, _ = app
+        for name in ("company_preferences", "location_preferences", "role_preferences", "favorites", "jobs"):
+            getattr(mock_db, name).find.return_value = []
+        mock_db.job_type_preferences.find_one.return_value = None
+
+        client = app_instance.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(ObjectId())
+        client.get("/")
+        client.get("/")
+
+        body = client.get("/metrics").get_data(as_text=True)
+        assert 'http_request_duration_seconds_count{endpoint="home",method="GET"} 2' in body
+        assert 'csv_load_seconds_count{company="Amazon"}' in body
+        assert "catalog_build_seconds_count" in body
+        assert re.search(r"^catalog_jobs \d+$", body, re.M)
+        assert re.search(r'^cache_hit_ratio\{cache="catalog"\} 0\.\d+$', body, re.M)
+        assert "active_sessions 1" in body
+        assert 'cache_hit_ratio{cache="score_facts"} 1.0' in body
+
+    def test_scoring_without_precomputed_facts_is_a_miss(self, app):
+        """Test that jobs scored without their catalog's facts count as score cache misses."""
+        app_instance, mock_db, _ = app
+        for name in ("company_preferences", "location_preferences", "role_preferences", "favorites"):
+            getattr(mock_db, name).find.return_value = []
+        mock_db.job_type_preferences.find_one.return_value = None
+        jobs = [{"title": "Data Engineer", "company": "Google", "job_id": str(i)} for i in range(3)]
+
+        with app_instance.app_context():
+            app_module.score_jobs_for_user(mock_db, "u", jobs)
+            registry = app_instance.extensions["metrics_registry"]
+            requests = registry.counter("cache_requests_total", "", ("cache", "result"))
+            assert requests.value(cache="score_facts", result="miss") == 3
+            assert requests.value(cache="score_facts", result="hit") is None
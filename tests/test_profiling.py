@@ -0,0 +1,76 @@
+"""Tests for the opt-in request profiling hooks."""
+
+import logging
+import os
+
+import pytest
+
+import profiling
+
+
+@pytest.fixture
+def profiled(app):
+    app_instance, mock_db, _ = app
+    mock_db.company_preferences.find.return_value = []
+    mock_db.location_preferences.find.return_value = []
+    mock_db.role_preferences.find.return_value = []
+    mock_db.job_type_preferences.find_one.return_value = None
+    mock_db.favorites.find.return_value = []
+    mock_db.jobs.find.return_value = []
+    app_instance.config["PROFILING_ENABLED"] = True
+    app_instance.config["SLOW_REQUEST_MS"] = 60_000
+    return app_instance
+
+
+class TestSpans:
+    def test_span_is_noop_outside_request(self):
+        with profiling.span("anything"):
+            pass
+
+    def test_summarize_and_header(self):
+        summary = profiling.summarize_spans([("csv", 0.010), ("mongo", 0.002), ("csv", 0.005)])
+        assert list(summary) == ["csv", "mongo"]
+        assert summary["csv"] == (pytest.approx(0.015), 2)
+
+        header = profiling.server_timing_header(summary, 0.020)
+        assert header == 'csv;dur=15.0;desc="2x", mongo;dur=2.0;desc="1x", total;dur=20.0'
+
+
+class TestRequestProfiling:
+    def test_disabled_by_default(self, app):
+        app_instance, _, _ = app
+        app_instance.config["PROFILING_ENABLED"] = False
+        response = app_instance.test_client().get("/login")
+        assert "Server-Timing" not in response.headers
+
+    def test_server_timing_header(self, profiled):
+        response = profiled.test_client().get("/")
+        assert response.status_code == 200
+
+        timing = response.headers["Server-Timing"]
+        names = [part.split(";")[0] for part in timing.split(", ")]
+        assert {"score", "sort", "render", "total"} <= set(names)
+        assert names[-1] == "total"
+
+    def test_slow_request_is_logged(self, profiled, caplog):
+        profiled.config["SLOW_REQUEST_MS"] = 0
+        with caplog.at_level(logging.WARNING, logger="profiling"):
+            profiled.test_client().get("/")
+
+        messages = [r.getMessage() for r in caplog.records if r.name == "profiling"]
+        assert len(messages) == 1
+        assert messages[0].startswith("Slow request GET / took")
+        assert "score=" in messages[0]
+
+    def test_sampled_profiles_keep_only_the_slowest(self, profiled, tmp_path):
+        profiled.config.update(
+            SLOW_REQUEST_MS=0, PROFILE_SAMPLE_RATE=1.0, PROFILE_DIR=str(tmp_path), PROFILE_KEEP=2
+        )
+        client = profiled.test_client()
+        for _ in range(4):
+            client.get("/login")
+
+        files = os.listdir(tmp_path)
+        assert 1 <= len(files) <= 2
+        assert all(name.endswith(".prof") and "-login-" in name for name in files)
+        assert not profiling._profiler_lock.locked()
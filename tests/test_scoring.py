@@ -255,3 +255,148 @@ class TestJobScoringAlgorithm:
         
         assert 'posted' in result[0]
         assert isinstance(result[0]['posted'], str)
+
+
+class TestRecommendedJobs:
+    """Test cases for get_recommended_jobs top-k selection."""
+
+    def setup_method(self):
+        from app import get_recommended_jobs, match_key
+        self.get_recommended_jobs = get_recommended_jobs
+        self.match_key = match_key
+
+    def make_jobs(self, scores):
+        base = datetime.datetime(2025, 12, 1, tzinfo=datetime.timezone.utc)
+        return [
+            {
+                'title': f'Job {i}',
+                'match_score': score,
+                # only a few distinct timestamps, so (score, recency) ties are common
+                'scraped_at': base + datetime.timedelta(days=i % 3),
+            }
+            for i, score in enumerate(scores)
+        ]
+
+    def test_matches_a_full_stable_sort(self):
+        jobs = self.make_jobs([50, 90, 40, 90, 70, 50, 90, 40, 60, 95, 50, 45])
+        expected = sorted(
+            [j for j in jobs if j['match_score'] >= 40], key=self.match_key, reverse=True
+        )[:8]
+
+        result = self.get_recommended_jobs(jobs)
+
+        assert [j['title'] for j in result] == [j['title'] for j in expected]
+
+    def test_falls_back_to_all_jobs(self):
+        jobs = self.make_jobs([10, 45, 20, 5])
+
+        result = self.get_recommended_jobs(jobs)
+
+        assert [j['match_score'] for j in result] == [45, 20, 10, 5]
+
+    def test_limit(self):
+        jobs = self.make_jobs([60] * 20)
+        assert len(self.get_recommended_jobs(jobs, limit=5)) == 5
+
+
+class TestRecencyIndex:
+    """Test cases for the catalog's recency index."""
+
+    def test_newest_matches_a_stable_sort(self):
+        import heapq
+        from app import JobCatalog, recency_key
+
+        base = datetime.datetime(2025, 12, 1, tzinfo=datetime.timezone.utc)
+        jobs = [
+            {'title': f'Job {i}', 'scraped_at': base + datetime.timedelta(hours=(i * 7) % 5)}
+            for i in range(30)
+        ]
+        jobs.append({'title': 'Undated'})
+        jobs.append({'title': 'Posted', 'posted_date': base + datetime.timedelta(days=3)})
+
+        catalog = JobCatalog(jobs, 'v1')
+        scored = [dict(j, match_score=50) for j in jobs]
+
+        newest = catalog.newest(scored, 20)
+
+        assert newest == heapq.nlargest(20, scored, key=recency_key)
+        assert newest[0]['title'] == 'Posted'
+        assert catalog.newest(scored, 100)[-1]['title'] == 'Undated'
+        assert newest[0] is scored[31]
+
+
+class TestJobFacts:
+    """Test cases for the precomputed user-independent job fields."""
+
+    def test_facts_for_a_mongo_job(self):
+        from app import ROLES, job_facts
+
+        posted = datetime.datetime(2025, 12, 3, 8, 0, tzinfo=datetime.timezone.utc)
+        facts = job_facts({
+            'title': 'Senior Data Scientist, Ads',
+            'company': 'Big Co',
+            'job_id': 'a/b 1',
+            'posted_date': posted,
+        })
+
+        assert facts.identifier == 'a%2Fb%201'
+        assert facts.company_slug == 'big-co'
+        assert facts.role_index == ROLES.index('Data Scientist')
+        assert facts.posted == 'Dec 03'
+        assert facts.posted_ts == posted.timestamp()
+        assert facts.location_code == -1
+        assert facts.favorite_key == ('Big Co', 'a%2Fb%201')
+
+    def test_existing_posted_label_is_kept(self):
+        from app import job_facts
+
+        facts = job_facts({'title': 'x', 'posted': 'Jan 01', 'scraped_at': datetime.datetime.now(datetime.timezone.utc)})
+        assert facts.posted is None
+
+    def test_precomputed_facts_score_the_same(self):
+        from app import job_facts, score_jobs_for_user
+
+        mock_db = MagicMock()
+        # Low tiers keep every score under the 100 cap: 22 + 18 + 15 = 55 before recency
+        mock_db.company_preferences.find.return_value = [{'company': 'Google', 'rank': 4}]
+        mock_db.location_preferences.find.return_value = [{'location': 'Remote', 'rank': 4}]
+        mock_db.role_preferences.find.return_value = []
+        mock_db.job_type_preferences.find_one.return_value = {'types': ['Contract']}
+        mock_db.favorites.find.return_value = [{'company': 'Google', 'identifier': '7'}]
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        jobs = [
+            {'title': 'Data Engineer', 'company': 'Google', 'location': 'Remote', 'type': 'Contract',
+             'job_id': str(d), 'scraped_at': now - datetime.timedelta(days=d, hours=1)}
+            for d in range(27)
+        ]
+        facts = [job_facts(j) for j in jobs]
+
+        with_facts = score_jobs_for_user(mock_db, 'u', jobs, mark_favorites=True, facts=facts)
+        without = score_jobs_for_user(mock_db, 'u', jobs, mark_favorites=True)
+
+        assert with_facts == without
+        assert [j['is_favorited'] for j in with_facts] == [j['job_id'] == '7' for j in jobs]
+        # recency fades a point a day and is gone after 24 days
+        assert [j['match_score'] for j in with_facts] == [55 + max(0, 25 - d) for d in range(27)]
+
+
+class TestRecencyClock:
+    """Test cases for the catalog's recency clock used in page validators."""
+
+    def test_ticks_when_a_recent_job_ages_a_day(self):
+        from app import JobCatalog
+
+        today = datetime.datetime.now(datetime.timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        posted = today - datetime.timedelta(days=2) + datetime.timedelta(hours=6)
+        old = today - datetime.timedelta(days=60)
+        catalog = JobCatalog(
+            [{'job_id': '1', 'posted_date': posted}, {'job_id': '2', 'posted_date': old}], 'v1'
+        )
+        assert catalog.recency_offsets == [posted.timestamp() % 86400]
+
+        next_birthday = (posted + datetime.timedelta(days=3)).timestamp()
+        assert catalog.recency_clock(next_birthday - 1) != catalog.recency_clock(next_birthday)
+        assert catalog.recency_clock(next_birthday) == catalog.recency_clock(next_birthday + 3600)
@@ -0,0 +1,195 @@
+"""Tests for the shared scraper helpers."""
+
+import csv
+import hashlib
+import json
+
+import pytest
+
+from scrapers import checkpoint, csv_store, retries, run_metrics
+
+
+class TestCheckpoint:
+    """Test cases for scraper checkpoints."""
+
+    def test_missing_checkpoint(self, tmp_path):
+        """Test that a scraper without a checkpoint starts from scratch."""
+        assert checkpoint.load_checkpoint('amazon', str(tmp_path)) is None
+        assert not checkpoint.has_checkpoint('amazon', str(tmp_path))
+
+    def test_checkpoint_round_trip(self, tmp_path):
+        """Test that saved progress is restored on the next run."""
+        jobs = [{'title': 'Engineer', 'job_id': '1', 'url': 'https://example.com/1'}]
+        checkpoint.save_checkpoint(
+            'amazon', 3, 'https://example.com/?page=3', {'1'}, jobs, str(tmp_path)
+        )
+
+        state = checkpoint.load_checkpoint('amazon', str(tmp_path))
+        assert state['page_num'] == 3
+        assert state['url'] == 'https://example.com/?page=3'
+        assert state['seen_ids'] == {'1'}
+        assert state['jobs'] == jobs
+
+    def test_clear_checkpoint(self, tmp_path):
+        """Test that a finished run removes its checkpoint."""
+        checkpoint.save_checkpoint('meta', 2, None, set(), [], str(tmp_path))
+        assert checkpoint.has_checkpoint('meta', str(tmp_path))
+
+        checkpoint.clear_checkpoint('meta', str(tmp_path))
+        assert not checkpoint.has_checkpoint('meta', str(tmp_path))
+
+    def test_corrupt_checkpoint_is_ignored(self, tmp_path):
+        """Test that an unreadable checkpoint does not crash the scraper."""
+        (tmp_path / 'google.json').write_text('{not json')
+        assert checkpoint.load_checkpoint('google', str(tmp_path)) is None
+
+
+class TestCsvStore:
+    """Test cases for the atomic CSV save path."""
+
+    def _job(self, job_id, scraped_at='2025-12-10 12:00:00'):
+        return {
+            'title': f'Engineer {job_id}',
+            'location': 'Remote',
+            'department': '',
+            'job_id': job_id,
+            'url': f'https://example.com/{job_id}',
+            'scraped_at': scraped_at,
+        }
+
+    def test_save_writes_csv_and_manifest(self, tmp_path):
+        """Test that saving writes the rows and a matching manifest."""
+        filename = str(tmp_path / 'acme_jobs.csv')
+        result = csv_store.save_jobs_csv([self._job('1'), self._job('2')], filename)
+
+        assert result['added'] == 2
+        assert result['total'] == 2
+
+        manifest = csv_store.read_manifest(filename)
+        assert manifest['rows'] == 2
+        assert manifest['generation'] == 1
+        with open(filename, 'rb') as f:
+            assert manifest['sha256'] == hashlib.sha256(f.read()).hexdigest()
+
+    def test_resave_preserves_scraped_at_and_drops_delisted(self, tmp_path):
+        """Test that existing jobs keep their first-seen date and delisted jobs go away."""
+        filename = str(tmp_path / 'acme_jobs.csv')
+        csv_store.save_jobs_csv([self._job('1'), self._job('2')], filename)
+
+        result = csv_store.save_jobs_csv(
+            [self._job('2', '2025-12-11 09:00:00'), self._job('3')], filename
+        )
+        assert result['added'] == 1
+        assert result['delisted'] == 1
+
+        with open(filename, newline='', encoding='utf-8') as f:
+            rows = {row['job_id']: row for row in csv.DictReader(f)}
+        assert set(rows) == {'2', '3'}
+        assert rows['2']['scraped_at'] == '2025-12-10 12:00:00'
+        assert csv_store.read_manifest(filename)['generation'] == 2
+
+    def test_no_temp_files_left_behind(self, tmp_path):
+        """Test that the temp file is renamed into place."""
+        filename = str(tmp_path / 'acme_jobs.csv')
+        csv_store.save_jobs_csv([self._job('1')], filename)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            'acme_jobs.csv',
+            'acme_jobs.manifest.json',
+        ]
+
+
+class TestScrapeMetrics:
+    """Test cases for per-run scraper metrics."""
+
+    def _run(self):
+        metrics = run_metrics.ScrapeMetrics('acme')
+        for page_num in (1, 2):
+            metrics.start_page(page_num)
+            metrics.mark_loaded()
+            metrics.end_page(page_num, 10)
+        metrics.record_pagination(1.5)
+        metrics.incr('timeouts')
+        return metrics
+
+    def test_summary_counts_pages_and_jobs(self):
+        """Test that the summary reflects every recorded page."""
+        summary = self._run().summary(total_jobs=20, completed=True)
+
+        assert summary['pages'] == 2
+        assert summary['jobs'] == 20
+        assert summary['timeouts'] == 1
+        assert summary['pagination_seconds_p50'] == 1.5
+        assert summary['time_to_first_card_seconds'] is not None
+        assert [p['page'] for p in summary['page_timings']] == [1, 2]
+
+    def test_finish_writes_jsonl_and_prometheus(self, tmp_path):
+        """Test that a finished run is written in both output formats."""
+        self._run().finish(20, True, metrics_dir=str(tmp_path))
+
+        lines = (tmp_path / 'scrape_runs.jsonl').read_text().splitlines()
+        assert json.loads(lines[0])['scraper'] == 'acme'
+
+        prom = (tmp_path / 'acme.prom').read_text()
+        assert 'scraper_last_run_jobs{scraper="acme"} 20' in prom
+        assert 'scraper_page_load_seconds{scraper="acme",quantile="0.95"}' in prom
+
+    def test_resume_is_not_a_retry(self):
+        """Test that resuming from a checkpoint is counted apart from retries."""
+        metrics = run_metrics.ScrapeMetrics('acme')
+        metrics.resumed(4)
+        summary = metrics.summary(total_jobs=0, completed=False)
+
+        assert summary['resumes'] == 1
+        assert summary['retries'] == 0
+        assert summary['resumed_from_page'] == 4
+
+
+class TestWithRetries:
+    """Test cases for retrying a failed page load or next-page click."""
+
+    def test_retries_until_it_succeeds(self):
+        """Test that each failed attempt is retried after before_retry and counted."""
+        metrics = run_metrics.ScrapeMetrics('acme')
+        outcomes = iter([TimeoutError('slow'), TimeoutError('slow'), 'loaded'])
+        reloads = []
+
+        def action():
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        result = retries.with_retries(
+            action, TimeoutError, metrics, before_retry=lambda: reloads.append(1), retries=2
+        )
+
+        assert result == 'loaded'
+        assert len(reloads) == 2
+        assert metrics.counters['retries'] == 2
+
+    def test_last_failure_is_raised(self):
+        """Test that the error is raised once the retries run out."""
+        metrics = run_metrics.ScrapeMetrics('acme')
+        calls = []
+
+        def action():
+            calls.append(1)
+            raise TimeoutError('slow')
+
+        with pytest.raises(TimeoutError):
+            retries.with_retries(action, TimeoutError, metrics, retries=1)
+        assert len(calls) == 2
+        assert metrics.counters['retries'] == 1
+
+    def test_other_errors_are_not_retried(self):
+        """Test that errors outside retry_on are raised at once."""
+        calls = []
+
+        def action():
+            calls.append(1)
+            raise ValueError('bad')
+
+        with pytest.raises(ValueError):
+            retries.with_retries(action, TimeoutError, retries=3)
+        assert len(calls) == 1